@@ -1,14 +1,74 @@
 # backend/ai-service/app/db.py
 from app import models
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_CACHE_SIZE, EVENT_PARTITION_INTERVAL,
+)
 
-engine = create_engine(DATABASE_URL)
+# Optional asyncio support (needs asyncpg for Postgres, aiosqlite for SQLite)
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    _ASYNC_DB_AVAILABLE = True
+except Exception:
+    _ASYNC_DB_AVAILABLE = False
+
+def _sync_url(url: str) -> str:
+    # SQLAlchemy 2 no longer accepts the "postgres://" scheme Heroku-style URLs use
+    return "postgresql://" + url[len("postgres://"):] if url.startswith("postgres://") else url
+
+def _async_url(url: str) -> str:
+    """DATABASE_URL rewritten for asyncpg (with the prepared statement cache size) or aiosqlite."""
+    parsed = make_url(_sync_url(url))
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg").update_query_dict(
+            {"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)})
+    elif parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+_POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+# Sync engine: table creation, scripts and the event sink's flusher thread
+engine = create_engine(_sync_url(DATABASE_URL), **_POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Event tables are range-partitioned by created_at on Postgres (see
+# app/services/partitions.py). Postgres requires the partition key in the
+# primary key, so those models use (id, created_at) when this is set.
+PARTITIONED = EVENT_PARTITION_INTERVAL in ("day", "month") and engine.dialect.name == "postgresql"
+
+def partition_args() -> dict:
+    """__table_args__ options for a table partitioned by created_at."""
+    return {"postgresql_partition_by": "RANGE (created_at)"} if PARTITIONED else {}
+
+# Async engine: request handlers, so DB waits do not hold threadpool threads
+async_engine = None
+AsyncSessionLocal = None
+if _ASYNC_DB_AVAILABLE:
+    try:
+        _async_db_url = ASYNC_DATABASE_URL or _async_url(DATABASE_URL)
+        # aiosqlite runs on SQLAlchemy's NullPool, which takes no pool sizing
+        _async_pool = {} if make_url(_async_db_url).get_backend_name() == "sqlite" else _POOL_OPTIONS
+        async_engine = create_async_engine(_async_db_url, **_async_pool)
+        # expire_on_commit=False: handlers return ORM rows after committing
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+    except Exception as e:
+        # Usually the async driver (asyncpg / aiosqlite) is not installed
+        print(f"⚠️ Could not create async database engine: {e}")
+else:
+    print("⚠️ sqlalchemy.ext.asyncio unavailable; async database routes disabled.")
+
 # Dependency for FastAPI routes
 def get_db():
     db = SessionLocal()
@@ -16,3 +76,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async dependency for FastAPI routes
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database engine not available (is asyncpg / aiosqlite installed?)")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,19 +1,43 @@
 # backend/ai-service/app/main.py
-from fastapi import FastAPI
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from dotenv import load_dotenv
-from app.routes import api, infer, auth, password, phishing, anomaly, audit, events
-from app.services import model_loader  # module loads models
-from app.db import engine, Base
+from app.routes import api, infer, auth, password, phishing, anomaly, audit, events, models, health, stats, export
+from app.services import model_loader  # models load in the background at startup
+from app.services import ai_service, phishing_service
+from app.services.inference_executor import executor, Overloaded, configure_torch_threads
+from app.services.startup import report
+from app.services.domain_reputation import reputation
+from app.services.event_sink import sink
+from app.services.password_hasher import hasher
+from app.services.partitions import maintainer
+from app.config import MODEL_PATH, STARTUP_MODE, MODEL_SHARING
+from app.services.model_registry import registry
+from app.db import engine, async_engine, Base
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables safely
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception as e:
-    print(f"⚠️ Could not create tables: {e}")
+# Create database tables safely (runs at startup, off the import path)
+def create_tables():
+    try:
+        Base.metadata.create_all(bind=engine)
+        # create_all skips tables that already exist, so indexes added to a
+        # model later are created here
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        # Partitions must exist before the first insert; later passes run in the background
+        maintainer.run_once(engine)
+        maintainer.start(engine)
+    except Exception as e:
+        print(f"⚠️ Could not create tables: {e}")
+        raise
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -36,24 +60,59 @@ app.add_middleware(
 )
 # --------------------------
 
-# Startup event: ensure models are loaded
+# Load shedding: a full inference queue answers fast instead of queueing
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+# Startup event: schema and models load in the background; /readyz reports progress
 @app.on_event("startup")
 async def startup_event():
+    report.record("import", (time.perf_counter() - _IMPORT_STARTED) * 1000.0)
+    # Torch thread settings must be applied before any model runs
+    configure_torch_threads()
+    report.run_in_background("db", create_tables)
+    report.run_in_background("password_hasher", hasher.start)
+    reputation.start()
     try:
-        pm = getattr(model_loader, "password_model", None)
-        ph = getattr(model_loader, "phishing_model", None)
-        print(f"ℹ️ Password model loaded? {'yes' if pm is not None else 'no'}")
-        print(f"ℹ️ Phishing model loaded? {'yes' if ph is not None else 'no'}")
+        # Under MODEL_SHARING=prefork the models came loaded from the master; only warm them up
+        if MODEL_SHARING == "prefork":
+            report.run_in_background("warmup", registry.warmup_active)
+        for thread in model_loader.start_background_loads(MODEL_PATH).values():
+            report.track(thread)
         print("✅ Model loader initialized")
     except Exception as e:
         print(f"❌ Failed to initialize model loader: {e}")
 
+    if STARTUP_MODE == "blocking":
+        await run_in_threadpool(report.wait)
+        print(f"ℹ️ Startup report: {report.as_dict()}")
+
+# Shutdown event: stop background schedulers
+@app.on_event("shutdown")
+async def shutdown_event():
+    await ai_service.batcher.stop()
+    await phishing_service.batcher.stop()
+    reputation.stop()
+    maintainer.stop()
+    # Write out every buffered check event before the process exits
+    await run_in_threadpool(sink.stop)
+    executor.shutdown()
+    hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 # Health check
 @app.get("/")
 def root():
     return {"message": "SafeChain AI Service is running"}
 
 # Include all routers
+app.include_router(health.router)
 app.include_router(api.router, prefix="/api")
 app.include_router(infer.router, prefix="/api/infer")
 app.include_router(auth.router, prefix="/api/auth")
@@ -62,3 +121,6 @@ app.include_router(phishing.router, prefix="/api/phishing")
 app.include_router(anomaly.router, prefix="/api/anomaly")
 app.include_router(audit.router, prefix="/api/audit")
 app.include_router(events.router, prefix="/api/events")
+app.include_router(models.router, prefix="/api/models")
+app.include_router(stats.router, prefix="/api/stats")
+app.include_router(export.router, prefix="/api/export")
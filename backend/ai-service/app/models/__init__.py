@@ -4,3 +4,5 @@ from .event import Event
 from .password_event import PasswordEvent
 from .phishing import PhishingAttempt
 from .audit_log import AuditLog
+from .event_summary import EventSummary
+from .stat_rollup import StatRollup
@@ -1,12 +1,13 @@
 # backend/ai-service/app/models/audit_log.py
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.sql import func
-from app.db import Base
+from app.db import Base, PARTITIONED, partition_args
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = partition_args()
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     action = Column(String)
     detail = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=PARTITIONED)
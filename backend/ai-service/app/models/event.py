@@ -1,13 +1,20 @@
 # backend/ai-service/app/models/event.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, DateTime
 from sqlalchemy.sql import func
-from app.db import Base
+from app.db import Base, PARTITIONED, partition_args
 
 class Event(Base):
     __tablename__ = "events"
+    # Keyset pagination walks (created_at, id) newest first, optionally per filter
+    __table_args__ = (
+        Index("ix_events_created_at_id", "created_at", "id"),
+        Index("ix_events_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_events_type_created_at_id", "type", "created_at", "id"),
+        partition_args(),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     type = Column(String, nullable=False)
     detail = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=PARTITIONED)
@@ -0,0 +1,19 @@
+# backend/ai-service/app/models/event_summary.py
+from sqlalchemy import Column, Index, Integer, String, Date, DateTime
+from sqlalchemy.sql import func
+from app.db import Base
+
+class EventSummary(Base):
+    """Per-day counts kept for event partitions after retention drops them."""
+    __tablename__ = "event_summaries"
+    __table_args__ = (
+        Index("ix_event_summaries_source_day", "source", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)     # table the rows came from
+    day = Column(Date, nullable=False)          # UTC day of created_at
+    user_id = Column(Integer, nullable=True)    # None for audit_logs
+    label = Column(String, nullable=True)       # type / password_strength / result / action
+    count = Column(Integer, nullable=False)
+    compacted_at = Column(DateTime(timezone=True), server_default=func.now())
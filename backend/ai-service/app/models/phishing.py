@@ -1,13 +1,19 @@
 # backend/ai-service/app/models/phishing.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, DateTime
 from sqlalchemy.sql import func
-from app.db import Base
+from app.db import Base, PARTITIONED, partition_args
 
 class PhishingAttempt(Base):
     __tablename__ = "phishing_attempts"
+    # Keyset pagination walks (created_at, id) newest first, optionally per filter
+    __table_args__ = (
+        Index("ix_phishing_attempts_created_at_id", "created_at", "id"),
+        Index("ix_phishing_attempts_user_id_created_at_id", "user_id", "created_at", "id"),
+        partition_args(),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     url = Column(String)
     result = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=PARTITIONED)
@@ -0,0 +1,19 @@
+# backend/ai-service/app/models/stat_rollup.py
+from sqlalchemy import Column, Index, Integer, String, DateTime, UniqueConstraint
+from app.db import Base
+
+class StatRollup(Base):
+    """Hourly row counts per source table, user and label, kept up to date by the write path."""
+    __tablename__ = "stat_rollups"
+    __table_args__ = (
+        # Upsert target; also serves per-source time-range queries
+        UniqueConstraint("source", "bucket", "user_id", "label", name="uq_stat_rollups_key"),
+        Index("ix_stat_rollups_source_user_bucket", "source", "user_id", "bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)                   # events / password_events / ...
+    bucket = Column(DateTime(timezone=True), nullable=False)  # start of the UTC hour
+    user_id = Column(Integer, nullable=False, default=0)      # 0 for audit_logs (no user)
+    label = Column(String, nullable=False, default="")        # type / password_strength / result / action
+    count = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,10 @@
 # backend/ai-service/app/routes/anomaly.py
-from fastapi import APIRouter, Depends, HTTPException
-from app.services import ai_service
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from app.services import ai_service, wire_format
+from app.services.model_registry import MODEL_VERSION_HEADER
+from app.services.inference_executor import executor, Overloaded
+from app.services.result_cache import is_bypass, CACHE_STATUS_HEADER
+from app.config import INFER_MAX_BATCH_ROWS
 from sqlalchemy.orm import Session
 from app.db import get_db
 
@@ -16,11 +20,55 @@ class AnomalyResponse(BaseModel):
     score: float
 
 @router.post("/", response_model=AnomalyResponse)
-def detect_anomaly(req: AnomalyRequest, db: Session = Depends(get_db)):
+async def detect_anomaly(
+    req: AnomalyRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    x_cache_bypass: str | None = Header(None),
+):
     try:
-        prediction = ai_service.run_inference(req.input)
+        prediction, version, cache_status = await ai_service.run_inference_cached(req.input, bypass=is_bypass(x_cache_bypass))
+    except Overloaded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    response.headers[MODEL_VERSION_HEADER] = version
+    response.headers[CACHE_STATUS_HEADER] = cache_status
     # Simple example: use first output as anomaly score
     score = float(prediction[0])
     return {"score": score}
+
+class AnomalyBatchRequest(BaseModel):
+    inputs: List[List[float]]
+
+class AnomalyBatchResponse(BaseModel):
+    scores: List[float]
+
+@router.post("/batch", response_model=AnomalyBatchResponse, openapi_extra=wire_format.openapi_body(AnomalyBatchRequest))
+async def detect_anomaly_batch(request: Request, response: Response, db: Session = Depends(get_db)):
+    try:
+        entry = ai_service.get_active()
+        expected_input_size = ai_service.get_input_size(entry)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    try:
+        # JSON by default; float32 octet-stream / msgpack bodies skip JSON parsing
+        if wire_format.request_format(request) == "json":
+            inputs = (await wire_format.parse_json(request, AnomalyBatchRequest)).inputs
+        else:
+            inputs = await wire_format.read_matrix(request, "inputs", expected_input_size)
+        if len(inputs) > INFER_MAX_BATCH_ROWS:
+            raise HTTPException(status_code=413, detail=f"Batch too large (max {INFER_MAX_BATCH_ROWS} rows)")
+        matrix = ai_service.to_matrix(inputs, expected_input_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        predictions = await executor.run(ai_service.run_matrix_inference, matrix, entry)
+    except Overloaded:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    response.headers[MODEL_VERSION_HEADER] = entry.tag
+    # Same convention as the single-row route: first output is the score
+    scores = predictions[:, 0] if predictions.size else predictions.reshape(-1)
+    return wire_format.respond(request, response, "scores", scores)
@@ -1,12 +1,19 @@
 # backend/ai-service/app/routes/audit.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.services import db_service
-from app.schemas.audit_log import AuditLogCreate, AuditLogResponse
-from app.db import get_db
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services import db_service, bulk_ingest
+from app.schemas.audit_log import AuditLogCreate, AuditLogResponse, AuditLogBulkItem
+from app.schemas.bulk import BulkIngestResponse
+from app.db import get_async_db
 
 router = APIRouter()
 
 @router.post("/", response_model=AuditLogResponse)
-def create_audit(log: AuditLogCreate, db: Session = Depends(get_db)):
-    return db_service.create_audit_log(db, log.action, log.detail)
+async def create_audit(log: AuditLogCreate, db: AsyncSession = Depends(get_async_db)):
+    return await db_service.create_audit_log(db, log.action, log.detail)
+
+@router.post("/bulk", response_model=BulkIngestResponse)
+async def bulk_create_audit(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """JSON array or NDJSON of audit logs; bad records are reported per row, the rest are inserted."""
+    result = await bulk_ingest.ingest(db, request, AuditLogBulkItem, db_service.insert_audit_logs)
+    return bulk_ingest.respond(result)
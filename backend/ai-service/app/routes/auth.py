@@ -1,28 +1,29 @@
 # backend/ai-service/app/routes/auth.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.user import UserCreate, UserResponse
 from app.services import db_service
-from app.db import get_db
-import jwt
-from app.config import JWT_SECRET
-from passlib.context import CryptContext
+from app.services.password_hasher import hasher
+from app.services.auth_tokens import issue_token, is_privileged
+from app.db import get_async_db
 
 router = APIRouter()
 
-# Use argon2 instead of bcrypt
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
 # ------------------------
 # Register
 # ------------------------
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db_service.get_user_by_email(db, user.email)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    # Roles follow the email address, which nobody verifies here: admin and
+    # compliance accounts are created by an operator (create_account.py)
+    if is_privileged(user.email):
+        raise HTTPException(status_code=403, detail="This address cannot self-register; ask an operator")
+    existing = await db_service.get_user_by_email(db, user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed = pwd_context.hash(user.password)
-    new_user = db_service.create_user(db, user.email, hashed)
+    # argon2 is deliberately slow; it runs in the hashing process pool
+    hashed = await hasher.hash(user.password)
+    new_user = await db_service.create_user(db, user.email, hashed)
     return new_user
 
 # ------------------------
@@ -32,9 +33,20 @@ class LoginRequest(UserCreate):
     pass
 
 @router.post("/login")
-def login(req: LoginRequest, db: Session = Depends(get_db)):
-    user = db_service.get_user_by_email(db, req.email)
-    if not user or not pwd_context.verify(req.password, user.hashed_password):
+async def login(req: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await db_service.get_user_by_email(db, req.email)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await hasher.verify_and_update(req.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    token = jwt.encode({"sub": user.email}, JWT_SECRET, algorithm="HS256")
+    # Stored hash used older argon2 parameters; replace it while we have the password
+    if new_hash is not None:
+        await db_service.update_user_password_hash(db, user, new_hash)
+    token = issue_token(user.email)
     return {"access_token": token, "token_type": "bearer"}
+
+@router.get("/stats")
+def auth_stats():
+    """Hashing pool load, rejections, rehash count and the argon2 parameters in use."""
+    return hasher.snapshot()
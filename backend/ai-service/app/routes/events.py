@@ -1,13 +1,36 @@
 # backend/ai-service/app/routes/events.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services import db_service
-from app.schemas.event import EventResponse
-from app.db import get_db
-from typing import List
+from app.services import bulk_ingest
+from app.services.event_sink import sink
+from app.schemas.event import EventPage, EventBulkItem
+from app.schemas.bulk import BulkIngestResponse
+from app.db import get_async_db
+from app.config import PAGE_SIZE_MAX
 
 router = APIRouter()
 
-@router.get("/", response_model=List[EventResponse])
-def get_recent_events(limit: int = 10, db: Session = Depends(get_db)):
-    return db_service.get_recent_events(db, limit)
+@router.get("/", response_model=EventPage)
+async def get_recent_events(limit: int = Query(10, ge=1, le=PAGE_SIZE_MAX), cursor: str | None = None,
+                            user_id: int | None = None, type: str | None = None,
+                            since: datetime | None = None, until: datetime | None = None,
+                            db: AsyncSession = Depends(get_async_db)):
+    """Newest events first; follow next_cursor for older pages. since is inclusive, until exclusive."""
+    try:
+        items, next_cursor = await db_service.list_events(db, limit, cursor, user_id, type, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/sink")
+def event_sink_stats():
+    """Write-behind sink metrics: pending records, lag and drops."""
+    return sink.snapshot()
+
+@router.post("/bulk", response_model=BulkIngestResponse)
+async def bulk_create_events(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """JSON array or NDJSON of events; bad records are reported per row, the rest are inserted."""
+    result = await bulk_ingest.ingest(db, request, EventBulkItem, db_service.insert_events, check_users=True)
+    return bulk_ingest.respond(result)
@@ -0,0 +1,36 @@
+# backend/ai-service/app/routes/export.py
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from app.db import AsyncSessionLocal
+from app.services import exporter
+from app.services.auth_tokens import require_role
+
+router = APIRouter()
+
+# Exports hold every user's rows
+require_export_role = require_role("admin", "compliance")
+
+@router.get("/{source}")
+def export(source: str, format: str = "ndjson", gzip: bool = False,
+           since: datetime | None = None, until: datetime | None = None,
+           user_id: int | None = None, label: str | None = None,
+           claims: dict = Depends(require_export_role)):
+    """
+    Stream every matching row, oldest first, as NDJSON or CSV (optionally
+    gzipped). source is events, password_events, phishing_attempts or
+    audit_logs; label filters on the event type, password strength,
+    phishing result or audit action. since is inclusive, until exclusive.
+    Requires an admin or compliance token.
+    """
+    if source not in exporter.SOURCES:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{source}' (expected one of {list(exporter.SOURCES)})")
+    if format not in exporter.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}' (expected one of {list(exporter.FORMATS)})")
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database engine not available")
+
+    headers = {"Content-Disposition": f'attachment; filename="{exporter.filename(source, format, gzip)}"'}
+    media_type = "application/gzip" if gzip else exporter.FORMATS[format]
+    body = exporter.stream_export(source, format, gzip, since, until, user_id, label)
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -0,0 +1,17 @@
+# backend/ai-service/app/routes/health.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.startup import report
+
+router = APIRouter()
+
+# Liveness: the process is up and serving requests
+@router.get("/healthz")
+def healthz():
+    return {"status": "ok"}
+
+# Readiness: every required model is loaded (503 until then)
+@router.get("/readyz")
+def readyz():
+    body = report.as_dict()
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
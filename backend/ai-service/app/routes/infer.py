@@ -1,9 +1,12 @@
 # backend/ai-service/app/routes/infer.py
-from fastapi import APIRouter, Depends, HTTPException, Header
-from app.schemas.infer import InferRequest, InferResponse
-from app.services.ai_service import get_model
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from app.schemas.infer import InferRequest, InferResponse, InferBatchRequest, InferBatchResponse
+from app.services import ai_service, wire_format
+from app.services.model_registry import MODEL_VERSION_HEADER
+from app.services.inference_executor import executor
+from app.services.result_cache import result_cache, is_bypass, CACHE_STATUS_HEADER
 from app.services.model_loader import MODEL_INPUT_SIZE
-import torch
+from app.config import INFER_MAX_BATCH_ROWS
 
 router = APIRouter()
 
@@ -18,48 +21,86 @@ def verify_token(authorization: str | None = Header(None)) -> str:
     token = authorization.split(" ", 1)[1]
     return token
 
-@router.post("/", response_model=InferResponse)
-def infer(req: InferRequest, subject: str = Depends(verify_token)):
-    MODEL = get_model()
+@router.post("/", response_model=InferResponse, openapi_extra=wire_format.openapi_body(InferRequest))
+async def infer(
+    request: Request,
+    response: Response,
+    subject: str = Depends(verify_token),
+    x_cache_bypass: str | None = Header(None),
+):
+    # Expected input size is computed once when the model version is registered
+    expected_input_size = ai_service.get_input_size(ai_service.get_active(), MODEL_INPUT_SIZE)
 
-    # Determine expected input size (robust to different model shapes)
-    try:
-        if hasattr(MODEL, "linear") and hasattr(MODEL.linear, "in_features"):
-            expected_input_size = int(MODEL.linear.in_features)
-        elif hasattr(MODEL, "in_features"):
-            expected_input_size = int(MODEL.in_features)
-        else:
-            expected_input_size = int(MODEL_INPUT_SIZE)
-    except Exception:
-        expected_input_size = int(MODEL_INPUT_SIZE)
-
-    # Debug prints (visible in uvicorn logs)
-    print("DEBUG — User input length:", len(req.input))
-    print("DEBUG — Expected size:", expected_input_size)
+    # JSON by default; float32 octet-stream / msgpack bodies decode without JSON parsing
+    if wire_format.request_format(request) == "json":
+        row = (await wire_format.parse_json(request, InferRequest)).input
+    else:
+        try:
+            matrix = await wire_format.read_matrix(request, "input", expected_input_size)
+        except wire_format.WireFormatError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e)})
+        if matrix.shape[0] != 1:
+            raise HTTPException(status_code=400, detail={"error": "Expected a single row; use /api/infer/batch"})
+        row = matrix[0]
 
     # Validate size
-    if len(req.input) != expected_input_size:
+    if len(row) != expected_input_size:
         raise HTTPException(
             status_code=400,
             detail={
                 "error": "Wrong input size",
-                "given": len(req.input),
+                "given": len(row),
                 "expected": expected_input_size
             }
         )
 
-    # Convert input to tensor and run model
-    x = torch.tensor([req.input], dtype=torch.float32)
-    with torch.no_grad():
-        y = MODEL(x)
+    # Serve repeats from the result cache; misses are queued so concurrent
+    # requests share one stacked forward pass
+    out, version, cache_status = await ai_service.run_inference_cached(row, bypass=is_bypass(x_cache_bypass))
 
-    # Normalize output to a list of floats
-    if isinstance(y, torch.Tensor):
-        out = y.squeeze().cpu().tolist()
-    else:
-        out = [float(o) for o in y]
+    response.headers[MODEL_VERSION_HEADER] = version
+    response.headers[CACHE_STATUS_HEADER] = cache_status
+    return wire_format.respond(request, response, "prediction", out)
+
+@router.post("/batch", response_model=InferBatchResponse, openapi_extra=wire_format.openapi_body(InferBatchRequest))
+async def infer_batch(request: Request, response: Response, subject: str = Depends(verify_token)):
+    # Pin one version for validation and every chunk of this request
+    entry = ai_service.get_active()
+    expected_input_size = ai_service.get_input_size(entry, MODEL_INPUT_SIZE)
+
+    # Validate the whole N x D shape once, then run in bounded chunks
+    try:
+        if wire_format.request_format(request) == "json":
+            inputs = (await wire_format.parse_json(request, InferBatchRequest)).inputs
+            if len(inputs) > INFER_MAX_BATCH_ROWS:
+                raise HTTPException(
+                    status_code=413,
+                    detail={"error": "Batch too large", "given": len(inputs), "max_rows": INFER_MAX_BATCH_ROWS}
+                )
+        else:
+            inputs = await wire_format.read_matrix(request, "inputs", expected_input_size)
+        matrix = ai_service.to_matrix(inputs, expected_input_size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": str(e), "expected": expected_input_size}
+        )
+
+    if matrix.shape[0] > INFER_MAX_BATCH_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail={"error": "Batch too large", "given": matrix.shape[0], "max_rows": INFER_MAX_BATCH_ROWS}
+        )
 
-    if isinstance(out, float):
-        out = [out]
+    predictions = await executor.run(ai_service.run_matrix_inference, matrix, entry)
+    response.headers[MODEL_VERSION_HEADER] = entry.tag
+    return wire_format.respond(request, response, "predictions", predictions)
 
-    return {"prediction": out}
+@router.get("/stats")
+def infer_stats():
+    """Micro-batcher queue depth, batch-size histogram and wait times, executor load and cache counters."""
+    return {
+        "batcher": ai_service.batcher.snapshot(),
+        "executor": executor.snapshot(),
+        "cache": result_cache.snapshot(),
+    }
@@ -0,0 +1,52 @@
+# backend/ai-service/app/routes/models.py
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from app.routes.infer import verify_token
+from app.services.auth_tokens import require_role
+from app.services.model_loader import allowed_source
+from app.services.model_registry import registry
+
+router = APIRouter()
+
+# Loading, activating and rolling back change what every user is served
+require_admin = require_role("admin")
+
+class ModelLoadRequest(BaseModel):
+    # file path inside MODEL_DIR (torch models) or allow-listed model identifier (HF pipelines)
+    source: str
+    version: str | None = None
+    activate: bool = True
+
+@router.get("/")
+def list_models(subject: str = Depends(verify_token)):
+    return registry.describe()
+
+@router.post("/{name}/load", status_code=202)
+def load_model(name: str, req: ModelLoadRequest, claims: dict = Depends(require_admin)):
+    """Load a new version in the background; it is warmed up before it goes live."""
+    try:
+        source = allowed_source(name, req.source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        registry.load_in_background(name, source, version=req.version, activate=req.activate)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    print(f"ℹ️ {claims['sub']} is loading model '{name}' from '{source}'")
+    return {"name": name, "source": source, "state": "loading"}
+
+@router.post("/{name}/activate/{version}")
+def activate_model(name: str, version: str, claims: dict = Depends(require_admin)):
+    try:
+        entry = registry.activate(name, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return entry.info()
+
+@router.post("/{name}/rollback")
+def rollback_model(name: str, claims: dict = Depends(require_admin)):
+    try:
+        entry = registry.rollback(name)
+    except KeyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return entry.info()
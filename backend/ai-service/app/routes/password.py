@@ -1,18 +1,34 @@
 # backend/ai-service/app/routes/password.py
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services import db_service
-from app.schemas.password_event import PasswordEventCreate, PasswordEventResponse
-from app.db import get_db
-from app.services import model_loader
+from app.schemas.password_event import PasswordEventCreate, PasswordEventResponse, PasswordEventPage
+from app.db import get_async_db
+from app.services import model_loader, password_analysis, breach_index
+from app.config import PASSWORD_BATCH_MAX, PAGE_SIZE_MAX
+from app.services.model_registry import registry, MODEL_VERSION_HEADER
+from app.services.inference_executor import executor, Overloaded
+from app.services.event_sink import sink
 
 router = APIRouter()
 
 # Existing DB-backed route
 @router.post("/", response_model=PasswordEventResponse)
-def add_password_event(event: PasswordEventCreate, db: Session = Depends(get_db)):
-    return db_service.create_password_event(db, event.user_id, event.password_strength)
+async def add_password_event(event: PasswordEventCreate, db: AsyncSession = Depends(get_async_db)):
+    return await db_service.create_password_event(db, event.user_id, event.password_strength)
+
+@router.get("/", response_model=PasswordEventPage)
+async def list_password_events(limit: int = Query(10, ge=1, le=PAGE_SIZE_MAX), cursor: str | None = None,
+                               user_id: int | None = None, since: datetime | None = None, until: datetime | None = None,
+                               db: AsyncSession = Depends(get_async_db)):
+    """Keyset-paginated, newest first (see GET /api/events/)."""
+    try:
+        items, next_cursor = await db_service.list_password_events(db, limit, cursor, user_id, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
 
 # New: AI-backed password check route
 class PasswordCheckRequest(BaseModel):
@@ -25,57 +41,78 @@ class PasswordCheckResponse(BaseModel):
     reasons: list[str] = []
     suggestions: list[str] = []
 
-@router.post("/check", response_model=PasswordCheckResponse)
-def check_password(req: PasswordCheckRequest, db: Session = Depends(get_db)):
-    pw = req.password or ""
-    # Use model_loader's predict_password_strength (provided by your model_loader)
-    try:
-        strength = model_loader.predict_password_strength(model_loader.password_model, pw)
-    except Exception as e:
-        # In case the model fails, fall back to a simple heuristic
-        print(f"⚠️ password model failed: {e}")
-        # fallback heuristic
-        if len(pw) >= 12 and any(c.isupper() for c in pw) and any(c.isdigit() for c in pw) and any(not c.isalnum() for c in pw):
-            strength = "strong"
-        elif len(pw) >= 8:
-            strength = "medium"
-        else:
-            strength = "weak"
-
-    # Produce human readable reasons & suggestions (lightweight)
-    reasons = []
-    suggestions = []
-
-    if len(pw) < 8:
-        reasons.append("Too short")
-        suggestions.append("Make it at least 12 characters long (use a passphrase).")
-    elif len(pw) < 12:
-        reasons.append("Short length")
-        suggestions.append("Consider using 12+ characters for better protection.")
-
-    if not any(c.isupper() for c in pw):
-        reasons.append("No uppercase letters")
-        suggestions.append("Add at least one uppercase letter.")
-    if not any(c.islower() for c in pw):
-        reasons.append("No lowercase letters")
-        suggestions.append("Use lowercase letters.")
-    if not any(c.isdigit() for c in pw):
-        reasons.append("No digits")
-        suggestions.append("Include at least one digit.")
-    if not any(not c.isalnum() for c in pw):
-        reasons.append("No special characters")
-        suggestions.append("Include symbols like !@#$%^&*() to increase entropy.")
-
-    # Log password event if a user_id was provided
-    if req.user_id is not None:
-        try:
-            db_service.create_password_event(db, req.user_id, strength)
-        except Exception as e:
-            print(f"⚠️ Could not create password event: {e}")
+class PasswordBatchCheckRequest(BaseModel):
+    passwords: list[str]
+    user_id: int | None = None  # optional, every result is logged if provided
 
+class PasswordBatchCheckResponse(BaseModel):
+    results: list[PasswordCheckResponse]
+
+def _check_result(pw: str, strength: str, stats, breached: bool) -> dict:
+    reasons, suggestions = password_analysis.reasons_and_suggestions(stats, breached)
     return {
         "password": pw,
         "strength": strength,
         "reasons": reasons,
         "suggestions": suggestions
     }
+
+async def _strengths(stats: list, response: Response) -> list[str]:
+    """Model strengths for precomputed stats; heuristic if the model is unavailable."""
+    try:
+        entry = registry.get("password")
+        strengths = await executor.run(model_loader.predict_password_strength_batch, entry.runtime, stats)
+        response.headers[MODEL_VERSION_HEADER] = entry.tag
+        return strengths
+    except Overloaded:
+        raise
+    except Exception as e:
+        # In case the model fails, fall back to a simple heuristic
+        print(f"⚠️ password model failed: {e}")
+        return [password_analysis.heuristic_strength(s) for s in stats]
+
+def _breach_checked(passwords: list[str], strengths: list[str]) -> tuple[list[str], list[bool]]:
+    """Local memory-mapped lookup; a breached password is weak whatever its shape."""
+    breached = [breach_index.is_breached(pw) for pw in passwords]
+    return ["weak" if b else st for st, b in zip(strengths, breached)], breached
+
+@router.post("/check", response_model=PasswordCheckResponse)
+async def check_password(req: PasswordCheckRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
+    pw = req.password or ""
+    # One scan of the password feeds the model, the fallback and the reasons
+    stats = password_analysis.password_stats(pw)
+    strengths, breached = _breach_checked([pw], await _strengths([stats], response))
+    strength = strengths[0]
+
+    # Log password event if a user_id was provided (write-behind unless disabled)
+    if req.user_id is not None:
+        if sink.enabled:
+            sink.password_events(req.user_id, [strength])
+        else:
+            try:
+                await db_service.create_password_event(db, req.user_id, strength)
+            except Exception as e:
+                print(f"⚠️ Could not create password event: {e}")
+
+    return _check_result(pw, strength, stats, breached[0])
+
+@router.post("/check-batch", response_model=PasswordBatchCheckResponse)
+async def check_password_batch(req: PasswordBatchCheckRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
+    if len(req.passwords) > PASSWORD_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Too many passwords (max {PASSWORD_BATCH_MAX})")
+
+    passwords = [pw or "" for pw in req.passwords]
+    stats = [password_analysis.password_stats(pw) for pw in passwords]
+    # Single PasswordModel forward over the stacked feature matrix
+    strengths, breached = _breach_checked(passwords, await _strengths(stats, response))
+
+    if req.user_id is not None and strengths:
+        if sink.enabled:
+            sink.password_events(req.user_id, strengths)
+        else:
+            try:
+                await db_service.create_password_events(db, req.user_id, strengths)
+            except Exception as e:
+                print(f"⚠️ Could not create password events: {e}")
+
+    return {"results": [_check_result(*row) for row in zip(passwords, strengths, stats, breached)]}
@@ -1,17 +1,38 @@
 # backend/ai-service/app/routes/phishing.py
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Header, HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services import db_service
-from app.schemas.phishing import PhishingAttemptCreate, PhishingAttemptResponse
-from app.db import get_db
-from app.services import model_loader
+from app.schemas.phishing import PhishingAttemptCreate, PhishingAttemptResponse, PhishingAttemptPage
+from app.db import get_async_db
+from app.services import phishing_service
+from app.services.domain_reputation import reputation
+from app.services.result_cache import is_bypass
+from app.services.auth_tokens import require_role
+from app.services.event_sink import sink
+from app.config import PHISHING_BATCH_MAX, PAGE_SIZE_MAX
+from app.services.model_registry import MODEL_VERSION_HEADER
 
 router = APIRouter()
 
+# Reloading the reputation lists changes verdicts for every user
+require_admin = require_role("admin")
+
 @router.post("/", response_model=PhishingAttemptResponse)
-def create_phishing(event: PhishingAttemptCreate, db: Session = Depends(get_db)):
-    return db_service.create_phishing_attempt(db, event.user_id, event.url, event.result)
+async def create_phishing(event: PhishingAttemptCreate, db: AsyncSession = Depends(get_async_db)):
+    return await db_service.create_phishing_attempt(db, event.user_id, event.url, event.result)
+
+@router.get("/", response_model=PhishingAttemptPage)
+async def list_phishing_attempts(limit: int = Query(10, ge=1, le=PAGE_SIZE_MAX), cursor: str | None = None,
+                                 user_id: int | None = None, since: datetime | None = None, until: datetime | None = None,
+                                 db: AsyncSession = Depends(get_async_db)):
+    """Keyset-paginated, newest first (see GET /api/events/)."""
+    try:
+        items, next_cursor = await db_service.list_phishing_attempts(db, limit, cursor, user_id, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
 
 # New: check endpoint
 class PhishingCheckRequest(BaseModel):
@@ -21,27 +42,67 @@ class PhishingCheckRequest(BaseModel):
 class PhishingCheckResponse(BaseModel):
     text: str
     result: str
+    tier: str | None = None  # reputation / cache / prefilter / zero_shot / heuristic
+
+class PhishingBatchCheckRequest(BaseModel):
+    texts: list[str]
+    user_id: int | None = None  # optional, every result is logged if provided
+
+class PhishingBatchCheckResponse(BaseModel):
+    results: list[PhishingCheckResponse]
 
 @router.post("/check", response_model=PhishingCheckResponse)
-def check_phishing(req: PhishingCheckRequest, db: Session = Depends(get_db)):
+async def check_phishing(req: PhishingCheckRequest, response: Response, db: AsyncSession = Depends(get_async_db),
+                         x_cache_bypass: str | None = Header(default=None)):
     txt = req.text or ""
-    try:
-        result = model_loader.check_phishing(model_loader.phishing_model, txt)
-    except Exception as e:
-        print(f"⚠️ phishing model failed: {e}")
-        # fallback heuristic: suspicious if it contains obvious patterns
-        if "@" in txt and ("http" not in txt):
-            result = "suspicious"
-        elif "login" in txt.lower() or "password" in txt.lower():
-            result = "suspicious"
-        else:
-            result = "safe"
+    # Reputation, cache and prefilter first; ambiguous texts share one zero-shot pipeline call
+    result, version, tier = await phishing_service.classify(txt, bypass_cache=is_bypass(x_cache_bypass))
+    if version is not None:
+        response.headers[MODEL_VERSION_HEADER] = version
+    response.headers[phishing_service.TIER_HEADER] = tier
 
-    # Log attempt if user_id provided
+    # Log attempt if user_id provided (write-behind unless disabled)
     if req.user_id is not None:
-        try:
-            db_service.create_phishing_attempt(db, req.user_id, txt, result)
-        except Exception as e:
-            print(f"⚠️ Could not create phishing attempt record: {e}")
+        if sink.enabled:
+            sink.phishing_attempts(req.user_id, [(txt, result)])
+        else:
+            try:
+                await db_service.create_phishing_attempt(db, req.user_id, txt, result)
+            except Exception as e:
+                print(f"⚠️ Could not create phishing attempt record: {e}")
+
+    return {"text": txt, "result": result, "tier": tier}
+
+@router.post("/check-batch", response_model=PhishingBatchCheckResponse)
+async def check_phishing_batch(req: PhishingBatchCheckRequest, response: Response, db: AsyncSession = Depends(get_async_db),
+                               x_cache_bypass: str | None = Header(default=None)):
+    if len(req.texts) > PHISHING_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {PHISHING_BATCH_MAX} texts per batch")
+
+    texts = [t or "" for t in req.texts]
+    results, tiers, version = await phishing_service.classify_many(texts, bypass_cache=is_bypass(x_cache_bypass))
+    if version is not None:
+        response.headers[MODEL_VERSION_HEADER] = version
+
+    # One commit for the whole batch (or handed to the write-behind sink)
+    if req.user_id is not None and texts:
+        if sink.enabled:
+            sink.phishing_attempts(req.user_id, list(zip(texts, results)))
+        else:
+            try:
+                await db_service.create_phishing_attempts(db, req.user_id, list(zip(texts, results)))
+            except Exception as e:
+                print(f"⚠️ Could not create phishing attempt records: {e}")
+
+    return {"results": [{"text": t, "result": r, "tier": tier} for t, r, tier in zip(texts, results, tiers)]}
+
+@router.get("/stats")
+def phishing_stats():
+    """Per-tier counters and latency, cache and reputation state, and zero-shot batch statistics."""
+    return phishing_service.snapshot()
 
-    return {"text": txt, "result": result}
+@router.post("/reputation/reload", status_code=202)
+def reload_reputation(claims: dict = Depends(require_admin)):
+    """Re-read the domain lists now; the reload runs in the background. Admins only."""
+    reputation.request_reload()
+    return {"status": "reloading", "reputation": reputation.snapshot()}
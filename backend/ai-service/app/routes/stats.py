@@ -0,0 +1,37 @@
+# backend/ai-service/app/routes/stats.py
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db
+from app.services import rollups
+from app.schemas.stats import StatsResponse
+from app.config import STATS_MAX_RANGE_DAYS
+
+router = APIRouter()
+
+@router.get("/", response_model=StatsResponse, response_model_exclude_none=True)
+async def get_stats(source: str = Query(..., description="events, password_events, phishing_attempts or audit_logs"),
+                    bucket: str = "hour", group_by: List[str] = Query([]),
+                    user_id: int | None = None, label: str | None = None,
+                    since: datetime | None = None, until: datetime | None = None,
+                    db: AsyncSession = Depends(get_async_db)):
+    """
+    Counts from the hourly rollups, e.g. weak passwords per user per day:
+      /api/stats?source=password_events&label=weak&bucket=day&group_by=user
+    label is the event type, password strength, phishing result or audit action.
+    The range defaults to the last 7 days.
+    """
+    if source not in rollups.LABEL_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown source '{source}' (expected one of {list(rollups.LABEL_COLUMNS)})")
+    if bucket not in rollups.BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Unknown bucket '{bucket}' (expected one of {list(rollups.BUCKETS)})")
+    unknown = set(group_by) - set(rollups.GROUPS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot group by {sorted(unknown)} (expected {list(rollups.GROUPS)})")
+    since, until = rollups.default_range(since, until)
+    if (until - since).days > STATS_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too wide (max {STATS_MAX_RANGE_DAYS} days)")
+
+    rows = await rollups.query(db, source, since, until, bucket, tuple(group_by), user_id, label)
+    return {"source": source, "bucket": bucket, "since": since, "until": until, "rows": rows}
@@ -14,3 +14,6 @@ class AuditLogResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class AuditLogBulkItem(AuditLogCreate):
+    created_at: datetime | None = None
@@ -0,0 +1,13 @@
+# backend/ai-service/app/schemas/bulk.py
+from pydantic import BaseModel
+
+class BulkRowError(BaseModel):
+    index: int  # 0-based position of the record in the array / NDJSON stream
+    error: str
+
+class BulkIngestResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    truncated: bool = False
+    errors: list[BulkRowError] = []
@@ -16,3 +16,12 @@ class EventResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class EventBulkItem(EventCreate):
+    # Upstream systems may replay older events; defaults to ingestion time
+    created_at: datetime | None = None
+
+class EventPage(BaseModel):
+    items: list[EventResponse]
+    # Opaque; pass back as ?cursor= for the next page. None on the last page
+    next_cursor: str | None = None
@@ -8,3 +8,10 @@ class InferRequest(BaseModel):
 
 class InferResponse(BaseModel):
     prediction: List[float]
+
+class InferBatchRequest(BaseModel):
+    # N x D matrix: one row of floats per sample
+    inputs: List[List[float]]
+
+class InferBatchResponse(BaseModel):
+    predictions: List[List[float]]
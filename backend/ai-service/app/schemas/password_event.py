@@ -14,3 +14,8 @@ class PasswordEventResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class PasswordEventPage(BaseModel):
+    items: list[PasswordEventResponse]
+    # Opaque; pass back as ?cursor= for the next page. None on the last page
+    next_cursor: str | None = None
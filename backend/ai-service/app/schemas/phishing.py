@@ -16,3 +16,8 @@ class PhishingAttemptResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+class PhishingAttemptPage(BaseModel):
+    items: list[PhishingAttemptResponse]
+    # Opaque; pass back as ?cursor= for the next page. None on the last page
+    next_cursor: str | None = None
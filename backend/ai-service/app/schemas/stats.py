@@ -0,0 +1,16 @@
+# backend/ai-service/app/schemas/stats.py
+from pydantic import BaseModel
+from datetime import datetime
+
+class StatsRow(BaseModel):
+    bucket: datetime
+    user_id: int | None = None  # present when grouped by user (0 = no user)
+    label: str | None = None    # present when grouped by label
+    count: int
+
+class StatsResponse(BaseModel):
+    source: str
+    bucket: str
+    since: datetime
+    until: datetime
+    rows: list[StatsRow]
@@ -1,32 +1,36 @@
 # backend/ai-service/app/services/ai_service.py
+import warnings
+import numpy as np
 import torch
+from app.config import INFER_MAX_BATCH_SIZE, INFER_MAX_WAIT_MS, INFER_BATCH_CHUNK_SIZE, INFER_QUEUE_SIZE, MODEL_INPUT_SIZE
+from app.services.batching import MicroBatcher
+from app.services.inference_executor import executor
+from app.services.result_cache import result_cache, input_key
+from app.services.model_registry import registry, ModelVersion
 
-# Internal storage for the AI model
-_MODEL = None
+# Registry name of the generic /api/infer model
+MODEL_NAME = "infer"
 
-def set_model(model):
-    """Set the global AI model."""
-    global _MODEL
-    _MODEL = model
+def set_model(model, version: str | None = None, source: str | None = None) -> ModelVersion:
+    """Register a model version for /api/infer and make it active."""
+    return registry.register(MODEL_NAME, model, version=version, source=source)
+
+def get_active() -> ModelVersion:
+    """Get the active model version. Raises RuntimeError if not loaded."""
+    if not registry.is_loaded(MODEL_NAME):
+        raise RuntimeError("AI model not loaded. Call set_model() first.")
+    return registry.get(MODEL_NAME)
 
 def get_model():
     """Get the global AI model. Raises RuntimeError if not loaded."""
-    if _MODEL is None:
-        raise RuntimeError("AI model not loaded. Call set_model() first.")
-    return _MODEL
+    return get_active().model
 
-def run_inference(input_list: list[float]) -> list[float]:
-    """
-    Run inference on a single input list.
-    Returns a list of floats.
-    """
-    model = get_model()
-    x = torch.tensor([input_list], dtype=torch.float32)
-    
-    with torch.no_grad():
-        y = model(x)
+def get_input_size(entry: ModelVersion, default: int = MODEL_INPUT_SIZE) -> int:
+    """Expected feature count, taken from the metadata computed at registration."""
+    return int(entry.in_features) if entry.in_features is not None else int(default)
 
-    # Convert output to a list of floats
+def _to_list(y) -> list[float]:
+    """Normalize a single model output to a list of floats."""
     if isinstance(y, torch.Tensor):
         out = y.squeeze().cpu().tolist()
     elif isinstance(y, (float, int)):
@@ -41,3 +45,122 @@ def run_inference(input_list: list[float]) -> list[float]:
         out = [out]
 
     return out
+
+def run_inference(input_list: list[float]) -> list[float]:
+    """
+    Run inference on a single input list.
+    Returns a list of floats.
+    """
+    model = get_model()
+    x = torch.tensor([input_list], dtype=torch.float32)
+
+    with torch.no_grad():
+        y = model(x)
+
+    return _to_list(y)
+
+def forward_matrix(entry: ModelVersion, x: np.ndarray) -> np.ndarray:
+    """
+    Evaluate an N x D float32 array and return an N x K float32 array.
+    Uses the version's NumPy fast path when it has one, torch otherwise.
+    """
+    if entry.numpy is not None:
+        return entry.numpy(x)
+
+    with warnings.catch_warnings():
+        # Wire-format inputs are read-only views over the request body; models
+        # never write to their inputs, so torch's warning about that is noise
+        warnings.filterwarnings("ignore", message="The given NumPy array is not writable")
+        tensor = torch.from_numpy(np.ascontiguousarray(x))
+    with torch.no_grad():
+        y = entry.model(tensor)
+    if not isinstance(y, torch.Tensor):
+        raise RuntimeError(f"Model returned unsupported type for a batch: {type(y)}")
+    return y.detach().cpu().numpy().reshape(x.shape[0], -1)
+
+def run_batch_inference(rows: list) -> list[tuple[list[float], str]]:
+    """
+    Run one stacked forward pass over equal-length rows.
+    Returns one (output, version) pair per row; outputs are shaped like
+    run_inference's and the whole batch is served by the same version.
+    """
+    entry = get_active()
+    # Rows may be lists or float32 views decoded straight from a binary body
+    y = forward_matrix(entry, np.asarray(rows, dtype=np.float32))
+    return [(row.tolist(), entry.tag) for row in y]
+
+def to_matrix(rows, expected_input_size: int) -> np.ndarray:
+    """
+    Convert an N x D nested list into one contiguous float32 array.
+    Raises ValueError if the rows are ragged or D != expected_input_size.
+    """
+    if len(rows) == 0:
+        return np.zeros((0, expected_input_size), dtype=np.float32)
+    try:
+        matrix = np.asarray(rows, dtype=np.float32)
+    except ValueError:
+        # NumPy's own message ("inhomogeneous shape ...") means nothing to clients
+        for i, row in enumerate(rows):
+            given = len(row) if hasattr(row, "__len__") else 1
+            if given != expected_input_size:
+                raise ValueError(f"Rows have different lengths: row {i} has {given} values, "
+                                 f"expected {expected_input_size}") from None
+        raise ValueError("Rows must contain only numbers") from None
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D matrix, got {matrix.ndim} dimension(s)")
+    if matrix.shape[1] != expected_input_size:
+        raise ValueError(f"Wrong input size: given {matrix.shape[1]}, expected {expected_input_size}")
+    return matrix
+
+def run_matrix_inference(matrix: np.ndarray, entry: ModelVersion | None = None, chunk_size: int = INFER_BATCH_CHUNK_SIZE) -> np.ndarray:
+    """
+    Run an N x D float32 matrix through the model in chunks of `chunk_size` rows.
+    Pass the `entry` the shape was validated against so every chunk uses it.
+    Returns an N x K float32 array.
+    """
+    entry = entry or get_active()
+    chunk_size = max(1, int(chunk_size))
+    outputs = []
+
+    for start in range(0, matrix.shape[0], chunk_size):
+        outputs.append(forward_matrix(entry, matrix[start:start + chunk_size]))
+
+    if not outputs:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.concatenate(outputs, axis=0)
+
+# Shared scheduler: concurrent callers are stacked into one forward pass
+batcher = MicroBatcher(
+    run_batch_inference,
+    max_batch_size=INFER_MAX_BATCH_SIZE,
+    max_wait_ms=INFER_MAX_WAIT_MS,
+    runner=executor.run,
+    max_queue=INFER_QUEUE_SIZE,
+)
+
+async def run_inference_batched(input_list: list[float]) -> tuple[list[float], str]:
+    """
+    Async variant of run_inference that goes through the micro-batcher.
+    Returns (output, model version tag).
+    """
+    return await batcher.submit(input_list)
+
+async def run_inference_cached(input_list: list[float], bypass: bool = False) -> tuple[list[float], str, str]:
+    """
+    run_inference_batched behind the result cache.
+    Returns (output, model version tag, cache status: HIT / MISS / BYPASS).
+    """
+    if bypass:
+        out, version = await run_inference_batched(input_list)
+        return out, version, "BYPASS"
+
+    key = input_key(input_list, get_active().tag)
+    cached = result_cache.get(key)
+    if cached is not None:
+        out, version = cached
+        return list(out), version, "HIT"
+
+    out, version = await run_inference_batched(input_list)
+    # Store under the version that actually answered (it may have just been swapped)
+    result_cache.put(input_key(input_list, version), (out, version))
+    return out, version, "MISS"
@@ -0,0 +1,62 @@
+# backend/ai-service/app/services/auth_tokens.py
+"""
+Signed login tokens and role checks.
+
+/api/auth/login issues an HS256 JWT carrying the account's roles (from
+ADMIN_EMAILS / COMPLIANCE_EMAILS). Routes that change what every user is
+served, or that read other users' data, depend on require_role(), which
+verifies the signature and expiry before looking at the roles.
+
+Registration never verifies an email address, so /api/auth/register refuses
+the privileged ones (is_privileged); operators create those accounts with
+create_account.py.
+"""
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from fastapi import Header, HTTPException
+
+from app.config import JWT_SECRET, JWT_EXPIRE_MINUTES, ADMIN_EMAILS, COMPLIANCE_EMAILS
+
+ALGORITHM = "HS256"
+
+def roles_for(email: str) -> list[str]:
+    email = email.lower()
+    roles = []
+    if email in ADMIN_EMAILS:
+        roles.append("admin")
+    if email in COMPLIANCE_EMAILS:
+        roles.append("compliance")
+    return roles
+
+def is_privileged(email: str) -> bool:
+    """True for addresses that get a role; these accounts are provisioned, not self-registered."""
+    return bool(roles_for(email))
+
+def issue_token(email: str) -> str:
+    claims = {
+        "sub": email,
+        "roles": roles_for(email),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=JWT_EXPIRE_MINUTES),
+    }
+    return jwt.encode(claims, JWT_SECRET, algorithm=ALGORITHM)
+
+def decode_token(token: str) -> dict:
+    """Verified claims; raises jwt.InvalidTokenError for bad signatures, expiry or garbage."""
+    return jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM], options={"require": ["sub", "exp"]})
+
+def require_role(*roles: str):
+    """Dependency: 401 without a valid token, 403 unless it carries one of `roles`. Returns the claims."""
+
+    def dependency(authorization: str | None = Header(None)) -> dict:
+        if not authorization or not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Missing or invalid token")
+        try:
+            claims = decode_token(authorization.split(" ", 1)[1])
+        except jwt.InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Missing or invalid token")
+        if not set(roles) & set(claims.get("roles") or []):
+            raise HTTPException(status_code=403, detail=f"Requires role: {' or '.join(roles)}")
+        return claims
+
+    return dependency
@@ -0,0 +1,190 @@
+# backend/ai-service/app/services/batching.py
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Sequence
+
+from app.services.overload import Overloaded
+
+# -------------------------------
+# Stats
+# -------------------------------
+class BatcherStats:
+    """Counters used to tune max batch size / max wait under real load."""
+
+    def __init__(self):
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_size_histogram: dict[int, int] = defaultdict(int)
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_forward_ms = 0.0
+
+    def record_batch(self, size: int, waits_ms: Sequence[float], forward_ms: float):
+        self.requests += size
+        self.batches += 1
+        self.batch_size_histogram[size] += 1
+        self.total_wait_ms += sum(waits_ms)
+        self.max_wait_ms = max(self.max_wait_ms, max(waits_ms, default=0.0))
+        self.total_forward_ms += forward_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+            "avg_wait_ms": self.total_wait_ms / self.requests if self.requests else 0.0,
+            "max_wait_ms": self.max_wait_ms,
+            "avg_forward_ms": self.total_forward_ms / self.batches if self.batches else 0.0,
+        }
+
+# -------------------------------
+# Micro-batcher
+# -------------------------------
+class MicroBatcher:
+    """
+    Collects rows submitted by concurrent requests and runs them through
+    `forward` as one stacked batch.
+
+    `forward(rows)` receives a list of rows and must return one result per
+    row, in order. Rows with different `group_key(row)` values (row length
+    by default) are never stacked together; they go to separate forward calls.
+
+    `runner(fn, rows)` is awaited to execute the forward off the event loop
+    (defaults to the loop's default executor). Once `max_queue` rows are
+    waiting, further submits raise Overloaded.
+
+    The queue lives as long as the batcher. If the worker dies or stop() is
+    called, every queued and in-flight row fails instead of waiting forever;
+    the next submit starts a new worker on the same queue.
+    """
+
+    def __init__(self, forward: Callable[[list[list[float]]], list[Any]], max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 runner: Callable[..., Awaitable[Any]] | None = None, max_queue: int = 0,
+                 group_key: Callable[[Any], Any] = len):
+        self.forward = forward
+        self.group_key = group_key
+        self.runner = runner
+        self.max_queue = max(0, int(max_queue))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.stats = BatcherStats()
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        # Items taken off the queue by the worker and not yet answered
+        self._batch: list = []
+
+    def _ensure_started(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            self._worker.add_done_callback(self._worker_done)
+
+    def _fail_pending(self, exc: BaseException):
+        """Fail the in-flight batch and everything still queued."""
+        items, self._batch = self._batch, []
+        while self._queue is not None and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        for _, future, _ in items:
+            if not future.done():
+                future.set_exception(exc)
+
+    def _worker_done(self, task: asyncio.Task):
+        if task.cancelled():
+            self._fail_pending(Overloaded("Inference batcher stopped"))
+            return
+        exc = task.exception()
+        if exc is not None:
+            print(f"❌ Micro-batcher worker crashed: {exc!r}")
+            self._fail_pending(exc)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, row: Any) -> Any:
+        """Queue a single row and wait for its result."""
+        self._ensure_started()
+        if self.max_queue and self._queue.qsize() >= self.max_queue:
+            raise Overloaded("Inference batch queue full")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        return await future
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._fail_pending(Overloaded("Inference batcher stopped"))
+
+    async def _collect(self) -> list:
+        # Collected into self._batch so a cancelled or crashed worker can fail them
+        batch = self._batch
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without yielding
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            waits_ms = [(started - enqueued) * 1000.0 for _, _, enqueued in batch]
+
+            # Group by row length (by default) so each forward gets a rectangular matrix
+            groups: dict[Any, list] = defaultdict(list)
+            for item in batch:
+                groups[self.group_key(item[0])].append(item)
+
+            for items in groups.values():
+                rows = [row for row, _, _ in items]
+                try:
+                    # Run torch off the event loop so other requests keep queueing
+                    if self.runner is not None:
+                        results = await self.runner(self.forward, rows)
+                    else:
+                        results = await loop.run_in_executor(None, self.forward, rows)
+                    if len(results) != len(items):
+                        raise RuntimeError(f"Batch forward returned {len(results)} results for {len(items)} rows")
+                except Exception as e:
+                    self.stats.errors += len(items)
+                    for _, future, _ in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future, _), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+
+            self._batch = []
+            self.stats.record_batch(len(batch), waits_ms, (time.perf_counter() - started) * 1000.0)
+
+    def snapshot(self) -> dict:
+        data = self.stats.as_dict()
+        data["queue_depth"] = self.queue_depth()
+        data["config"] = {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_queue": self.max_queue,
+        }
+        return data
@@ -0,0 +1,124 @@
+# backend/ai-service/app/services/breach_index.py
+"""
+Memory-mapped index of breached password hashes.
+
+File layout (all integers little-endian, every section 8-byte aligned):
+
+  header   32 bytes   magic "SCBRIDX1", version u32, fanout_bits u32,
+                      count u64, reserved u64
+  fanout   (2**fanout_bits + 1) x u64
+                      fanout[b] = index of the first key whose top
+                      `fanout_bits` bits equal b
+  keys     count x u64, sorted ascending
+                      key = first 8 bytes of SHA-1(password), big-endian
+
+A lookup reads one fanout slot and binary-searches a few hundred keys, so it
+touches one or two pages of the mapping. 64-bit prefixes make false
+positives negligible (~count / 2**64).
+"""
+import hashlib
+import os
+import struct
+import threading
+
+import numpy as np
+
+from app.config import BREACH_INDEX_PATH
+
+MAGIC = b"SCBRIDX1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+DEFAULT_FANOUT_BITS = 16
+
+def password_key(password: str) -> int:
+    return int.from_bytes(hashlib.sha1(password.encode("utf-8")).digest()[:8], "big")
+
+def sha1_hex_key(sha1_hex: str) -> int:
+    return int(sha1_hex[:16], 16)
+
+def write_index(path: str, sorted_keys_chunks, count: int, fanout_bits: int = DEFAULT_FANOUT_BITS):
+    """
+    Write an index file from an iterable of already globally sorted, de-duplicated
+    uint64 arrays whose total length is `count`.
+    """
+    shift = np.uint64(64 - fanout_bits)
+    fanout = np.zeros(2 ** fanout_bits + 1, dtype="<u8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, fanout_bits, count, 0))
+        fanout_offset = f.tell()
+        f.write(fanout.tobytes())
+        written = 0
+        for chunk in sorted_keys_chunks:
+            chunk = np.asarray(chunk, dtype="<u8")
+            if chunk.size == 0:
+                continue
+            # Count keys per top-bits bucket for the fanout table
+            fanout[1:] += np.bincount((chunk >> shift).astype(np.int64), minlength=2 ** fanout_bits).astype("<u8")
+            f.write(chunk.tobytes())
+            written += chunk.size
+        if written != count:
+            raise ValueError(f"Expected {count} keys, wrote {written}")
+        np.cumsum(fanout, out=fanout)
+        f.seek(fanout_offset)
+        f.write(fanout.tobytes())
+    os.replace(tmp, path)
+
+class BreachIndex:
+    """Read-only view over an index file; safe to share between threads."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            magic, version, fanout_bits, count, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a breach index (magic={magic!r}, version={version})")
+        self.path = path
+        self.count = count
+        self.fanout_bits = fanout_bits
+        self._shift = 64 - fanout_bits
+        fanout_len = 2 ** fanout_bits + 1
+        # mode="r" maps the file read-only: pages live in the shared page cache
+        self._fanout = np.memmap(path, dtype="<u8", mode="r", offset=HEADER.size, shape=(fanout_len,))
+        keys_offset = HEADER.size + fanout_len * 8
+        self._keys = np.memmap(path, dtype="<u8", mode="r", offset=keys_offset, shape=(count,)) if count else np.zeros(0, dtype="<u8")
+
+    def contains_key(self, key: int) -> bool:
+        bucket = key >> self._shift
+        lo = int(self._fanout[bucket])
+        hi = int(self._fanout[bucket + 1])
+        if lo == hi:
+            return False
+        keys = self._keys[lo:hi]
+        i = int(np.searchsorted(keys, np.uint64(key)))
+        return i < hi - lo and int(keys[i]) == key
+
+    def contains(self, password: str) -> bool:
+        return self.contains_key(password_key(password))
+
+# -------------------------------
+# Shared instance
+# -------------------------------
+_INDEX: BreachIndex | None = None
+_INDEX_LOADED = False
+_INDEX_LOCK = threading.Lock()
+
+def get_index(path: str = BREACH_INDEX_PATH) -> BreachIndex | None:
+    """Open the configured index once per process; None if it is missing."""
+    global _INDEX, _INDEX_LOADED
+    if not _INDEX_LOADED:
+        with _INDEX_LOCK:
+            if not _INDEX_LOADED:
+                if os.path.exists(path):
+                    try:
+                        _INDEX = BreachIndex(path)
+                        print(f"✅ Loaded breach index '{path}' ({_INDEX.count} hashes)")
+                    except Exception as e:
+                        print(f"⚠️ Could not open breach index '{path}': {e}")
+                else:
+                    print(f"ℹ️ No breach index at '{path}'. Breach checks disabled.")
+                _INDEX_LOADED = True
+    return _INDEX
+
+def is_breached(password: str) -> bool:
+    index = get_index()
+    return index is not None and index.contains(password)
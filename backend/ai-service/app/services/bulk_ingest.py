@@ -0,0 +1,200 @@
+# backend/ai-service/app/services/bulk_ingest.py
+"""
+Bulk ingestion of Event and AuditLog rows.
+
+The request body is either a JSON array of records or NDJSON (one record per
+line). Which one it is depends on the first non-blank byte: "[" means an
+array, anything else means NDJSON. NDJSON is parsed while the body streams
+in, so chunks are written before the upload has finished.
+
+Every record is validated on its own. Valid records are collected into
+chunks of BULK_INGEST_CHUNK_SIZE, and each chunk is written with one
+multi-row INSERT in one transaction. A record that fails parsing,
+validation or a foreign-key check is reported by its index; it does not
+reject the rest of its chunk. If a chunk INSERT still violates a
+constraint, that chunk is retried row by row inside savepoints, so only the
+offending rows are dropped.
+
+Chunks that were already committed stay committed if a later chunk fails
+for another reason (e.g. the database goes away).
+"""
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import (
+    BULK_INGEST_CHUNK_SIZE, BULK_INGEST_MAX_ROWS, BULK_INGEST_MAX_BYTES, BULK_INGEST_MAX_ERRORS,
+)
+from app.services import db_service
+
+class _Invalid:
+    """Stands in for a record that could not be parsed."""
+
+    def __init__(self, error: str):
+        self.error = error
+
+class _TooLarge(Exception):
+    pass
+
+# -------------------------------
+# Parsing
+# -------------------------------
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return _Invalid(f"invalid JSON: {e}")
+
+async def read_records(request: Request, max_bytes: int = BULK_INGEST_MAX_BYTES) -> AsyncIterator[tuple[int, object]]:
+    """Yield (index, record) from a JSON array or NDJSON body; bad lines yield _Invalid."""
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Body too large (max {max_bytes} bytes)")
+
+    buffer = b""
+    parts: list[bytes] = []
+    received = 0
+    is_array = None
+    index = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise _TooLarge()
+        if is_array is None:
+            buffer += chunk
+            head = buffer.lstrip()
+            if not head:
+                continue
+            is_array = head.startswith(b"[")
+            chunk, buffer = buffer, b""
+        if is_array:
+            # Arrays are parsed once complete; the byte limit bounds what is held
+            parts.append(chunk)
+            continue
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _parse_line(line)
+                index += 1
+
+    if is_array:
+        try:
+            records = json.loads(b"".join(parts))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON array: {e}")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON")
+        for index, record in enumerate(records):
+            yield index, record
+    elif buffer.strip():
+        yield index, _parse_line(buffer)
+
+# -------------------------------
+# Validation
+# -------------------------------
+def _describe(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'record'}: {err['msg']}" for err in e.errors())
+
+def _row(item: BaseModel) -> dict:
+    row = item.model_dump()
+    created_at = row.get("created_at")
+    if created_at is None:
+        row["created_at"] = datetime.now(timezone.utc)
+    elif created_at.tzinfo is None:
+        # created_at columns are timestamptz; naive timestamps are taken as UTC
+        row["created_at"] = created_at.replace(tzinfo=timezone.utc)
+    return row
+
+# -------------------------------
+# Ingestion
+# -------------------------------
+class _Result:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.truncated = False
+        self.errors: list[dict] = []
+
+    def fail(self, index: int, error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"index": index, "error": error})
+
+    def as_dict(self) -> dict:
+        return {"received": self.received, "inserted": self.inserted, "failed": self.failed,
+                "truncated": self.truncated, "errors": self.errors}
+
+async def _write_chunk(db: AsyncSession, chunk: list[tuple[int, dict]], insert: Callable[[AsyncSession, list[dict]], Awaitable],
+                       check_users: bool, result: _Result):
+    if check_users:
+        # One query per chunk instead of letting the FK fail the whole INSERT
+        known = await db_service.existing_user_ids(db, {row["user_id"] for _, row in chunk})
+        for index, row in chunk:
+            if row["user_id"] not in known:
+                result.fail(index, f"user_id: unknown user {row['user_id']}")
+        chunk = [(index, row) for index, row in chunk if row["user_id"] in known]
+    if not chunk:
+        await db.rollback()
+        return
+    try:
+        await insert(db, [row for _, row in chunk])
+        await db.commit()
+        result.inserted += len(chunk)
+        return
+    except IntegrityError:
+        await db.rollback()
+    # Some row still violates a constraint: same transaction, one savepoint per row
+    inserted = 0
+    for index, row in chunk:
+        try:
+            async with db.begin_nested():
+                await insert(db, [row])
+            inserted += 1
+        except IntegrityError as e:
+            result.fail(index, f"rejected by database: {e.orig}")
+    await db.commit()
+    result.inserted += inserted
+
+async def ingest(db: AsyncSession, request: Request, schema: type[BaseModel],
+                 insert: Callable[[AsyncSession, list[dict]], Awaitable], check_users: bool = False,
+                 chunk_size: int = BULK_INGEST_CHUNK_SIZE, max_rows: int = BULK_INGEST_MAX_ROWS,
+                 max_errors: int = BULK_INGEST_MAX_ERRORS) -> _Result:
+    result = _Result(max_errors)
+    chunk: list[tuple[int, dict]] = []
+    chunk_size = max(1, chunk_size)
+    try:
+        async for index, record in read_records(request):
+            if result.received >= max_rows:
+                result.truncated = True
+                break
+            result.received += 1
+            if isinstance(record, _Invalid):
+                result.fail(index, record.error)
+                continue
+            try:
+                chunk.append((index, _row(schema.model_validate(record))))
+            except ValidationError as e:
+                result.fail(index, _describe(e))
+                continue
+            if len(chunk) >= chunk_size:
+                await _write_chunk(db, chunk, insert, check_users, result)
+                chunk = []
+    except _TooLarge:
+        result.truncated = True
+    if chunk:
+        await _write_chunk(db, chunk, insert, check_users, result)
+    return result
+
+def respond(result: _Result):
+    """200 with the per-row report, or 413 with the same report if the body was cut off."""
+    if result.truncated:
+        return JSONResponse(status_code=413, content=result.as_dict())
+    return result.as_dict()
@@ -0,0 +1,141 @@
+# backend/ai-service/app/services/bulk_sources.py
+"""
+Streaming record readers for bulk scans of exported corpora.
+
+Every reader yields (offset, record) pairs, where `offset` is the byte offset
+just past the record. Passing a saved offset back as `start` resumes right
+after the last record that was processed. Files are read line by line, so
+memory stays bounded by the largest single record.
+
+  mbox   one record per message: {"id", "subject", "from", "text"}
+  jsonl  one JSON object per line
+  csv    one dict per row (header from the first line; quoted multi-line
+         fields are supported)
+"""
+import csv
+import email
+import email.policy
+import html
+import json
+import os
+import re
+from typing import Iterator
+
+MAX_TEXT_CHARS = 20000
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def detect_format(path: str) -> str:
+    name = path.lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".mbox", ".mbx")) or os.path.basename(name) == "mbox":
+        return "mbox"
+    raise ValueError(f"Cannot tell the format of '{path}'; pass --format")
+
+# -------------------------------
+# mbox
+# -------------------------------
+def _message_text(msg) -> str:
+    """Plain-text body of a message; HTML parts are stripped of tags if there is no text part."""
+    plain, markup = [], []
+    for part in msg.walk():
+        if part.is_multipart() or part.get_content_disposition() == "attachment":
+            continue
+        ctype = part.get_content_type()
+        if ctype not in ("text/plain", "text/html"):
+            continue
+        try:
+            content = part.get_content()
+        except Exception:
+            payload = part.get_payload(decode=True) or b""
+            content = payload.decode("utf-8", errors="replace")
+        (plain if ctype == "text/plain" else markup).append(content)
+    if plain:
+        return "\n".join(plain)
+    return html.unescape(_TAG_RE.sub(" ", "\n".join(markup)))
+
+def _mbox_record(raw: bytes) -> dict:
+    msg = email.message_from_bytes(raw, policy=email.policy.default)
+    subject = str(msg.get("Subject", "") or "")
+    body = _message_text(msg)
+    return {
+        "id": str(msg.get("Message-ID", "") or "").strip() or None,
+        "subject": subject,
+        "from": str(msg.get("From", "") or ""),
+        "text": (subject + "\n" + body)[:MAX_TEXT_CHARS],
+    }
+
+def read_mbox(path: str, start: int = 0) -> Iterator[tuple[int, dict]]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        message: list[bytes] = []
+        for line in f:
+            # "From " envelope lines separate messages (body lines are escaped as ">From ")
+            if line.startswith(b"From "):
+                if message:
+                    yield offset, _mbox_record(b"".join(message))
+                    message = []
+            else:
+                message.append(line)
+            offset += len(line)
+        if message:
+            yield offset, _mbox_record(b"".join(message))
+
+# -------------------------------
+# JSONL
+# -------------------------------
+def read_jsonl(path: str, start: int = 0) -> Iterator[tuple[int, dict]]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = {"_error": f"invalid JSON: {e}"}
+            if not isinstance(record, dict):
+                record = {"value": record}
+            yield offset, record
+
+# -------------------------------
+# CSV
+# -------------------------------
+class _CountingLines:
+    """Decoded lines of a binary file, counting the bytes handed out so far."""
+
+    def __init__(self, f, offset: int):
+        self.f = f
+        self.offset = offset
+
+    def __iter__(self):
+        for line in self.f:
+            self.offset += len(line)
+            yield line.decode("utf-8", errors="replace")
+
+def read_csv(path: str, start: int = 0) -> Iterator[tuple[int, dict]]:
+    with open(path, "rb") as f:
+        lines = _CountingLines(f, 0)
+        header = next(csv.reader(lines), None)
+        if header is None:
+            return
+        if start > lines.offset:
+            f.seek(start)
+            lines.offset = start
+        # csv.reader pulls lines lazily, so after each row the counter sits
+        # exactly at the end of that row, multi-line quoted fields included
+        for row in csv.reader(lines):
+            if not row:
+                continue
+            yield lines.offset, dict(zip(header, row))
+
+READERS = {"mbox": read_mbox, "jsonl": read_jsonl, "csv": read_csv}
+
+def read_records(path: str, fmt: str | None = None, start: int = 0) -> Iterator[tuple[int, dict]]:
+    return READERS[fmt or detect_format(path)](path, start)
@@ -1,59 +1,151 @@
 # backend/ai-service/app/services/db_service.py
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import models
+from app.services.pagination import keyset_page, time_filters
+from app.services import rollups
 
 # ------------------------
 # User
 # ------------------------
-def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.User).where(models.User.email == email).limit(1))
+    return result.scalars().first()
 
-def create_user(db: Session, email: str, hashed_password: str):
+async def create_user(db: AsyncSession, email: str, hashed_password: str):
     user = models.User(email=email, hashed_password=hashed_password)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
+async def update_user_password_hash(db: AsyncSession, user: models.User, hashed_password: str):
+    user.hashed_password = hashed_password
+    await db.commit()
+
 # ------------------------
 # Event
 # ------------------------
-def create_event(db: Session, user_id: int, type: str, detail: str | None = None):
+async def create_event(db: AsyncSession, user_id: int, type: str, detail: str | None = None):
     event = models.Event(user_id=user_id, type=type, detail=detail)
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await rollups.bump_async(db, "events", [{"user_id": user_id, "type": type}])
+    await db.commit()
+    await db.refresh(event)
     return event
 
-def get_recent_events(db: Session, limit: int = 10):
-    return db.query(models.Event).order_by(models.Event.created_at.desc()).limit(limit).all()
+async def list_events(db: AsyncSession, limit: int = 10, cursor: str | None = None, user_id: int | None = None,
+                      type: str | None = None, since: datetime | None = None, until: datetime | None = None):
+    """Newest-first page of events; returns (events, next_cursor)."""
+    filters = time_filters(models.Event, since, until)
+    if user_id is not None:
+        filters.append(models.Event.user_id == user_id)
+    if type is not None:
+        filters.append(models.Event.type == type)
+    return await keyset_page(db, models.Event, filters, cursor, limit)
+
+async def get_recent_events(db: AsyncSession, limit: int = 10):
+    events, _ = await list_events(db, limit)
+    return events
 
 # ------------------------
 # PasswordEvent
 # ------------------------
-def create_password_event(db: Session, user_id: int, password_strength: str):
+async def create_password_event(db: AsyncSession, user_id: int, password_strength: str):
     pe = models.PasswordEvent(user_id=user_id, password_strength=password_strength)
     db.add(pe)
-    db.commit()
-    db.refresh(pe)
+    await rollups.bump_async(db, "password_events", [{"user_id": user_id, "password_strength": password_strength}])
+    await db.commit()
+    await db.refresh(pe)
     return pe
 
+async def list_password_events(db: AsyncSession, limit: int = 10, cursor: str | None = None, user_id: int | None = None,
+                               since: datetime | None = None, until: datetime | None = None):
+    filters = time_filters(models.PasswordEvent, since, until)
+    if user_id is not None:
+        filters.append(models.PasswordEvent.user_id == user_id)
+    return await keyset_page(db, models.PasswordEvent, filters, cursor, limit)
+
+async def create_password_events(db: AsyncSession, user_id: int, strengths: list[str]):
+    """Log many password checks for one user in a single commit."""
+    events = [models.PasswordEvent(user_id=user_id, password_strength=s) for s in strengths]
+    db.add_all(events)
+    await rollups.bump_async(db, "password_events", [{"user_id": user_id, "password_strength": s} for s in strengths])
+    await db.commit()
+    return events
+
 # ------------------------
 # PhishingAttempt
 # ------------------------
-def create_phishing_attempt(db: Session, user_id: int, url: str, result: str):
+async def create_phishing_attempt(db: AsyncSession, user_id: int, url: str, result: str):
     pa = models.PhishingAttempt(user_id=user_id, url=url, result=result)
     db.add(pa)
-    db.commit()
-    db.refresh(pa)
+    await rollups.bump_async(db, "phishing_attempts", [{"user_id": user_id, "result": result}])
+    await db.commit()
+    await db.refresh(pa)
     return pa
 
+async def list_phishing_attempts(db: AsyncSession, limit: int = 10, cursor: str | None = None, user_id: int | None = None,
+                                 since: datetime | None = None, until: datetime | None = None):
+    filters = time_filters(models.PhishingAttempt, since, until)
+    if user_id is not None:
+        filters.append(models.PhishingAttempt.user_id == user_id)
+    return await keyset_page(db, models.PhishingAttempt, filters, cursor, limit)
+
+async def create_phishing_attempts(db: AsyncSession, user_id: int, rows: list[tuple[str, str]]):
+    """Log many (url, result) checks for one user in a single commit."""
+    attempts = [models.PhishingAttempt(user_id=user_id, url=url, result=result) for url, result in rows]
+    db.add_all(attempts)
+    await rollups.bump_async(db, "phishing_attempts", [{"user_id": user_id, "result": result} for _, result in rows])
+    await db.commit()
+    return attempts
+
 # ------------------------
 # AuditLog
 # ------------------------
-def create_audit_log(db: Session, action: str, detail: str | None = None):
+async def create_audit_log(db: AsyncSession, action: str, detail: str | None = None):
     log = models.AuditLog(action=action, detail=detail)
     db.add(log)
-    db.commit()
-    db.refresh(log)
+    await rollups.bump_async(db, "audit_logs", [{"action": action}])
+    await db.commit()
+    await db.refresh(log)
     return log
+
+# ------------------------
+# Bulk ingestion (callers commit once per chunk)
+# Every writer below also bumps stat_rollups in the same transaction
+# ------------------------
+async def existing_user_ids(db: AsyncSession, user_ids: set[int]) -> set[int]:
+    if not user_ids:
+        return set()
+    result = await db.execute(select(models.User.id).where(models.User.id.in_(user_ids)))
+    return set(result.scalars().all())
+
+async def insert_events(db: AsyncSession, rows: list[dict]):
+    """Multi-row INSERT of {user_id, type, detail, created_at} dicts; no commit."""
+    if rows:
+        await db.execute(insert(models.Event), rows)
+        await rollups.bump_async(db, "events", rows)
+
+async def insert_audit_logs(db: AsyncSession, rows: list[dict]):
+    """Multi-row INSERT of {action, detail, created_at} dicts; no commit."""
+    if rows:
+        await db.execute(insert(models.AuditLog), rows)
+        await rollups.bump_async(db, "audit_logs", rows)
+
+# ------------------------
+# Sync bulk writers (event sink flusher thread)
+# ------------------------
+def insert_password_events(db: Session, rows: list[dict]):
+    """Multi-row INSERT of {user_id, password_strength, created_at} dicts (plus rollups); no commit."""
+    if rows:
+        db.execute(insert(models.PasswordEvent), rows)
+        rollups.bump(db, "password_events", rows)
+
+def insert_phishing_attempts(db: Session, rows: list[dict]):
+    """Multi-row INSERT of {user_id, url, result, created_at} dicts (plus rollups); no commit."""
+    if rows:
+        db.execute(insert(models.PhishingAttempt), rows)
+        rollups.bump(db, "phishing_attempts", rows)
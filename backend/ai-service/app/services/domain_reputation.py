@@ -0,0 +1,213 @@
+# backend/ai-service/app/services/domain_reputation.py
+"""
+In-memory domain reputation from local blocklist / allowlist files.
+
+Domains are stored in a trie keyed by reversed labels ("login.example.com"
+is stored as com -> example -> login), so a lookup walks at most as many
+nodes as the host has labels and an entry also covers every subdomain. The
+most specific match wins; a domain on both lists counts as blocked.
+
+Lists are re-read on a background thread. Each reload diffs the file
+against the domains loaded from it last time and only inserts / removes the
+difference, so a large list with a few new lines is cheap to refresh and
+lookups never wait for a reload.
+"""
+import os
+import threading
+import time
+
+from app.config import DOMAIN_BLOCKLIST_PATH, DOMAIN_ALLOWLIST_PATH, DOMAIN_LISTS_RELOAD_S
+
+BLOCK = "block"
+ALLOW = "allow"
+
+# Trie nodes are dicts of label -> child; list memberships live under this key
+_MARK = ""
+
+def normalize_domain(line: str) -> str | None:
+    """Domain named by one list line, or None for blanks and comments."""
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return None
+    # hosts-file style "0.0.0.0 example.com": the domain is the last field
+    domain = line.split()[-1].lower().rstrip(".")
+    for prefix in ("*.", "."):
+        if domain.startswith(prefix):
+            domain = domain[len(prefix):]
+    return domain or None
+
+def read_domains(path: str) -> set[str]:
+    domains = set()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            domain = normalize_domain(line)
+            if domain:
+                domains.add(domain)
+    return domains
+
+class DomainTrie:
+    """Reversed-label suffix trie. Writers hold a lock; readers do not need one."""
+
+    def __init__(self):
+        self._root: dict = {}
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def add(self, domain: str, list_name: str):
+        with self._lock:
+            node = self._root
+            for label in reversed(domain.split(".")):
+                node = node.setdefault(label, {})
+            marks = node.get(_MARK)
+            # Replace rather than mutate so concurrent readers see a whole set
+            if marks is None or list_name not in marks:
+                node[_MARK] = frozenset((marks or frozenset()) | {list_name})
+                self.size += 1
+
+    def remove(self, domain: str, list_name: str):
+        with self._lock:
+            path = [self._root]
+            labels = list(reversed(domain.split(".")))
+            for label in labels:
+                child = path[-1].get(label)
+                if child is None:
+                    return
+                path.append(child)
+            marks = path[-1].get(_MARK)
+            if not marks or list_name not in marks:
+                return
+            remaining = marks - {list_name}
+            if remaining:
+                path[-1][_MARK] = remaining
+            else:
+                del path[-1][_MARK]
+            self.size -= 1
+            # Prune nodes left empty
+            for parent, label, node in zip(reversed(path[:-1]), reversed(labels), reversed(path[1:])):
+                if node:
+                    break
+                del parent[label]
+
+    def lookup(self, host: str) -> tuple[str, str] | None:
+        """(verdict, matched domain) for the most specific listed suffix of `host`, or None."""
+        node = self._root
+        labels = list(reversed(host.lower().rstrip(".").split(".")))
+        match = None
+        for depth, label in enumerate(labels):
+            node = node.get(label)
+            if node is None:
+                break
+            marks = node.get(_MARK)
+            if marks:
+                match = (BLOCK if BLOCK in marks else ALLOW, depth)
+        if match is None:
+            return None
+        verdict, depth = match
+        return verdict, ".".join(reversed(labels[:depth + 1]))
+
+class DomainReputation:
+    """Blocklist + allowlist trie with incremental background reloads."""
+
+    def __init__(self, blocklist_path: str = DOMAIN_BLOCKLIST_PATH, allowlist_path: str = DOMAIN_ALLOWLIST_PATH,
+                 reload_s: float = DOMAIN_LISTS_RELOAD_S):
+        self.lists = {BLOCK: blocklist_path, ALLOW: allowlist_path}
+        self.reload_s = float(reload_s)
+        self.trie = DomainTrie()
+        self._loaded: dict[str, set[str]] = {BLOCK: set(), ALLOW: set()}
+        self._file_state: dict[str, tuple | None] = {BLOCK: None, ALLOW: None}
+        self._reload_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.reloads = 0
+        self.last_reload: dict | None = None
+        self.hits = {BLOCK: 0, ALLOW: 0}
+
+    def _reload_list(self, list_name: str, path: str) -> tuple[int, int]:
+        try:
+            st = os.stat(path)
+            state = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            state = None
+        if state == self._file_state[list_name]:
+            return 0, 0
+
+        current = read_domains(path) if state is not None else set()
+        previous = self._loaded[list_name]
+        added, removed = current - previous, previous - current
+        for domain in added:
+            self.trie.add(domain, list_name)
+        for domain in removed:
+            self.trie.remove(domain, list_name)
+        self._loaded[list_name] = current
+        self._file_state[list_name] = state
+        return len(added), len(removed)
+
+    def reload(self) -> dict:
+        """Apply list file changes to the trie; returns what changed."""
+        with self._reload_lock:
+            started = time.perf_counter()
+            changes = {}
+            for list_name, path in self.lists.items():
+                try:
+                    added, removed = self._reload_list(list_name, path)
+                except Exception as e:
+                    print(f"⚠️ Could not reload {list_name}list '{path}': {e}")
+                    continue
+                if added or removed:
+                    changes[list_name] = {"added": added, "removed": removed}
+            self.reloads += 1
+            self.last_reload = {"changes": changes, "elapsed_ms": (time.perf_counter() - started) * 1000.0, "at": time.time()}
+            if changes:
+                print(f"✅ Domain reputation reloaded: {changes} ({self.trie.size} entries)")
+            return self.last_reload
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.reload()
+            self._wake.wait(self.reload_s if self.reload_s > 0 else None)
+            self._wake.clear()
+
+    def start(self):
+        """Start the background reload thread (first load included)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="domain-reputation", daemon=True)
+            self._thread.start()
+
+    def request_reload(self):
+        """Wake the reload thread now instead of waiting for the next interval."""
+        self.start()
+        self._wake.set()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    def verdict(self, hosts: list[str]) -> tuple[str, str] | None:
+        """
+        Short-circuit verdict for the hosts found in a text: "suspicious" if
+        any is blocked, "safe" if every one is allowed, else None.
+        Returns (verdict, matched domain).
+        """
+        matches = [self.trie.lookup(host) for host in hosts]
+        for match in matches:
+            if match is not None and match[0] == BLOCK:
+                self.hits[BLOCK] += 1
+                return "suspicious", match[1]
+        if matches and all(match is not None for match in matches):
+            self.hits[ALLOW] += 1
+            return "safe", matches[0][1]
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "entries": self.trie.size,
+            "lists": {name: {"path": path, "domains": len(self._loaded[name])} for name, path in self.lists.items()},
+            "hits": dict(self.hits),
+            "reloads": self.reloads,
+            "last_reload": self.last_reload,
+        }
+
+# Shared instance; main.py starts its reload thread at startup
+reputation = DomainReputation()
@@ -0,0 +1,235 @@
+# backend/ai-service/app/services/event_sink.py
+"""
+Write-behind sink for password and phishing check events.
+
+The check routes never read these rows back, so instead of an INSERT +
+COMMIT per request, records are appended to an in-memory queue and a
+background thread bulk-inserts them every EVENT_SINK_BATCH_SIZE records or
+EVENT_SINK_FLUSH_MS milliseconds, whichever comes first. created_at is
+captured when the check happens, not when the row is written.
+
+The queue is bounded: once EVENT_SINK_MAX_QUEUE records are pending,
+EVENT_SINK_OVERFLOW decides which record is dropped. A flush that keeps
+failing after EVENT_SINK_FLUSH_RETRIES attempts drops its batch. Both are
+counted. Each flush is one transaction, so a retry never duplicates rows.
+stop() flushes everything still queued.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import (
+    EVENT_SINK_ENABLED, EVENT_SINK_BATCH_SIZE, EVENT_SINK_FLUSH_MS,
+    EVENT_SINK_MAX_QUEUE, EVENT_SINK_OVERFLOW, EVENT_SINK_FLUSH_RETRIES,
+)
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest")
+
+PASSWORD = "password"
+PHISHING = "phishing"
+
+def _write_batch(batch: list[tuple[str, dict]]):
+    """Bulk-insert one batch: one multi-row INSERT per table, one commit for both.
+
+    A failed flush leaves nothing behind, so the retry cannot duplicate rows.
+    """
+    # Imported here: app.db and app.models import each other at module load
+    from app.db import SessionLocal
+    from app.services import db_service
+
+    inserts = {PASSWORD: db_service.insert_password_events, PHISHING: db_service.insert_phishing_attempts}
+    by_kind: dict[str, list[dict]] = {PASSWORD: [], PHISHING: []}
+    for kind, row in batch:
+        by_kind[kind].append(row)
+    db = SessionLocal()
+    try:
+        for kind, rows in by_kind.items():
+            try:
+                with db.begin_nested():
+                    inserts[kind](db, rows)
+            except IntegrityError:
+                # One bad row (e.g. unknown user_id) must not sink the batch:
+                # write the rows one by one, each in its own savepoint, and
+                # skip the ones that fail
+                skipped = 0
+                for row in rows:
+                    try:
+                        with db.begin_nested():
+                            inserts[kind](db, [row])
+                    except IntegrityError:
+                        skipped += 1
+                print(f"⚠️ Event sink skipped {skipped} invalid {kind} row(s)")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+class EventSink:
+    def __init__(self, write: Callable[[list[tuple[str, dict]]], None] = _write_batch,
+                 batch_size: int = EVENT_SINK_BATCH_SIZE, flush_ms: float = EVENT_SINK_FLUSH_MS,
+                 max_queue: int = EVENT_SINK_MAX_QUEUE, overflow: str = EVENT_SINK_OVERFLOW,
+                 retries: int = EVENT_SINK_FLUSH_RETRIES, enabled: bool = EVENT_SINK_ENABLED):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}' (expected one of {OVERFLOW_POLICIES})")
+        self.write = write
+        self.batch_size = max(1, int(batch_size))
+        self.flush_s = max(0.0, float(flush_ms)) / 1000.0
+        self.max_queue = max(1, int(max_queue))
+        self.overflow = overflow
+        self.retries = max(1, int(retries))
+        self.enabled = enabled
+        # (enqueued_at monotonic, kind, row)
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        # Metrics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped_overflow = 0
+        self.dropped_failed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    # ---------- producers ----------
+    def submit(self, kind: str, row: dict) -> bool:
+        """Queue one row; never blocks. Returns False if a record was dropped for it."""
+        row.setdefault("created_at", datetime.now(timezone.utc))
+        accepted = True
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.dropped_overflow += 1
+                if self.overflow == "drop_newest":
+                    return False
+                self._queue.popleft()
+                accepted = False
+            self._queue.append((time.monotonic(), kind, row))
+            self.enqueued += 1
+            # Wake the flusher when a batch is full, and when the queue was
+            # empty: it then waits without a timeout and must start the
+            # flush_ms timer for this record
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        self._ensure_started()
+        return accepted
+
+    def password_events(self, user_id: int, strengths: list[str]):
+        for strength in strengths:
+            self.submit(PASSWORD, {"user_id": user_id, "password_strength": strength})
+
+    def phishing_attempts(self, user_id: int, rows: list[tuple[str, str]]):
+        for url, result in rows:
+            self.submit(PHISHING, {"user_id": user_id, "url": url, "result": result})
+
+    # ---------- flusher ----------
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._cond:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stopping = False
+                    self._thread = threading.Thread(target=self._run, name="event-sink", daemon=True)
+                    self._thread.start()
+
+    def _take_batch(self) -> list:
+        """Wait until a batch is due, then pop it (empty list once stopped and drained)."""
+        with self._cond:
+            while not self._stopping:
+                if len(self._queue) >= self.batch_size:
+                    break
+                if self._queue:
+                    due = self._queue[0][0] + self.flush_s - time.monotonic()
+                    if due <= 0:
+                        break
+                    self._cond.wait(due)
+                else:
+                    self._cond.wait()
+            n = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _flush(self, batch: list):
+        rows = [(kind, row) for _, kind, row in batch]
+        for attempt in range(1, self.retries + 1):
+            started = time.perf_counter()
+            try:
+                self.write(rows)
+            except Exception as e:
+                self.flush_errors += 1
+                print(f"⚠️ Event sink flush of {len(rows)} rows failed (attempt {attempt}/{self.retries}): {e}")
+                if attempt < self.retries and not self._stopping:
+                    time.sleep(min(2.0, 0.1 * 2 ** attempt))
+                continue
+            now = time.monotonic()
+            self.flushes += 1
+            self.written += len(rows)
+            self.last_flush_ms = (time.perf_counter() - started) * 1000.0
+            # Lag: time from the oldest record's check to its commit
+            self.last_lag_ms = (now - batch[0][0]) * 1000.0
+            self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+            return
+        self.dropped_failed += len(rows)
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._flush(batch)
+
+    def stop(self, timeout: float | None = 10.0):
+        """Flush everything still queued, then stop the flusher thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Still flushing (e.g. a slow database): it keeps draining the
+                # queue; a second flusher here would race it on the counters
+                with self._cond:
+                    pending = len(self._queue)
+                print(f"⚠️ Event sink flusher still running after {timeout}s; {pending} record(s) not yet written")
+                return
+        # Anything left (thread never started or exited early) is written here
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                break
+            self._flush(batch)
+
+    # ---------- metrics ----------
+    def snapshot(self) -> dict:
+        with self._cond:
+            pending = len(self._queue)
+            oldest_ms = (time.monotonic() - self._queue[0][0]) * 1000.0 if self._queue else 0.0
+        return {
+            "enabled": self.enabled,
+            "pending": pending,
+            "oldest_pending_ms": oldest_ms,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped_overflow": self.dropped_overflow,
+            "dropped_failed": self.dropped_failed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": self.last_flush_ms,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "config": {
+                "batch_size": self.batch_size,
+                "flush_ms": self.flush_s * 1000.0,
+                "max_queue": self.max_queue,
+                "overflow": self.overflow,
+            },
+        }
+
+# Process-wide sink; main.py flushes it on shutdown
+sink = EventSink()
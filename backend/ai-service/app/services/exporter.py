@@ -0,0 +1,81 @@
+# backend/ai-service/app/services/exporter.py
+"""
+Streaming exports of the event tables as NDJSON or CSV.
+
+Rows come from a server-side cursor (yield_per), EXPORT_BATCH_ROWS at a
+time, oldest first. Each batch is serialized and, optionally, gzip-compressed
+before the next one is fetched. Memory stays at one batch however many rows
+match.
+
+The stream opens its own session: FastAPI closes dependency sessions before
+a StreamingResponse body is sent.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from sqlalchemy import select
+
+from app import models
+from app.db import AsyncSessionLocal
+from app.services.pagination import time_filters
+from app.services.rollups import LABEL_COLUMNS
+from app.config import EXPORT_BATCH_ROWS, EXPORT_GZIP_LEVEL
+
+SOURCES = {
+    "events": models.Event,
+    "password_events": models.PasswordEvent,
+    "phishing_attempts": models.PhishingAttempt,
+    "audit_logs": models.AuditLog,
+}
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _value(v):
+    return v.isoformat() if isinstance(v, datetime) else v
+
+def _ndjson(columns: list[str], rows) -> str:
+    return "".join(json.dumps(dict(zip(columns, map(_value, row))), ensure_ascii=False) + "\n" for row in rows)
+
+def _csv(columns: list[str], rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+def build_query(source: str, since: datetime | None = None, until: datetime | None = None,
+                user_id: int | None = None, label: str | None = None):
+    model = SOURCES[source]
+    filters = time_filters(model, since, until)
+    if user_id is not None and hasattr(model, "user_id"):
+        filters.append(model.user_id == user_id)
+    if label is not None:
+        filters.append(getattr(model, LABEL_COLUMNS[source]) == label)
+    columns = list(model.__table__.columns)
+    return select(*columns).where(*filters).order_by(model.created_at, model.id), [c.key for c in columns]
+
+async def stream_export(source: str, fmt: str = "ndjson", gzip: bool = False, since: datetime | None = None,
+                        until: datetime | None = None, user_id: int | None = None, label: str | None = None,
+                        batch_rows: int = EXPORT_BATCH_ROWS) -> AsyncIterator[bytes]:
+    query, columns = build_query(source, since, until, user_id, label)
+    serialize = _csv if fmt == "csv" else _ndjson
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzip else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    if fmt == "csv":
+        yield encode(_csv(columns, [columns]))
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=max(1, batch_rows)))
+        async for rows in result.partitions():
+            chunk = encode(serialize(columns, rows))
+            if chunk:
+                yield chunk
+    if compressor:
+        yield compressor.flush()
+
+def filename(source: str, fmt: str, gzip: bool) -> str:
+    return f"{source}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.{fmt}" + (".gz" if gzip else "")
@@ -0,0 +1,139 @@
+# backend/ai-service/app/services/inference_executor.py
+import asyncio
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import torch
+
+from app.config import (
+    INFER_EXECUTOR_WORKERS,
+    INFER_TORCH_THREADS,
+    INFER_TORCH_INTEROP_THREADS,
+    INFER_PIN_CORES,
+    INFER_QUEUE_SIZE,
+)
+# Re-exported: routes import Overloaded from here
+from app.services.overload import Overloaded  # noqa: F401
+
+def _parse_cores(spec: str) -> list[int]:
+    cores = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cores.extend(range(int(lo), int(hi) + 1))
+        else:
+            cores.append(int(part))
+    return cores
+
+_interop_configured = False
+
+def configure_torch_threads(intra_op: int = INFER_TORCH_THREADS, inter_op: int = INFER_TORCH_INTEROP_THREADS):
+    """
+    Apply torch thread settings once per process. Inter-op threads can only be
+    set before torch starts any parallel work, so failures there are ignored.
+    """
+    global _interop_configured
+    if intra_op > 0:
+        torch.set_num_threads(intra_op)
+    if inter_op > 0 and not _interop_configured:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            print(f"⚠️ Could not set torch inter-op threads: {e}")
+        _interop_configured = True
+
+# -------------------------------
+# Executor
+# -------------------------------
+class InferenceExecutor:
+    """
+    Bounded thread pool that owns all torch work.
+
+    At most `workers` calls run at once and at most `queue_size` more may wait;
+    anything beyond that raises Overloaded immediately instead of queueing.
+    """
+
+    def __init__(self, workers: int = INFER_EXECUTOR_WORKERS, queue_size: int = INFER_QUEUE_SIZE,
+                 pin_cores: str = INFER_PIN_CORES, torch_threads: int = INFER_TORCH_THREADS):
+        self.workers = max(1, int(workers))
+        self.queue_size = max(0, int(queue_size))
+        self.cores = _parse_cores(pin_cores)
+        self.torch_threads = torch_threads
+        self._core_cycle = itertools.cycle(self.cores) if self.cores else None
+        self._core_lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self.rejected = 0
+        self.completed = 0
+
+    def _init_worker(self):
+        configure_torch_threads(self.torch_threads)
+        if self._core_cycle is not None and hasattr(os, "sched_setaffinity"):
+            with self._core_lock:
+                core = next(self._core_cycle)
+            try:
+                # pid 0 = calling thread on Linux
+                os.sched_setaffinity(0, {core})
+            except OSError as e:
+                print(f"⚠️ Could not pin inference worker to core {core}: {e}")
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="inference",
+                initializer=self._init_worker,
+            )
+        return self._pool
+
+    def _admit(self):
+        with self._pending_lock:
+            if self._pending >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise Overloaded()
+            self._pending += 1
+
+    def _release(self):
+        with self._pending_lock:
+            self._pending -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run `fn(*args)` on the inference pool, or raise Overloaded if it is saturated."""
+        self._admit()
+        try:
+            future = self.pool.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Release when the work itself finishes: a cancelled caller (client
+        # disconnect, timeout) leaves the call running in its pool thread
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "torch_threads": self.torch_threads,
+            "pinned_cores": self.cores,
+        }
+
+# Process-wide executor shared by all model-backed routes
+executor = InferenceExecutor()
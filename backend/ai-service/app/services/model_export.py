@@ -0,0 +1,156 @@
+# backend/ai-service/app/services/model_export.py
+import hashlib
+import json
+import os
+import statistics
+import time
+import zipfile
+
+import torch
+import torch.nn as nn
+
+from app.config import MODEL_ARTIFACT_PREFERENCE
+
+# Suffixes written by export_artifacts(); keys match MODEL_ARTIFACT_PREFERENCE
+ARTIFACT_SUFFIXES = {
+    "ts": ".ts.pt",
+    "int8": ".int8.ts.pt",
+}
+
+# Name of the metadata file stored inside each TorchScript artifact
+META_FILE = "safechain_meta.json"
+
+# -------------------------------
+# Artifact paths
+# -------------------------------
+def artifact_path(path: str, kind: str) -> str:
+    stem, _ = os.path.splitext(path)
+    return stem + ARTIFACT_SUFFIXES[kind]
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def artifact_meta(path: str) -> dict:
+    """META_FILE of a TorchScript artifact, read from the zip without loading the model."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith("/extra/" + META_FILE):
+                    return json.loads(archive.read(name) or b"{}")
+    except (OSError, zipfile.BadZipFile, ValueError):
+        pass
+    return {}
+
+def is_stale(artifact: str, source: str) -> bool:
+    """
+    True when `source` changed after `artifact` was exported from it: the
+    recorded source hash differs, or (artifacts without one) the source is newer.
+    """
+    if not os.path.exists(source):
+        return False
+    recorded = artifact_meta(artifact).get("source_sha256")
+    if recorded:
+        return recorded != file_sha256(source)
+    return os.path.getmtime(source) > os.path.getmtime(artifact)
+
+def resolve_artifact(path: str, preference: list[str] = MODEL_ARTIFACT_PREFERENCE) -> str:
+    """Return the preferred up-to-date optimized artifact for `path` if one exists, else `path`."""
+    for kind in preference:
+        if kind not in ARTIFACT_SUFFIXES:
+            continue
+        candidate = artifact_path(path, kind)
+        if not os.path.exists(candidate):
+            continue
+        if is_stale(candidate, path):
+            print(f"⚠️ Skipping stale artifact '{candidate}': '{path}' changed since it was exported (re-run export_models.py)")
+            continue
+        return candidate
+    return path
+
+# -------------------------------
+# Export
+# -------------------------------
+def to_torchscript(model: nn.Module, example: torch.Tensor) -> torch.jit.ScriptModule:
+    """Trace, freeze and optimize a module for CPU inference."""
+    model.eval()
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    frozen = torch.jit.freeze(traced)
+    try:
+        return torch.jit.optimize_for_inference(frozen)
+    except Exception as e:
+        print(f"⚠️ optimize_for_inference failed, keeping frozen module: {e}")
+        return frozen
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """Dynamic int8 quantization of every nn.Linear (weights int8, activations fp32)."""
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+def export_artifacts(model: nn.Module, path: str, in_features: int) -> dict[str, str]:
+    """
+    Write the TorchScript and int8 TorchScript artifacts for a model stored at `path`.
+    Returns {kind: artifact path}.
+    """
+    example = torch.zeros(1, in_features, dtype=torch.float32)
+    meta = {"in_features": in_features, "source": os.path.basename(path)}
+    if os.path.exists(path):
+        meta["source_sha256"] = file_sha256(path)
+    meta = json.dumps(meta)
+    written = {}
+
+    for kind, build in (("ts", lambda m: m), ("int8", quantize_int8)):
+        scripted = to_torchscript(build(model), example)
+        out = artifact_path(path, kind)
+        torch.jit.save(scripted, out, _extra_files={META_FILE: meta})
+        written[kind] = out
+        print(f"✅ Wrote {kind} artifact '{out}'")
+    return written
+
+# -------------------------------
+# Accuracy vs latency report
+# -------------------------------
+def _latency_ms(model, x: torch.Tensor, rounds: int) -> float:
+    with torch.no_grad():
+        for _ in range(5):
+            model(x)
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            model(x)
+            samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+def compare_models(reference: nn.Module, candidates: dict[str, nn.Module], inputs: torch.Tensor,
+                   tolerance: float, rounds: int = 200) -> dict:
+    """
+    Compare candidate models to the fp32 eager reference on `inputs`.
+    Reports max/mean absolute error, argmax agreement (for multi-output
+    models), median single-row and full-batch latency, and whether the
+    max error is within `tolerance`.
+    """
+    reference.eval()
+    with torch.no_grad():
+        expected = reference(inputs)
+
+    report = {}
+    for name, model in {"eager_fp32": reference, **candidates}.items():
+        with torch.no_grad():
+            got = model(inputs)
+        diff = (got.float() - expected).abs()
+        entry = {
+            "max_abs_error": float(diff.max()),
+            "mean_abs_error": float(diff.mean()),
+            "latency_ms_single": _latency_ms(model, inputs[:1], rounds),
+            "latency_ms_batch": _latency_ms(model, inputs, max(10, rounds // 10)),
+            "batch_size": int(inputs.shape[0]),
+        }
+        if expected.dim() == 2 and expected.shape[1] > 1:
+            entry["argmax_agreement"] = float((got.argmax(dim=1) == expected.argmax(dim=1)).float().mean())
+        entry["within_tolerance"] = entry["max_abs_error"] <= tolerance
+        report[name] = entry
+    return report
@@ -1,10 +1,21 @@
 # backend/ai-service/app/services/model_loader.py
+import importlib.util
+import json
 import os
 import traceback
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 from dotenv import load_dotenv
+from app.config import (
+    PHISHING_LABELS, PHISHING_THRESHOLD, PHISHING_MAX_BATCH_SIZE, MODEL_SHARING, MODEL_DIR, MODEL_HF_ALLOWLIST,
+)
+from app.services import shared_weights
+from app.services.model_registry import registry
+from app.services.model_export import resolve_artifact, META_FILE
+from app.services.numpy_backend import NumpyMLP
+from app.services.password_analysis import PasswordStats, password_stats, stats_matrix, heuristic_strength, STRENGTH_LABELS
 
 load_dotenv()
 
@@ -16,13 +27,9 @@ MODEL_INPUT_SIZE = int(os.environ.get("MODEL_INPUT_SIZE", "4"))  # feature count
 PHISHING_MODEL_NAME = os.environ.get("PHISHING_MODEL", "facebook/bart-large-mnli")
 MAP_LOCATION = os.environ.get("TORCH_MAP_LOCATION", "cpu")
 
-# Try to import transformers.pipeline if available
-try:
-    from transformers import pipeline
-    _HF_AVAILABLE = True
-except Exception:
-    pipeline = None
-    _HF_AVAILABLE = False
+# transformers is only imported when the phishing model is actually loaded;
+# importing it here would add seconds to every cold start
+_HF_AVAILABLE = importlib.util.find_spec("transformers") is not None
 
 # -------------------------------
 # Password Strength Model
@@ -37,30 +44,54 @@ class PasswordModel(nn.Module):
         x = F.relu(self.fc1(x))
         return self.fc2(x)
 
+def _build_password_model(meta: dict) -> PasswordModel:
+    return PasswordModel(
+        input_size=meta.get("in_features", MODEL_INPUT_SIZE),
+        hidden_size=meta.get("hidden_size", 8),
+        output_size=meta.get("out_features", 3),
+    )
+
 def _try_torchscript_load(path: str):
     try:
-        model = torch.jit.load(path, map_location=MAP_LOCATION)
+        extra = {META_FILE: ""}
+        model = torch.jit.load(path, map_location=MAP_LOCATION, _extra_files=extra)
         model.eval()
+        # Frozen artifacts no longer expose their layers; export_models.py
+        # records the input size so the registry can still read it
+        meta = json.loads(extra[META_FILE] or "{}")
+        if "in_features" in meta:
+            try:
+                model.in_features = int(meta["in_features"])
+            except Exception:
+                pass
         print(f"✅ Loaded TorchScript model from '{path}'")
         return model
     except Exception:
         return None
 
 def _try_torch_load(path: str):
+    # weights_only: a state_dict needs no unpickling of arbitrary objects, and
+    # a pickled nn.Module could run code on load
     try:
-        obj = torch.load(path, map_location=MAP_LOCATION)
+        obj = torch.load(path, map_location=MAP_LOCATION, weights_only=True)
         return obj
-    except Exception:
+    except Exception as e:
+        print(f"⚠️ torch.load(weights_only=True) failed for '{path}': {e}")
         return None
 
 def load_password_model(path: str = MODEL_PATH):
     """
-    Load a password model. Order:
+    Load a password model. Optimized artifacts next to `path` (see
+    model_export.resolve_artifact) are preferred. Order:
       1) torch.jit.load (scripted/traced)
-      2) torch.load -> nn.Module instance
-      3) torch.load -> state_dict (load into PasswordModel)
-      4) fallback: return untrained PasswordModel
+      2) torch.load(weights_only=True) -> state_dict (load into PasswordModel)
+      3) fallback: return untrained PasswordModel
+    With MODEL_SHARING=mmap, exported shared weights take precedence.
     """
+    if MODEL_SHARING == "mmap" and shared_weights.has_module("password"):
+        return shared_weights.load_module("password", _build_password_model)
+
+    path = resolve_artifact(path)
     if os.path.exists(path):
         # 1) try TorchScript
         ts = _try_torchscript_load(path)
@@ -73,12 +104,6 @@ def load_password_model(path: str = MODEL_PATH):
             print(f"⚠️ Could not load model file '{path}' with torch.jit or torch.load. Using fresh model.")
             return PasswordModel(input_size=MODEL_INPUT_SIZE)
 
-        # If obj is nn.Module
-        if isinstance(obj, nn.Module):
-            obj.eval()
-            print(f"✅ Loaded nn.Module instance from '{path}'")
-            return obj
-
         # If obj is state_dict
         if isinstance(obj, dict):
             model = PasswordModel(input_size=MODEL_INPUT_SIZE)
@@ -98,28 +123,85 @@ def load_password_model(path: str = MODEL_PATH):
         print(f"ℹ️ No password model file at '{path}'. Using untrained PasswordModel.")
         return PasswordModel(input_size=MODEL_INPUT_SIZE)
 
+# -------------------------------
+# Generic /api/infer model
+# -------------------------------
+class LinearModel(nn.Module):
+    """Same layout as test_model.SimpleModel so its state_dict loads directly."""
+    def __init__(self, input_size: int = 3, output_size: int = 1):
+        super().__init__()
+        self.linear = nn.Linear(input_size, output_size)
+
+    def forward(self, x):
+        return self.linear(x)
+
+def _build_linear_model(meta: dict) -> LinearModel:
+    return LinearModel(input_size=meta.get("in_features", 3), output_size=meta.get("out_features", 1))
+
+def load_infer_model(path: str):
+    """
+    Load the /api/infer model, preferring optimized artifacts. Order:
+      1) torch.jit.load (scripted/traced)
+      2) torch.load(weights_only=True) -> state_dict with a single 'linear' layer (LinearModel)
+    Returns None if nothing usable is found.
+    With MODEL_SHARING=mmap, exported shared weights take precedence.
+    """
+    if MODEL_SHARING == "mmap" and shared_weights.has_module("infer"):
+        return shared_weights.load_module("infer", _build_linear_model)
+
+    path = resolve_artifact(path)
+    if not os.path.exists(path):
+        print(f"ℹ️ No inference model file at '{path}'.")
+        return None
+
+    ts = _try_torchscript_load(path)
+    if ts is not None:
+        return ts
+
+    obj = _try_torch_load(path)
+    if isinstance(obj, dict) and "linear.weight" in obj:
+        out_features, in_features = obj["linear.weight"].shape
+        model = LinearModel(input_size=in_features, output_size=out_features)
+        model.load_state_dict(obj)
+        model.eval()
+        print(f"✅ Loaded state_dict into LinearModel (input_size={in_features})")
+        return model
+
+    print(f"⚠️ Could not load inference model from '{path}'.")
+    return None
+
 def extract_password_features(password: str):
-    length = len(password)
-    digits = sum(c.isdigit() for c in password)
-    symbols = sum(not c.isalnum() for c in password)
-    upper = sum(c.isupper() for c in password)
+    s = password_stats(password)
     # normalize or scale here if you later train a model requiring scaled inputs
-    return torch.tensor([[length, digits, symbols, upper]], dtype=torch.float)
+    return torch.tensor([[s.length, s.digits, s.symbols, s.upper]], dtype=torch.float)
 
 def predict_password_strength(model, password: str) -> str:
     """
     Returns one of: "weak", "medium", "strong".
     Falls back to heuristic on any failure.
     """
+    return predict_password_strength_batch(model, [password_stats(password or "")])[0]
+
+def predict_password_strength_batch(model, stats: list[PasswordStats]) -> list[str]:
+    """
+    Strength labels for many passwords from their precomputed statistics,
+    using a single forward pass over the stacked feature matrix.
+    Falls back to the heuristic on any failure.
+    """
+    if not stats:
+        return []
     try:
-        features = extract_password_features(password)
+        features = stats_matrix(stats)
+        # NumPy fast path (see numpy_backend) skips torch entirely
+        if isinstance(model, NumpyMLP):
+            preds = np.clip(np.argmax(model(features), axis=1), 0, 2).tolist()
+            return [STRENGTH_LABELS[p] for p in preds]
         model.eval()
         with torch.no_grad():
-            logits = model(features)
+            logits = model(torch.from_numpy(features))
             if isinstance(logits, torch.Tensor):
-                pred = int(torch.argmax(logits, dim=1).item())
-                label = ["weak", "medium", "strong"][max(0, min(2, pred))]
-                return label
+                preds = torch.argmax(logits, dim=1).clamp(0, 2).tolist()
+                return [STRENGTH_LABELS[p] for p in preds]
             else:
                 # unexpected output
                 raise RuntimeError("Model returned non-tensor output")
@@ -127,12 +209,7 @@ def predict_password_strength(model, password: str) -> str:
         print(f"⚠️ predict_password_strength failed: {e}")
         traceback.print_exc()
         # fallback heuristic
-        pw = password or ""
-        if len(pw) >= 12 and any(c.isupper() for c in pw) and any(c.isdigit() for c in pw) and any(not c.isalnum() for c in pw):
-            return "strong"
-        if len(pw) >= 8:
-            return "medium"
-        return "weak"
+        return [heuristic_strength(s) for s in stats]
 
 # -------------------------------
 # Phishing Detection (optional HF pipeline)
@@ -147,12 +224,123 @@ def load_phishing_model(model_name: str = PHISHING_MODEL_NAME):
         return None
 
     try:
+        from transformers import pipeline
+        if MODEL_SHARING == "mmap" and shared_weights.has_module("phishing"):
+            return _load_shared_phishing_model()
         model = pipeline("zero-shot-classification", model=model_name)
+        if MODEL_SHARING == "prefork":
+            shared_weights.freeze(model.model)
         print(f"✅ Loaded phishing detection model '{model_name}'")
         return model
     except Exception as e:
         print(f"⚠️ Failed to load phishing model '{model_name}': {e}")
         return None
 
-# Initialize phishing model
-phishing_model = load_phishing_model()
+def _load_shared_phishing_model():
+    """Zero-shot pipeline whose weights are mapped from SHARED_WEIGHTS_DIR (see export_shared_weights.py)."""
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer, pipeline
+    assets = shared_weights.asset_dir("phishing")
+    config = AutoConfig.from_pretrained(assets)
+    # from_config runs with meta parameters (shared_weights.empty_parameters): no
+    # transient randomly initialised bart-large copy per worker
+    module = shared_weights.load_module("phishing", lambda meta: AutoModelForSequenceClassification.from_config(config))
+    tokenizer = AutoTokenizer.from_pretrained(assets)
+    return pipeline("zero-shot-classification", model=module, tokenizer=tokenizer)
+
+def _verdict(output: dict) -> str:
+    """Map a zero-shot output to the route vocabulary ("suspicious" / "safe")."""
+    top_label, top_score = output["labels"][0], output["scores"][0]
+    if top_label == PHISHING_LABELS[0] and top_score >= PHISHING_THRESHOLD:
+        return "suspicious"
+    return "safe"
+
+def _token_lengths(model, texts: list[str]) -> list[int]:
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return [len(t.split()) for t in texts]
+    return [len(ids) for ids in tokenizer(texts, truncation=True)["input_ids"]]
+
+def check_phishing(model, text: str) -> str:
+    """Classify one text with the zero-shot pipeline."""
+    return check_phishing_batch(model, [text])[0]
+
+def check_phishing_batch(model, texts: list[str], batch_size: int = PHISHING_MAX_BATCH_SIZE) -> list[str]:
+    """
+    Classify many texts. Texts are sorted by token length and run in pipeline
+    batches of `batch_size`, so each batch pads to a similar length.
+    """
+    if model is None:
+        raise RuntimeError("Phishing model not loaded")
+    if not texts:
+        return []
+
+    lengths = _token_lengths(model, texts)
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+    results: list[str | None] = [None] * len(texts)
+
+    for start in range(0, len(order), max(1, batch_size)):
+        bucket = order[start:start + batch_size]
+        outputs = model([texts[i] for i in bucket], candidate_labels=PHISHING_LABELS, batch_size=len(bucket))
+        if isinstance(outputs, dict):
+            outputs = [outputs]
+        for i, output in zip(bucket, outputs):
+            results[i] = _verdict(output)
+    return results
+
+# -------------------------------
+# Sources accepted from /api/models/{name}/load
+# -------------------------------
+_HF_MODELS = {"phishing"}
+
+def allowed_source(name: str, source: str) -> str:
+    """
+    Validate an API-supplied source for model `name`: Hugging Face ids must be
+    in MODEL_HF_ALLOWLIST, files must resolve (symlinks included) inside
+    MODEL_DIR. Returns the source to load; raises ValueError otherwise.
+    """
+    if name in _HF_MODELS:
+        if source not in MODEL_HF_ALLOWLIST and source != PHISHING_MODEL_NAME:
+            raise ValueError(f"Model id '{source}' is not in MODEL_HF_ALLOWLIST")
+        return source
+    root = os.path.realpath(MODEL_DIR)
+    path = os.path.realpath(os.path.join(root, source))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"'{source}' is outside MODEL_DIR")
+    if not os.path.isfile(path):
+        raise ValueError(f"No model file '{source}' in MODEL_DIR")
+    return path
+
+# Loaders used by the registry for background (re)loads
+registry.set_loader("infer", load_infer_model)
+registry.set_loader("password", load_password_model)
+registry.set_loader("phishing", load_phishing_model)
+
+def _model_sources(infer_model_path: str) -> list[tuple[str, str, str | None]]:
+    """(registry name, source, version) for every served model."""
+    return [
+        ("infer", infer_model_path, None),
+        ("password", MODEL_PATH, None),
+        ("phishing", PHISHING_MODEL_NAME, PHISHING_MODEL_NAME),
+    ]
+
+def start_background_loads(infer_model_path: str) -> dict:
+    """
+    Kick off background loads of every served model that is not loaded yet
+    (models loaded in a pre-fork master are inherited); returns {name: thread}.
+    """
+    return {
+        name: registry.load_in_background(name, source, version=version)
+        for name, source, version in _model_sources(infer_model_path)
+        if not registry.is_loaded(name)
+    }
+
+def load_all_blocking(infer_model_path: str):
+    """
+    Load every served model in this thread and freeze it for sharing (pre-fork
+    master). Warmup is left to the workers: running torch ops before fork can
+    leave the children with a broken intra-op thread pool.
+    """
+    for name, source, version in _model_sources(infer_model_path):
+        entry = registry.load(name, source, version=version, warmup=None)
+        if entry is not None and isinstance(entry.model, nn.Module):
+            shared_weights.freeze(entry.model)
@@ -0,0 +1,244 @@
+# backend/ai-service/app/services/model_registry.py
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import torch
+
+from app.config import INFER_MAX_BATCH_SIZE, MODEL_WARMUP_ROUNDS, MODEL_REGISTRY_HISTORY, NUMPY_FAST_PATH
+from app.services.numpy_backend import compile_numpy
+
+# Header every model-backed route sets so clients can tell which version answered
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+# -------------------------------
+# Model metadata
+# -------------------------------
+def introspect_input_size(model) -> int | None:
+    """Feature count expected by a model, or None if it cannot be determined."""
+    try:
+        if hasattr(model, "linear") and hasattr(model.linear, "in_features"):
+            return int(model.linear.in_features)
+        if hasattr(model, "fc1") and hasattr(model.fc1, "in_features"):
+            return int(model.fc1.in_features)
+        if hasattr(model, "in_features"):
+            return int(model.in_features)
+    except Exception:
+        pass
+    return None
+
+@dataclass
+class ModelVersion:
+    name: str
+    version: str
+    model: Any
+    in_features: int | None = None
+    source: str | None = None
+    loaded_at: float = field(default_factory=time.time)
+    warmup_ms: float = 0.0
+    # NumPy copy of the weights for small MLPs (None = run on torch)
+    numpy: Any = None
+
+    @property
+    def tag(self) -> str:
+        return f"{self.name}:{self.version}"
+
+    @property
+    def runtime(self):
+        """The fastest callable for this version: NumPy fast path if available, else the torch model."""
+        return self.numpy if self.numpy is not None else self.model
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "in_features": self.in_features,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "warmup_ms": self.warmup_ms,
+            "type": type(self.model).__name__,
+            "backend": "numpy" if self.numpy is not None else "torch",
+        }
+
+def tensor_warmup(entry: ModelVersion, rounds: int = MODEL_WARMUP_ROUNDS):
+    """Run a few dummy forwards at single-row and full-batch sizes."""
+    if entry.in_features is None or not callable(entry.model):
+        return
+    with torch.no_grad():
+        for batch_size in (1, max(1, INFER_MAX_BATCH_SIZE)):
+            x = torch.zeros(batch_size, entry.in_features, dtype=torch.float32)
+            for _ in range(max(0, rounds)):
+                entry.model(x)
+
+# -------------------------------
+# Registry
+# -------------------------------
+class ModelRegistry:
+    """
+    Named, versioned models with atomic activation.
+
+    Readers call `get(name)` and keep the returned ModelVersion for the whole
+    request, so a swap never changes the model halfway through a forward pass.
+    Activation is a single dict assignment under the lock; in-flight requests
+    keep using the version they already hold.
+    """
+
+    def __init__(self, history: int = MODEL_REGISTRY_HISTORY):
+        self.history = max(1, int(history))
+        self._lock = threading.Lock()
+        self._active: dict[str, ModelVersion] = {}
+        self._previous: dict[str, ModelVersion] = {}
+        self._versions: dict[str, OrderedDict[str, ModelVersion]] = {}
+        self._loaders: dict[str, Callable[[str], Any]] = {}
+        self._loading: dict[str, dict] = {}
+        self._counters: dict[str, int] = {}
+        self._listeners: list[Callable[[str, ModelVersion], None]] = []
+
+    # ---------- registration ----------
+    def set_loader(self, name: str, loader: Callable[[str], Any]):
+        """Register the function used to load artifacts for `name` from a path/identifier."""
+        self._loaders[name] = loader
+
+    def add_listener(self, listener: Callable[[str, ModelVersion], None]):
+        """Call `listener(name, entry)` whenever a model's active version changes."""
+        self._listeners.append(listener)
+
+    def _next_version(self, name: str) -> str:
+        self._counters[name] = self._counters.get(name, 0) + 1
+        return f"v{self._counters[name]}"
+
+    def register(self, name: str, model, version: str | None = None, source: str | None = None,
+                 activate: bool = True, warmup: Callable[[ModelVersion], None] | None = tensor_warmup) -> ModelVersion:
+        """Store a model version (warming it up first) and optionally make it active."""
+        with self._lock:
+            version = version or self._next_version(name)
+        entry = ModelVersion(name=name, version=version, model=model, in_features=introspect_input_size(model), source=source)
+        if NUMPY_FAST_PATH:
+            entry.numpy = compile_numpy(model)
+
+        if warmup is not None:
+            started = time.perf_counter()
+            warmup(entry)
+            entry.warmup_ms = (time.perf_counter() - started) * 1000.0
+
+        with self._lock:
+            versions = self._versions.setdefault(name, OrderedDict())
+            versions[version] = entry
+            if activate:
+                self._swap(name, entry)
+            self._trim(name)
+        return entry
+
+    def _swap(self, name: str, entry: ModelVersion):
+        current = self._active.get(name)
+        if current is not None and current is not entry:
+            self._previous[name] = current
+        self._active[name] = entry
+        print(f"✅ Model '{name}' now serving version {entry.version}")
+        for listener in self._listeners:
+            try:
+                listener(name, entry)
+            except Exception as e:
+                print(f"⚠️ Model swap listener failed: {e}")
+
+    def _trim(self, name: str):
+        versions = self._versions[name]
+        keep = {e.version for e in (self._active.get(name), self._previous.get(name)) if e is not None}
+        for version in list(versions):
+            if len(versions) <= max(self.history, len(keep)):
+                break
+            if version not in keep:
+                del versions[version]
+
+    # ---------- loading ----------
+    def load(self, name: str, source: str, version: str | None = None, activate: bool = True,
+             warmup: Callable[[ModelVersion], None] | None = tensor_warmup) -> ModelVersion | None:
+        """Load `source` with the loader registered for `name` in this thread. Returns None on failure."""
+        loader = self._loaders.get(name)
+        if loader is None:
+            raise KeyError(f"No loader registered for model '{name}'")
+
+        started = time.perf_counter()
+        state = {"source": source, "version": version, "state": "loading", "error": None, "elapsed_ms": None}
+        self._loading[name] = state
+        entry = None
+        try:
+            model = loader(source)
+            if model is None:
+                raise RuntimeError(f"Loader returned no model for '{source}'")
+            entry = self.register(name, model, version=version, source=source, activate=activate, warmup=warmup)
+            state.update(version=entry.version, state="ready")
+        except Exception as e:
+            traceback.print_exc()
+            print(f"⚠️ Load of model '{name}' from '{source}' failed: {e}")
+            state.update(state="failed", error=str(e))
+        state["elapsed_ms"] = (time.perf_counter() - started) * 1000.0
+        return entry
+
+    def load_in_background(self, name: str, source: str, version: str | None = None, activate: bool = True) -> threading.Thread:
+        """Load `source` with the loader registered for `name`, warm it up, then swap it in."""
+        if name not in self._loaders:
+            raise KeyError(f"No loader registered for model '{name}'")
+        thread = threading.Thread(target=self.load, args=(name, source, version, activate), name=f"model-load-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def warmup_active(self):
+        """Warm up every active version (after fork, models loaded in the master were not warmed)."""
+        for entry in list(self._active.values()):
+            started = time.perf_counter()
+            tensor_warmup(entry)
+            entry.warmup_ms = (time.perf_counter() - started) * 1000.0
+
+    # ---------- lookup / switching ----------
+    def get(self, name: str) -> ModelVersion:
+        entry = self._active.get(name)
+        if entry is None:
+            raise RuntimeError(f"Model '{name}' not loaded.")
+        return entry
+
+    def get_model(self, name: str):
+        return self.get(name).model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._active
+
+    def load_state(self, name: str) -> dict | None:
+        """Progress of the latest background load for `name` (None if there was none)."""
+        return self._loading.get(name)
+
+    def activate(self, name: str, version: str) -> ModelVersion:
+        with self._lock:
+            entry = self._versions.get(name, {}).get(version)
+            if entry is None:
+                raise KeyError(f"Unknown version '{version}' for model '{name}'")
+            self._swap(name, entry)
+            return entry
+
+    def rollback(self, name: str) -> ModelVersion:
+        """Swap back to the previously active version."""
+        with self._lock:
+            previous = self._previous.get(name)
+            if previous is None:
+                raise KeyError(f"No previous version to roll back to for model '{name}'")
+            self._swap(name, previous)
+            return previous
+
+    def describe(self) -> dict:
+        out = {}
+        for name in sorted(set(self._versions) | set(self._loading)):
+            active = self._active.get(name)
+            previous = self._previous.get(name)
+            out[name] = {
+                "active": active.version if active else None,
+                "previous": previous.version if previous else None,
+                "versions": [e.info() for e in self._versions.get(name, {}).values()],
+                "loading": self._loading.get(name),
+            }
+        return out
+
+# Process-wide registry
+registry = ModelRegistry()
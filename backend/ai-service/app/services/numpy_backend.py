@@ -0,0 +1,111 @@
+# backend/ai-service/app/services/numpy_backend.py
+"""
+Torch-free evaluation of small feed-forward models.
+
+For the tiny models we serve (PasswordModel 4->8->3, the single-layer
+/api/infer model), torch.no_grad(), tensor construction and dispatcher
+overhead cost far more than the math. compile_numpy() copies their weights
+into float32 NumPy arrays and evaluates them with plain matmul + relu.
+Anything it does not recognise returns None and keeps running on torch, and
+so does any model whose outputs on a random batch differ from the compiled
+version's (e.g. an unrelated class that happens to share a name).
+"""
+import numpy as np
+import torch
+import torch.nn as nn
+
+# Rows run through both implementations before a fast path is used
+_CHECK_ROWS = 16
+
+class NumpyMLP:
+    """Stack of dense layers evaluated as x @ W.T + b with optional relu."""
+
+    def __init__(self, layers: list[tuple[np.ndarray, np.ndarray, bool]]):
+        # (weight transposed to in x out, bias, relu after this layer)
+        self.layers = layers
+        self.in_features = int(layers[0][0].shape[0])
+        self.out_features = int(layers[-1][0].shape[1])
+
+    def __call__(self, x) -> np.ndarray:
+        h = np.asarray(x, dtype=np.float32)
+        if h.ndim == 1:
+            h = h.reshape(1, -1)
+        for weight_t, bias, relu in self.layers:
+            h = h @ weight_t
+            h += bias
+            if relu:
+                np.maximum(h, 0.0, out=h)
+        return h
+
+def _dense(linear: nn.Linear) -> tuple[np.ndarray, np.ndarray]:
+    weight_t = np.ascontiguousarray(linear.weight.detach().cpu().numpy().astype(np.float32).T)
+    if linear.bias is not None:
+        bias = linear.bias.detach().cpu().numpy().astype(np.float32)
+    else:
+        bias = np.zeros(weight_t.shape[1], dtype=np.float32)
+    return weight_t, bias
+
+def _children(model: nn.Module) -> dict[str, nn.Module]:
+    return dict(model.named_children())
+
+def _from_sequential(model: nn.Sequential) -> NumpyMLP | None:
+    layers = []
+    for module in model:
+        if type(module) is nn.Linear:
+            layers.append([*_dense(module), False])
+        elif type(module) is nn.ReLU and layers and not layers[-1][2]:
+            layers[-1][2] = True
+        else:
+            return None
+    return NumpyMLP([tuple(layer) for layer in layers]) if layers else None
+
+def _from_single_linear(model: nn.Module) -> NumpyMLP | None:
+    # SimpleModel / LinearModel: forward(x) = self.linear(x)
+    children = _children(model)
+    if set(children) != {"linear"} or type(children["linear"]) is not nn.Linear:
+        return None
+    return NumpyMLP([(*_dense(children["linear"]), False)])
+
+def _from_password_model(model: nn.Module) -> NumpyMLP | None:
+    # PasswordModel: forward(x) = fc2(relu(fc1(x)))
+    children = _children(model)
+    if set(children) != {"fc1", "fc2"} or any(type(c) is not nn.Linear for c in children.values()):
+        return None
+    return NumpyMLP([(*_dense(children["fc1"]), True), (*_dense(children["fc2"]), False)])
+
+# Architectures whose forward() we know, keyed by class name so this module
+# does not need to import the model definitions
+_BUILDERS = {
+    "SimpleModel": _from_single_linear,
+    "LinearModel": _from_single_linear,
+    "PasswordModel": _from_password_model,
+}
+
+def _agrees(model: nn.Module, fast: NumpyMLP) -> bool:
+    """Compare torch and NumPy outputs on a seeded random batch."""
+    x = np.random.default_rng(0).standard_normal((_CHECK_ROWS, fast.in_features)).astype(np.float32)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(x))
+    if not isinstance(expected, torch.Tensor):
+        return False
+    expected = expected.detach().cpu().numpy().reshape(_CHECK_ROWS, -1)
+    actual = fast(x)
+    return expected.shape == actual.shape and np.allclose(actual, expected, rtol=1e-4, atol=1e-5)
+
+def compile_numpy(model) -> NumpyMLP | None:
+    """NumPy equivalent of `model`, or None if its architecture is not supported."""
+    try:
+        if type(model) is nn.Sequential:
+            fast = _from_sequential(model)
+        else:
+            builder = _BUILDERS.get(type(model).__name__)
+            if builder is None or not isinstance(model, nn.Module):
+                return None
+            fast = builder(model)
+        if fast is not None and not _agrees(model, fast):
+            print(f"⚠️ NumPy fast path for {type(model).__name__} disagrees with its forward(); keeping torch")
+            return None
+        return fast
+    except Exception as e:
+        print(f"⚠️ Could not build NumPy fast path for {type(model).__name__}: {e}")
+        return None
@@ -0,0 +1,10 @@
+# backend/ai-service/app/services/overload.py
+from app.config import INFER_RETRY_AFTER_S
+
+class Overloaded(Exception):
+    """Raised when a bounded pool is saturated; main.py turns this into 503 + Retry-After."""
+
+    def __init__(self, detail: str = "Inference queue full", retry_after: int = INFER_RETRY_AFTER_S):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
@@ -0,0 +1,57 @@
+# backend/ai-service/app/services/pagination.py
+"""
+Keyset (cursor) pagination over (created_at, id), newest first.
+
+A page is read with
+    WHERE <filters> AND (created_at, id) < (:cursor_created_at, :cursor_id)
+    ORDER BY created_at DESC, id DESC LIMIT :limit
+The composite (created_at, id) indexes declared on the models serve this
+query, so a deep page costs the same as the first one. Unlike OFFSET,
+rows inserted while a client is paging do not shift later pages.
+
+Cursors are opaque to clients: base64url-encoded JSON of the last row's
+(created_at, id).
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+async def keyset_page(db: AsyncSession, model, filters: list, cursor: str | None, limit: int):
+    """One page of `model` rows matching `filters`; returns (rows, next_cursor or None)."""
+    query = select(model).where(*filters)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    # One extra row tells whether another page exists
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    rows = list((await db.execute(query)).scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+def time_filters(model, since: datetime | None, until: datetime | None) -> list:
+    """created_at in [since, until)."""
+    filters = []
+    if since is not None:
+        filters.append(model.created_at >= since)
+    if until is not None:
+        filters.append(model.created_at < until)
+    return filters
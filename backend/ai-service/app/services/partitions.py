@@ -0,0 +1,312 @@
+# backend/ai-service/app/services/partitions.py
+"""
+Partition maintenance and retention for the event tables (Postgres).
+
+events, password_events, phishing_attempts and audit_logs are created as
+RANGE (created_at) partitioned tables (see PARTITIONED in app/db.py). Each
+period (month or day) gets its own partition, named after the period start:
+
+  events_p202405      EVENT_PARTITION_INTERVAL=month
+  events_p20240517    EVENT_PARTITION_INTERVAL=day
+  events_default      rows outside every period (e.g. backfilled history)
+
+run_maintenance():
+  * creates the partitions for the current period and the
+    EVENT_PARTITION_PREMAKE periods after it, so inserts never wait on DDL.
+    Rows that already landed in the default partition for such a period
+    (e.g. after maintenance was down) are moved into the new partition;
+  * retires partitions that end more than EVENT_RETENTION_DAYS ago. Each one
+    is first compacted into per-day event_summaries rows. It is then dropped,
+    or detached into EVENT_ARCHIVE_SCHEMA. Both are catalog operations and
+    cost the same whatever the partition holds; no DELETE scan is involved.
+    Expired rows in the default partition are compacted the same way, then
+    deleted or moved into <EVENT_ARCHIVE_SCHEMA>.<table>_default.
+
+Everything runs in one transaction holding an advisory lock, so concurrent
+workers never race each other and a crash never leaves a partition dropped
+without its summaries. Each table gets its own savepoint: a table that fails
+(e.g. on the lock timeout) is reported and the others are still maintained.
+Premade partitions leave several periods of slack if a pass fails. Tables
+that already existed unpartitioned are left alone and reported.
+
+Period boundaries are UTC midnights.
+"""
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.config import (
+    EVENT_PARTITION_INTERVAL, EVENT_PARTITION_PREMAKE, EVENT_PARTITION_MAINTENANCE_S,
+    EVENT_RETENTION_DAYS, EVENT_RETENTION_MODE, EVENT_ARCHIVE_SCHEMA,
+)
+
+# Partitioned table -> column summarised as `label` when compacting
+PARTITIONED_TABLES = {
+    "events": "type",
+    "password_events": "password_strength",
+    "phishing_attempts": "result",
+    "audit_logs": "action",
+}
+# Tables without a user_id column
+_NO_USER = {"audit_logs"}
+
+RETENTION_MODES = ("drop", "archive")
+
+# Arbitrary constant: pg_try_advisory_xact_lock key for this job
+_LOCK_KEY = 7_210_421
+_LOCK_TIMEOUT_MS = 5000
+
+# -------------------------------
+# Periods and names
+# -------------------------------
+def period_start(day: date, interval: str) -> date:
+    return day.replace(day=1) if interval == "month" else day
+
+def next_period(start: date, interval: str) -> date:
+    if interval == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+def partition_name(table: str, start: date, interval: str) -> str:
+    return f"{table}_p{start:%Y%m}" if interval == "month" else f"{table}_p{start:%Y%m%d}"
+
+def parse_partition(table: str, name: str) -> tuple[date, date] | None:
+    """(start, end) of a partition created by this module, None for any other child."""
+    prefix = f"{table}_p"
+    suffix = name[len(prefix):]
+    if not name.startswith(prefix) or not suffix.isdigit():
+        return None
+    try:
+        if len(suffix) == 6:
+            start = date(int(suffix[:4]), int(suffix[4:]), 1)
+            return start, next_period(start, "month")
+        if len(suffix) == 8:
+            start = date(int(suffix[:4]), int(suffix[4:6]), int(suffix[6:]))
+            return start, next_period(start, "day")
+    except ValueError:
+        pass
+    return None
+
+def retention_cutoff(today: date, retention_days: int) -> date | None:
+    """First day still kept, None when retention is off."""
+    return today - timedelta(days=retention_days) if retention_days > 0 else None
+
+def expired(partitions: list[str], table: str, today: date, retention_days: int) -> list[str]:
+    """Partitions whose whole range lies before today - retention_days."""
+    cutoff = retention_cutoff(today, retention_days)
+    if cutoff is None:
+        return []
+    out = []
+    for name in partitions:
+        bounds = parse_partition(table, name)
+        if bounds is not None and bounds[1] <= cutoff:
+            out.append(name)
+    return sorted(out)
+
+# -------------------------------
+# Catalog
+# -------------------------------
+def _q(conn, name: str) -> str:
+    return conn.dialect.identifier_preparer.quote(name)
+
+def _utc(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+def is_partitioned(conn, table: str) -> bool:
+    kind = conn.execute(text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}).scalar()
+    return kind == "p"
+
+def list_partitions(conn, table: str) -> list[str]:
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:t)"), {"t": table})
+    return [r[0] for r in rows]
+
+# -------------------------------
+# Maintenance steps
+# -------------------------------
+def _take_from_default(conn, table: str, start: date, end: date, holding: str) -> int:
+    """Move the default partition's rows in [start, end) into the temp table `holding`."""
+    default = f"{table}_default"
+    bounds = {"start": _utc(start), "end": _utc(end)}
+    where = "created_at >= :start AND created_at < :end"
+    if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {_q(conn, default)} WHERE {where})"), bounds).scalar():
+        return 0
+    conn.execute(text(f"CREATE TEMP TABLE {_q(conn, holding)} (LIKE {_q(conn, table)}) ON COMMIT DROP"))
+    return conn.execute(text(
+        f"WITH moved AS (DELETE FROM {_q(conn, default)} WHERE {where} RETURNING *) "
+        f"INSERT INTO {_q(conn, holding)} SELECT * FROM moved"), bounds).rowcount
+
+def ensure_partitions(conn, table: str, today: date, interval: str, premake: int) -> tuple[list[str], int]:
+    """Create the default partition and the current + `premake` upcoming ones.
+
+    Returns the new partition names and how many rows were moved into them
+    from the default partition (Postgres refuses to create a partition while
+    the default one holds rows in its range).
+    """
+    existing = set(list_partitions(conn, table))
+    created = []
+    moved = 0
+    default = f"{table}_default"
+    if default not in existing:
+        conn.execute(text(f"CREATE TABLE {_q(conn, default)} PARTITION OF {_q(conn, table)} DEFAULT"))
+        created.append(default)
+    start = period_start(today, interval)
+    for _ in range(max(0, premake) + 1):
+        end = next_period(start, interval)
+        name = partition_name(table, start, interval)
+        if name not in existing:
+            holding = f"{name}_moving"
+            rows = _take_from_default(conn, table, start, end, holding)
+            conn.execute(text(
+                f"CREATE TABLE {_q(conn, name)} PARTITION OF {_q(conn, table)} "
+                f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"))
+            if rows:
+                # Re-inserted through the parent, so they are routed to the new partition
+                conn.execute(text(f"INSERT INTO {_q(conn, table)} SELECT * FROM {_q(conn, holding)}"))
+                conn.execute(text(f"DROP TABLE {_q(conn, holding)}"))
+                moved += rows
+            created.append(name)
+        start = end
+    return created, moved
+
+def compact_partition(conn, table: str, name: str, before: date | None = None) -> int:
+    """Summarise one partition (its rows before `before`, if given) into event_summaries.
+
+    One row per UTC day, user and label.
+    """
+    label = PARTITIONED_TABLES[table]
+    user = "NULL::integer" if table in _NO_USER else "user_id"
+    where = "WHERE created_at < :before " if before is not None else ""
+    params = {"source": table, "before": _utc(before)} if before is not None else {"source": table}
+    result = conn.execute(text(
+        f"INSERT INTO event_summaries (source, day, user_id, label, count) "
+        f"SELECT :source, (created_at AT TIME ZONE 'UTC')::date, {user}, {_q(conn, label)}, count(*) "
+        f"FROM {_q(conn, name)} {where}GROUP BY 2, 3, 4"), params)
+    return result.rowcount
+
+def retire_partition(conn, table: str, name: str, mode: str, archive_schema: str):
+    if mode == "archive":
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_q(conn, archive_schema)}"))
+        conn.execute(text(f"ALTER TABLE {_q(conn, table)} DETACH PARTITION {_q(conn, name)}"))
+        conn.execute(text(f"ALTER TABLE {_q(conn, name)} SET SCHEMA {_q(conn, archive_schema)}"))
+    else:
+        conn.execute(text(f"DROP TABLE {_q(conn, name)}"))
+
+def retire_default_rows(conn, table: str, cutoff: date, mode: str, archive_schema: str) -> dict | None:
+    """Compact, then delete or archive, the default partition's rows older than `cutoff`.
+
+    The default partition never expires as a whole, so its old rows (e.g.
+    backfilled history) are retired row by row. None when it holds none.
+    """
+    default = f"{table}_default"
+    params = {"cutoff": _utc(cutoff)}
+    if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {_q(conn, default)} WHERE created_at < :cutoff)"),
+                        params).scalar():
+        return None
+    summaries = compact_partition(conn, table, default, before=cutoff)
+    delete = f"DELETE FROM {_q(conn, default)} WHERE created_at < :cutoff"
+    if mode == "archive":
+        archived = f"{_q(conn, archive_schema)}.{_q(conn, default)}"
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_q(conn, archive_schema)}"))
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {archived} (LIKE {_q(conn, table)})"))
+        rows = conn.execute(text(f"WITH moved AS ({delete} RETURNING *) INSERT INTO {archived} SELECT * FROM moved"),
+                            params).rowcount
+    else:
+        rows = conn.execute(text(delete), params).rowcount
+    return {"partition": default, "rows": rows, "summary_rows": summaries}
+
+def run_maintenance(engine, today: date | None = None, interval: str = EVENT_PARTITION_INTERVAL,
+                    premake: int = EVENT_PARTITION_PREMAKE, retention_days: int = EVENT_RETENTION_DAYS,
+                    mode: str = EVENT_RETENTION_MODE, archive_schema: str = EVENT_ARCHIVE_SCHEMA) -> dict:
+    """Create upcoming partitions and retire expired ones; returns what was done per table."""
+    if mode not in RETENTION_MODES:
+        raise ValueError(f"Unknown retention mode '{mode}' (expected one of {RETENTION_MODES})")
+    if engine.dialect.name != "postgresql" or interval not in ("day", "month"):
+        return {"skipped": "partitioning disabled"}
+    today = today or datetime.now(timezone.utc).date()
+    report: dict = {"tables": {}}
+    with engine.begin() as conn:
+        if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": _LOCK_KEY}).scalar():
+            return {"skipped": "another worker is running maintenance"}
+        # Partition DDL locks the parent table; queued behind a long transaction
+        # it would stall every insert, so give up and retry on the next pass
+        conn.execute(text(f"SET LOCAL lock_timeout = '{int(_LOCK_TIMEOUT_MS)}ms'"))
+        cutoff = retention_cutoff(today, retention_days)
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                report["tables"][table] = {"partitioned": False}
+                continue
+            try:
+                with conn.begin_nested():
+                    created, moved = ensure_partitions(conn, table, today, interval, premake)
+                    retired = []
+                    for name in expired(list_partitions(conn, table), table, today, retention_days):
+                        summaries = compact_partition(conn, table, name)
+                        retire_partition(conn, table, name, mode, archive_schema)
+                        retired.append({"partition": name, "summary_rows": summaries})
+                    if cutoff is not None:
+                        default = retire_default_rows(conn, table, cutoff, mode, archive_schema)
+                        if default is not None:
+                            retired.append(default)
+            except Exception as e:
+                # Rolled back to the savepoint; the other tables carry on
+                report["tables"][table] = {"partitioned": True, "error": str(e)}
+                continue
+            report["tables"][table] = {"partitioned": True, "created": created, "moved_from_default": moved,
+                                       "retired": retired}
+    return report
+
+# -------------------------------
+# Background job
+# -------------------------------
+class PartitionMaintainer:
+    def __init__(self, every_s: float = EVENT_PARTITION_MAINTENANCE_S):
+        self.every_s = every_s
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.runs = 0
+        self.last_report: dict | None = None
+
+    def run_once(self, engine) -> dict:
+        report = run_maintenance(engine)
+        self.runs += 1
+        self.last_report = report
+        for table, info in report.get("tables", {}).items():
+            if not info["partitioned"]:
+                print(f"ℹ️ '{table}' is not partitioned (created before partitioning was enabled); retention skipped")
+                continue
+            if "error" in info:
+                print(f"⚠️ Partition maintenance of '{table}' failed: {info['error']}")
+                continue
+            if info["created"]:
+                print(f"✅ Created partitions: {', '.join(info['created'])}")
+            if info["moved_from_default"]:
+                print(f"ℹ️ Moved {info['moved_from_default']} '{table}' rows out of the default partition")
+            for retired in info["retired"]:
+                rows = f"{retired['rows']} rows, " if "rows" in retired else ""
+                print(f"✅ Retired partition '{retired['partition']}' ({rows}{retired['summary_rows']} summary rows)")
+        return report
+
+    def _run(self, engine):
+        # The first pass runs synchronously in create_tables
+        while not self._stopping.wait(self.every_s):
+            try:
+                self.run_once(engine)
+            except Exception as e:
+                print(f"⚠️ Partition maintenance failed: {e}")
+
+    def start(self, engine):
+        if self.every_s <= 0:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, args=(engine,), name="partition-maintenance", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+
+# Process-wide job; main.py starts it after the tables exist
+maintainer = PartitionMaintainer()
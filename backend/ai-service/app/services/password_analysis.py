@@ -0,0 +1,83 @@
+# backend/ai-service/app/services/password_analysis.py
+from dataclasses import dataclass
+
+import numpy as np
+
+STRENGTH_LABELS = ["weak", "medium", "strong"]
+
+# -------------------------------
+# Single-pass character statistics
+# -------------------------------
+@dataclass(slots=True)
+class PasswordStats:
+    length: int = 0
+    digits: int = 0
+    symbols: int = 0
+    upper: int = 0
+    lower: int = 0
+
+def password_stats(password: str) -> PasswordStats:
+    """Count every character class in one scan of the password."""
+    digits = symbols = upper = lower = 0
+    for c in password:
+        if c.isalnum():
+            if c.isdigit():
+                digits += 1
+            elif c.isupper():
+                upper += 1
+            elif c.islower():
+                lower += 1
+        else:
+            symbols += 1
+    return PasswordStats(len(password), digits, symbols, upper, lower)
+
+def stats_matrix(stats: list[PasswordStats]) -> np.ndarray:
+    """N x 4 float32 feature matrix in PasswordModel order: length, digits, symbols, upper."""
+    matrix = np.empty((len(stats), 4), dtype=np.float32)
+    for i, s in enumerate(stats):
+        matrix[i, 0] = s.length
+        matrix[i, 1] = s.digits
+        matrix[i, 2] = s.symbols
+        matrix[i, 3] = s.upper
+    return matrix
+
+# -------------------------------
+# Heuristics built on the same statistics
+# -------------------------------
+def heuristic_strength(s: PasswordStats) -> str:
+    if s.length >= 12 and s.upper and s.digits and s.symbols:
+        return "strong"
+    if s.length >= 8:
+        return "medium"
+    return "weak"
+
+def reasons_and_suggestions(s: PasswordStats, breached: bool = False) -> tuple[list[str], list[str]]:
+    """Human readable reasons & suggestions (lightweight)."""
+    reasons = []
+    suggestions = []
+
+    if breached:
+        reasons.append("Found in known breached password lists")
+        suggestions.append("Choose a password that has not appeared in a data breach.")
+
+    if s.length < 8:
+        reasons.append("Too short")
+        suggestions.append("Make it at least 12 characters long (use a passphrase).")
+    elif s.length < 12:
+        reasons.append("Short length")
+        suggestions.append("Consider using 12+ characters for better protection.")
+
+    if not s.upper:
+        reasons.append("No uppercase letters")
+        suggestions.append("Add at least one uppercase letter.")
+    if not s.lower:
+        reasons.append("No lowercase letters")
+        suggestions.append("Use lowercase letters.")
+    if not s.digits:
+        reasons.append("No digits")
+        suggestions.append("Include at least one digit.")
+    if not s.symbols:
+        reasons.append("No special characters")
+        suggestions.append("Include symbols like !@#$%^&*() to increase entropy.")
+
+    return reasons, suggestions
@@ -0,0 +1,161 @@
+# backend/ai-service/app/services/password_hasher.py
+"""
+argon2 hashing for register / login, off the request path.
+
+Hashes run in a dedicated pool of PASSWORD_HASH_WORKERS processes. In a
+thread, argon2 would still hold up the interpreter around every call and
+occupy Starlette's shared threadpool, so a login storm slowed every other
+route. A semaphore admits PASSWORD_HASH_MAX_CONCURRENCY hashes at a time;
+callers that cannot get a slot within PASSWORD_HASH_QUEUE_TIMEOUT_S get
+Overloaded (503 + Retry-After) instead of piling up.
+
+The argon2 cost comes from ARGON2_* settings. verify_and_update() also
+returns a fresh hash when the stored one was made with other parameters
+(CryptContext.needs_update), so costs can be raised without a migration.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from app.services.overload import Overloaded
+from app.config import (
+    PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_CONCURRENCY, PASSWORD_HASH_QUEUE_TIMEOUT_S,
+    ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM,
+)
+
+def make_context(time_cost: int = ARGON2_TIME_COST, memory_cost: int = ARGON2_MEMORY_COST,
+                 parallelism: int = ARGON2_PARALLELISM) -> CryptContext:
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+# -------------------------------
+# Worker side (runs in the hashing processes)
+# -------------------------------
+_context: CryptContext | None = None
+
+def _init_worker(time_cost: int, memory_cost: int, parallelism: int):
+    global _context
+    _context = make_context(time_cost, memory_cost, parallelism)
+
+def check(context: CryptContext, password: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify, and rehash when the stored parameters differ from `context`'s."""
+    if not context.verify(password, hashed):
+        return False, None
+    return True, context.hash(password) if context.needs_update(hashed) else None
+
+def _hash(password: str) -> str:
+    return _context.hash(password)
+
+def _verify_and_update(password: str, hashed: str) -> tuple[bool, str | None]:
+    return check(_context, password, hashed)
+
+# -------------------------------
+# Pool
+# -------------------------------
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_concurrency: int = PASSWORD_HASH_MAX_CONCURRENCY,
+                 queue_timeout_s: float = PASSWORD_HASH_QUEUE_TIMEOUT_S, time_cost: int = ARGON2_TIME_COST,
+                 memory_cost: int = ARGON2_MEMORY_COST, parallelism: int = ARGON2_PARALLELISM):
+        self.workers = max(0, int(workers))
+        self.max_concurrency = max(1, int(max_concurrency) or self.workers or 1)
+        self.queue_timeout_s = queue_timeout_s
+        self.params = (int(time_cost), int(memory_cost), int(parallelism))
+        # Used in-process when workers == 0
+        self.context = make_context(*self.params)
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.busy_ms = 0.0
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that runs torch and event-loop threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self.params,
+            )
+        return self._pool
+
+    def start(self):
+        """Spawn the worker processes now rather than on the first login (startup phase)."""
+        if self.workers:
+            for future in [self.pool.submit(_init_worker, *self.params) for _ in range(self.workers)]:
+                future.result()
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Overloaded("Password hashing queue full")
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            if not self.workers:
+                return await run_in_threadpool(fn, *args)
+            pool = self.pool
+            try:
+                return await asyncio.wrap_future(pool.submit(fn, *args))
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool once and retry
+                if self._pool is pool:
+                    print("⚠️ Password hashing pool broken; restarting it")
+                    self._pool = None
+                return await asyncio.wrap_future(self.pool.submit(fn, *args))
+        finally:
+            self.busy_ms += (time.perf_counter() - started) * 1000.0
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash if self.workers else self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """(password matches, new hash if the stored one has outdated parameters else None)."""
+        if self.workers:
+            valid, new_hash = await self._run(_verify_and_update, password, hashed)
+        else:
+            valid, new_hash = await self._run(check, self.context, password, hashed)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def snapshot(self) -> dict:
+        time_cost, memory_cost, parallelism = self.params
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "busy_ms": round(self.busy_ms, 1),
+            "argon2": {"time_cost": time_cost, "memory_cost_kib": memory_cost, "parallelism": parallelism},
+        }
+
+# Process-wide hasher used by the auth routes
+hasher = PasswordHasher()
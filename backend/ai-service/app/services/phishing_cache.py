@@ -0,0 +1,62 @@
+# backend/ai-service/app/services/phishing_cache.py
+"""
+Verdict cache for the phishing cascade.
+
+Texts are normalized before hashing so trivially different rescans of the
+same message or URL share an entry: URLs get a lower-case scheme and host,
+no default port, fragment or tracking parameters, and sorted query
+parameters; their paths and query values keep their case (bit.ly/AbC and
+bit.ly/abc are different links). The rest of the text is case-folded with
+whitespace collapsed.
+"""
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.config import PHISHING_CACHE_ENABLED, PHISHING_CACHE_MAX_BYTES, PHISHING_CACHE_TTL_S
+from app.services.model_registry import registry
+from app.services.result_cache import ResultCache
+
+_FULL_URL_RE = re.compile(r"(?:https?://|www\.)[^\s\"'<>]+", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_eid", "mc_cid")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url: str) -> str:
+    if not re.match(r"https?://", url, re.IGNORECASE):
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").rstrip(".")
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    userinfo = parts.netloc.rpartition("@")[0]
+    if userinfo:
+        netloc = f"{userinfo}@{netloc}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith(_TRACKING_PARAMS))
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+def normalize_text(text: str) -> str:
+    # Case-fold the prose between URLs only; normalize_url lowercases just scheme and host
+    out, last = [], 0
+    for m in _FULL_URL_RE.finditer(text):
+        url = m.group(0).rstrip(".,;:!?)")
+        out.append(text[last:m.start()].casefold())
+        out.append(normalize_url(url))
+        last = m.start() + len(url)
+    out.append(text[last:].casefold())
+    return _WHITESPACE_RE.sub(" ", "".join(out)).strip()
+
+def verdict_key(text: str) -> str:
+    digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+    return f"phishing:{digest}"
+
+# Shared cache of (verdict, version tag, tier) per normalized text
+verdict_cache = ResultCache(max_bytes=PHISHING_CACHE_MAX_BYTES, ttl_s=PHISHING_CACHE_TTL_S, enabled=PHISHING_CACHE_ENABLED)
+
+# A new zero-shot version may answer differently
+registry.add_listener(lambda name, entry: verdict_cache.invalidate_prefix("phishing:") if name == "phishing" else None)
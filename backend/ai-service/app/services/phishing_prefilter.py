@@ -0,0 +1,191 @@
+# backend/ai-service/app/services/phishing_prefilter.py
+"""
+First tier of the phishing cascade: a linear model over hashed lexical and
+URL features.
+
+Every text is reduced to a handful of string features (lower-cased word
+tokens, URL hosts / TLDs / shape flags, and the original "@" / "login" /
+"password" heuristics), each feature is hashed into a fixed-size weight
+vector, and the score is sigmoid(bias + sum of weights). That takes a few
+microseconds, so texts the prefilter is confident about never reach the
+zero-shot model.
+
+Weights come from PHISHING_PREFILTER_PATH (written by
+train_phishing_prefilter.py). Without that file a small hand-weighted seed
+model built from the old heuristics is used.
+"""
+import ipaddress
+import math
+import os
+import re
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from app.config import PHISHING_PREFILTER_PATH, PHISHING_PREFILTER_BITS
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_URL_RE = re.compile(r"(?:https?://|www\.)[^\s\"'<>]+", re.IGNORECASE)
+
+def _length_bucket(n: int) -> str:
+    for limit in (20, 80, 300, 1000):
+        if n <= limit:
+            return f"len:<={limit}"
+    return "len:>1000"
+
+def url_hosts(text: str) -> list[str]:
+    """
+    Lower-cased hosts of every http(s):// or www. URL in `text`, without
+    userinfo ("user@"), port or trailing dot.
+    """
+    hosts = []
+    for url in _URL_RE.findall(text):
+        # Browsers treat "\" as "/" in http(s) URLs: "evil.com\@good.com" goes to evil.com
+        url = url.rstrip(".,;:!?)").replace("\\", "/")
+        if not url.lower().startswith(("http://", "https://")):
+            url = "http://" + url
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            continue
+        host = (host or "").rstrip(".")
+        if host:
+            hosts.append(host)
+    return hosts
+
+def extract_features(text: str) -> list[str]:
+    """String features of `text`; duplicates are kept and count as repeats."""
+    lowered = text.lower()
+    features = [_length_bucket(len(text))]
+    features.extend("w:" + tok for tok in _TOKEN_RE.findall(lowered))
+
+    hosts = url_hosts(text)
+    if hosts:
+        features.append("url:any")
+    for host in hosts:
+        labels = host.split(".")
+        features.append("host:" + host)
+        features.append("tld:" + labels[-1])
+        if len(labels) > 4:
+            features.append("url:deep_subdomains")
+        if "xn--" in host:
+            features.append("url:punycode")
+        if host.count("-") >= 2:
+            features.append("url:many_hyphens")
+        try:
+            ipaddress.ip_address(host)
+            features.append("url:ip_host")
+        except ValueError:
+            pass
+
+    # The heuristics the route used before the cascade, as features
+    if "@" in text and "http" not in text:
+        features.append("h:at_without_http")
+    if "login" in lowered:
+        features.append("h:login")
+    if "password" in lowered:
+        features.append("h:password")
+    return features
+
+def feature_index(feature: str, bits: int) -> int:
+    return zlib.crc32(feature.encode("utf-8")) & ((1 << bits) - 1)
+
+def hashed_features(text: str, bits: int) -> np.ndarray:
+    """Hashed feature indices of `text` (with repeats) as an int array."""
+    return np.fromiter((feature_index(f, bits) for f in extract_features(text)), dtype=np.int64)
+
+# Seed weights: the pre-cascade heuristics plus a few common lures. Only the
+# strongest signals cross the default thresholds on their own. The bias is
+# calibrated against PHISHING_PREFILTER_SAFE_BELOW=0.1: text with no signal
+# scores sigmoid(-2.5) ~ 0.08 and is answered "safe" here, while any link or
+# single lure word lifts it above 0.1 and escalates it to zero-shot.
+SEED_BIAS = -2.5
+SEED_WEIGHTS = {
+    "url:any": 0.5,
+    "h:at_without_http": 1.0,
+    "h:login": 1.5,
+    "h:password": 1.5,
+    "url:ip_host": 2.5,
+    "url:punycode": 2.0,
+    "url:deep_subdomains": 1.0,
+    "url:many_hyphens": 0.75,
+    "w:verify": 1.0,
+    "w:suspended": 1.5,
+    "w:urgent": 1.0,
+    "w:confirm": 0.75,
+    "w:account": 0.5,
+    "w:invoice": 0.5,
+    "w:unlock": 1.0,
+    "w:wallet": 0.75,
+    "w:seed": 0.5,
+    "w:unsubscribe": -0.5,
+    "w:meeting": -0.75,
+    "w:lunch": -1.0,
+    "w:thanks": -0.75,
+}
+
+class Prefilter:
+    """Hashed-feature logistic regression. Read-only after construction, so thread-safe."""
+
+    def __init__(self, weights: np.ndarray, bias: float, version: str):
+        size = int(weights.shape[0])
+        if size & (size - 1):
+            raise ValueError(f"Weight vector length {size} is not a power of two")
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.bits = size.bit_length() - 1
+        self.version = version
+
+    @property
+    def tag(self) -> str:
+        return f"prefilter:{self.version}"
+
+    def score(self, text: str) -> float:
+        """Probability that `text` is phishing."""
+        z = self.bias + float(self.weights[hashed_features(text, self.bits)].sum())
+        return 1.0 / (1.0 + math.exp(-max(-60.0, min(60.0, z))))
+
+    def score_many(self, texts: list[str]) -> list[float]:
+        return [self.score(t) for t in texts]
+
+def seed_prefilter(bits: int = PHISHING_PREFILTER_BITS) -> Prefilter:
+    weights = np.zeros(1 << bits, dtype=np.float32)
+    for feature, weight in SEED_WEIGHTS.items():
+        weights[feature_index(feature, bits)] += weight
+    return Prefilter(weights, SEED_BIAS, "seed")
+
+def load_prefilter(path: str) -> Prefilter:
+    with np.load(path) as data:
+        version = str(data["version"]) if "version" in data else os.path.basename(path)
+        return Prefilter(data["weights"], float(data["bias"]), version)
+
+def save_prefilter(path: str, weights: np.ndarray, bias: float, version: str):
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, weights=np.asarray(weights, dtype=np.float32), bias=np.float32(bias), version=np.array(version))
+    os.replace(tmp, path)
+
+# -------------------------------
+# Shared instance
+# -------------------------------
+_PREFILTER: Prefilter | None = None
+_PREFILTER_LOCK = threading.Lock()
+
+def get_prefilter(path: str = PHISHING_PREFILTER_PATH) -> Prefilter:
+    """Trained weights from `path` if present, else the seed model; loaded once per process."""
+    global _PREFILTER
+    if _PREFILTER is None:
+        with _PREFILTER_LOCK:
+            if _PREFILTER is None:
+                prefilter = None
+                if os.path.exists(path):
+                    try:
+                        prefilter = load_prefilter(path)
+                        print(f"✅ Loaded phishing prefilter '{path}' ({prefilter.tag})")
+                    except Exception as e:
+                        print(f"⚠️ Could not load phishing prefilter '{path}': {e}")
+                else:
+                    print(f"ℹ️ No phishing prefilter at '{path}'. Using seed weights.")
+                _PREFILTER = prefilter or seed_prefilter()
+    return _PREFILTER
@@ -0,0 +1,255 @@
+# backend/ai-service/app/services/phishing_service.py
+"""
+Phishing cascade. Each tier answers if it can and passes the text on otherwise.
+
+  reputation  blocklisted / allowlisted domains (domain_reputation)
+  cache       verdicts already computed for the same normalized text
+  prefilter   hashed lexical/URL linear model (phishing_prefilter); answers
+              when its score is outside the configured ambiguity band
+  zero_shot   the HF zero-shot pipeline, batched across requests; only
+              ambiguous texts get here
+  heuristic   fallback when the zero-shot model is missing or fails
+"""
+import time
+from collections import defaultdict
+
+from app.config import (
+    PHISHING_MAX_BATCH_SIZE, PHISHING_MAX_WAIT_MS, INFER_QUEUE_SIZE,
+    PHISHING_PREFILTER_ENABLED, PHISHING_PREFILTER_SAFE_BELOW, PHISHING_PREFILTER_SUSPICIOUS_ABOVE,
+)
+from app.services import model_loader
+from app.services.batching import MicroBatcher
+from app.services.inference_executor import executor, Overloaded
+from app.services.model_registry import registry
+from app.services.phishing_prefilter import get_prefilter, url_hosts
+from app.services.phishing_cache import verdict_cache, verdict_key
+from app.services.domain_reputation import reputation
+
+# Registry name of the zero-shot phishing pipeline
+MODEL_NAME = "phishing"
+
+# Response header naming the tier that produced the verdict
+TIER_HEADER = "X-Phishing-Tier"
+TIERS = ("reputation", "cache", "prefilter", "zero_shot", "heuristic")
+
+# -------------------------------
+# Per-tier stats
+# -------------------------------
+class CascadeStats:
+    """How many texts each tier answered, how many were escalated, and tier latency."""
+
+    def __init__(self):
+        self.answered: dict[str, int] = defaultdict(int)
+        self.verdicts: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.escalated = 0
+        self.calls: dict[str, int] = defaultdict(int)
+        self.total_ms: dict[str, float] = defaultdict(float)
+        self.max_ms: dict[str, float] = defaultdict(float)
+
+    def record_latency(self, tier: str, elapsed_ms: float):
+        self.calls[tier] += 1
+        self.total_ms[tier] += elapsed_ms
+        self.max_ms[tier] = max(self.max_ms[tier], elapsed_ms)
+
+    def record_verdicts(self, tier: str, verdicts: list[str]):
+        self.answered[tier] += len(verdicts)
+        for v in verdicts:
+            self.verdicts[tier][v] += 1
+
+    def as_dict(self) -> dict:
+        total = sum(self.answered.values())
+        return {
+            "texts": total,
+            "escalated": self.escalated,
+            "escalation_rate": self.escalated / total if total else 0.0,
+            "tiers": {
+                tier: {
+                    "answered": self.answered[tier],
+                    "verdicts": dict(self.verdicts[tier]),
+                    "calls": self.calls[tier],
+                    "avg_ms": self.total_ms[tier] / self.calls[tier] if self.calls[tier] else 0.0,
+                    "max_ms": self.max_ms[tier],
+                }
+                for tier in TIERS
+            },
+            "config": {
+                "prefilter_enabled": PHISHING_PREFILTER_ENABLED,
+                "safe_below": PHISHING_PREFILTER_SAFE_BELOW,
+                "suspicious_above": PHISHING_PREFILTER_SUSPICIOUS_ABOVE,
+            },
+        }
+
+stats = CascadeStats()
+
+# -------------------------------
+# Tiers
+# -------------------------------
+def heuristic_verdict(text: str) -> str:
+    """Fallback when the model is unavailable: suspicious if it contains obvious patterns."""
+    lowered = text.lower()
+    if "@" in text and "http" not in text:
+        return "suspicious"
+    if "login" in lowered or "password" in lowered:
+        return "suspicious"
+    return "safe"
+
+def text_hosts(text: str) -> list[str]:
+    """Hosts of the URLs in `text`; a bare domain on its own counts as one."""
+    hosts = url_hosts(text)
+    if not hosts:
+        candidate = text.strip().lower().rstrip(".")
+        if "." in candidate and " " not in candidate and "@" not in candidate and "/" not in candidate:
+            hosts = [candidate]
+    return hosts
+
+def _shortcut(text: str, key: str | None) -> tuple[str, str | None, str] | None:
+    """Reputation or cached verdict for `text`, if there is one."""
+    hosts = text_hosts(text)
+    if hosts:
+        match = reputation.verdict(hosts)
+        if match is not None:
+            return match[0], None, "reputation"
+    if key is not None:
+        cached = verdict_cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1], "cache"
+    return None
+
+def _remember(key: str | None, verdict: str, version: str | None, tier: str):
+    # Heuristic fallbacks are not cached: they stand in for a model that is missing
+    if key is not None and tier in ("prefilter", "zero_shot"):
+        verdict_cache.put(key, (verdict, version))
+
+def prefilter_verdict(score: float) -> str | None:
+    """Confident prefilter verdict for `score`, or None to escalate."""
+    if score <= PHISHING_PREFILTER_SAFE_BELOW:
+        return "safe"
+    if score >= PHISHING_PREFILTER_SUSPICIOUS_ABOVE:
+        return "suspicious"
+    return None
+
+def _prefilter_verdicts(texts: list[str]) -> tuple[list[str | None], str]:
+    prefilter = get_prefilter()
+    return [prefilter_verdict(s) for s in prefilter.score_many(texts)], prefilter.tag
+
+def _forward(texts: list[str]) -> list[tuple[str, str]]:
+    """One pipeline call for every queued text; returns (verdict, version) per text."""
+    entry = registry.get(MODEL_NAME)
+    verdicts = model_loader.check_phishing_batch(entry.model, texts)
+    return [(v, entry.tag) for v in verdicts]
+
+# Shared scheduler for escalated texts. Texts are not rectangular rows, so
+# everything goes in one group and check_phishing_batch buckets by token length.
+batcher = MicroBatcher(
+    _forward,
+    max_batch_size=PHISHING_MAX_BATCH_SIZE,
+    max_wait_ms=PHISHING_MAX_WAIT_MS,
+    runner=executor.run,
+    max_queue=INFER_QUEUE_SIZE,
+    group_key=lambda _: 0,
+)
+
+# -------------------------------
+# Cascade
+# -------------------------------
+async def classify(text: str, bypass_cache: bool = False) -> tuple[str, str | None, str]:
+    """
+    Run one text through the cascade.
+    Returns (verdict, model version tag or None for reputation / heuristic, tier).
+    """
+    key = None if bypass_cache else verdict_key(text)
+    started = time.perf_counter()
+    shortcut = _shortcut(text, key)
+    if shortcut is not None:
+        stats.record_latency(shortcut[2], (time.perf_counter() - started) * 1000.0)
+        stats.record_verdicts(shortcut[2], [shortcut[0]])
+        return shortcut
+
+    if PHISHING_PREFILTER_ENABLED:
+        started = time.perf_counter()
+        verdicts, tag = _prefilter_verdicts([text])
+        stats.record_latency("prefilter", (time.perf_counter() - started) * 1000.0)
+        if verdicts[0] is not None:
+            stats.record_verdicts("prefilter", verdicts)
+            _remember(key, verdicts[0], tag, "prefilter")
+            return verdicts[0], tag, "prefilter"
+        stats.escalated += 1
+
+    started = time.perf_counter()
+    try:
+        verdict, version = await batcher.submit(text)
+    except Overloaded:
+        raise
+    except Exception as e:
+        print(f"⚠️ phishing model failed: {e}")
+        verdict = heuristic_verdict(text)
+        stats.record_verdicts("heuristic", [verdict])
+        return verdict, None, "heuristic"
+    stats.record_latency("zero_shot", (time.perf_counter() - started) * 1000.0)
+    stats.record_verdicts("zero_shot", [verdict])
+    _remember(key, verdict, version, "zero_shot")
+    return verdict, version, "zero_shot"
+
+async def classify_many(texts: list[str], bypass_cache: bool = False) -> tuple[list[str], list[str], str | None]:
+    """
+    Run many texts through the cascade; only the ambiguous ones reach the
+    zero-shot model, in a single bucketed call.
+    Returns (verdicts, tiers, version tag of the deepest model tier used).
+    """
+    verdicts: list[str | None] = [None] * len(texts)
+    tiers: list[str] = ["zero_shot"] * len(texts)
+    keys = [None if bypass_cache else verdict_key(t) for t in texts]
+    version = None
+
+    for i, text in enumerate(texts):
+        shortcut = _shortcut(text, keys[i])
+        if shortcut is not None:
+            verdicts[i], _, tiers[i] = shortcut
+            stats.record_verdicts(tiers[i], [verdicts[i]])
+
+    pending = [i for i, v in enumerate(verdicts) if v is None]
+    if PHISHING_PREFILTER_ENABLED and pending:
+        started = time.perf_counter()
+        scored, tag = await executor.run(_prefilter_verdicts, [texts[i] for i in pending])
+        stats.record_latency("prefilter", (time.perf_counter() - started) * 1000.0)
+        for i, verdict in zip(pending, scored):
+            if verdict is not None:
+                verdicts[i], tiers[i], version = verdict, "prefilter", tag
+                _remember(keys[i], verdict, tag, "prefilter")
+        decided = [v for v in scored if v is not None]
+        stats.record_verdicts("prefilter", decided)
+        stats.escalated += len(scored) - len(decided)
+        pending = [i for i in pending if verdicts[i] is None]
+
+    if not pending:
+        return verdicts, tiers, version
+
+    pending_texts = [texts[i] for i in pending]
+    started = time.perf_counter()
+    try:
+        entry = registry.get(MODEL_NAME)
+        results = await executor.run(model_loader.check_phishing_batch, entry.model, pending_texts)
+        stats.record_latency("zero_shot", (time.perf_counter() - started) * 1000.0)
+        stats.record_verdicts("zero_shot", results)
+        version = entry.tag
+    except Overloaded:
+        raise
+    except Exception as e:
+        print(f"⚠️ phishing model failed: {e}")
+        results = [heuristic_verdict(t) for t in pending_texts]
+        stats.record_verdicts("heuristic", results)
+        for i in pending:
+            tiers[i] = "heuristic"
+
+    for i, verdict in zip(pending, results):
+        verdicts[i] = verdict
+        _remember(keys[i], verdict, version, tiers[i])
+    return verdicts, tiers, version
+
+def snapshot() -> dict:
+    return {
+        "cascade": stats.as_dict(),
+        "cache": verdict_cache.snapshot(),
+        "reputation": reputation.snapshot(),
+        "batcher": batcher.snapshot(),
+    }
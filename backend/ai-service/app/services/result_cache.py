@@ -0,0 +1,122 @@
+# backend/ai-service/app/services/result_cache.py
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from app.config import RESULT_CACHE_ENABLED, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_TTL_S
+from app.services.model_registry import registry
+
+# Request header that skips the cache for one call (any truthy value)
+CACHE_BYPASS_HEADER = "X-Cache-Bypass"
+# Response header reporting HIT / MISS / BYPASS
+CACHE_STATUS_HEADER = "X-Cache"
+
+def input_key(values, version_tag: str) -> str:
+    """Key = model version + hash of the input as float32 bytes."""
+    data = np.asarray(values, dtype=np.float32).tobytes()
+    return f"{version_tag}|{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+
+def is_bypass(header_value: str | None) -> bool:
+    return bool(header_value) and header_value.strip().lower() not in ("0", "false", "no")
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_value_size(v) for v in value)
+    return sys.getsizeof(value)
+
+def _approx_size(key: str, value: Any) -> int:
+    # Key + value + entry bookkeeping; exact enough to keep the budget honest
+    return sys.getsizeof(key) + 96 + _value_size(value)
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache bounded by an approximate byte budget."""
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES, ttl_s: float = RESULT_CACHE_TTL_S, enabled: bool = RESULT_CACHE_ENABLED):
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_s = float(ttl_s)
+        self.enabled = enabled and self.max_bytes > 0
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, value)
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Any | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        size = _approx_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (time.monotonic() + self.ttl_s, size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._data:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate_prefix(self, prefix: str):
+        """Drop every entry whose key starts with `prefix` (e.g. a model name)."""
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                self.bytes -= self._data.pop(key)[1]
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+# Shared cache for deterministic inference routes
+result_cache = ResultCache()
+
+# A new active version makes every cached result for that model stale
+registry.add_listener(lambda name, entry: result_cache.invalidate_prefix(f"{name}:"))
@@ -0,0 +1,110 @@
+# backend/ai-service/app/services/rollups.py
+"""
+Hourly rollups of the event tables for /api/stats.
+
+Every write path (single-row creates, bulk ingestion, the event sink) calls
+bump()/bump_async() in the same transaction as its INSERT. Those calls add
+the new rows' counts to stat_rollups, keyed by (source, UTC hour, user_id,
+label). The label is the column that matters for each table: events.type,
+password_events.password_strength, phishing_attempts.result and
+audit_logs.action. Each call is one multi-row upsert, with the counts tallied
+in Python first.
+
+Reads only touch stat_rollups. A query costs (hours in range x groups), not
+the size of the raw tables, and rollups outlive partitions dropped by
+retention. Day buckets are summed from hourly rows.
+
+Rows written before rollups existed are counted by rebuild_stats.py.
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import StatRollup
+from app.services.partitions import PARTITIONED_TABLES
+
+# Source table -> column counted as `label`
+LABEL_COLUMNS = PARTITIONED_TABLES
+BUCKETS = ("hour", "day")
+GROUPS = ("user", "label")
+
+_KEY = ("source", "bucket", "user_id", "label")
+
+def hour_bucket(ts: datetime | None) -> datetime:
+    """Start of the UTC hour; rows without created_at count in the current hour."""
+    if ts is None:
+        ts = datetime.now(timezone.utc)
+    elif ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+def tally(source: str, rows: list[dict]) -> Counter:
+    """Count rows per rollup key."""
+    label = LABEL_COLUMNS[source]
+    counts: Counter = Counter()
+    for row in rows:
+        counts[(source, hour_bucket(row.get("created_at")), row.get("user_id") or 0, row.get(label) or "")] += 1
+    return counts
+
+def upsert_counts(dialect: str, counts: Counter):
+    """INSERT ... ON CONFLICT DO UPDATE adding `counts` to the stored rows."""
+    # Sorted keys give concurrent writers the same lock order (no deadlocks)
+    values = [dict(zip(_KEY, key), count=n) for key, n in sorted(counts.items())]
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(StatRollup).values(values)
+    return stmt.on_conflict_do_update(index_elements=list(_KEY), set_={"count": StatRollup.count + stmt.excluded.count})
+
+def bump(db: Session, source: str, rows: list[dict]):
+    """Add rows to the rollups inside the caller's transaction (sync sessions)."""
+    counts = tally(source, rows)
+    if counts:
+        db.execute(upsert_counts(db.bind.dialect.name, counts))
+
+async def bump_async(db: AsyncSession, source: str, rows: list[dict]):
+    counts = tally(source, rows)
+    if counts:
+        await db.execute(upsert_counts(db.bind.dialect.name, counts))
+
+# -------------------------------
+# Queries
+# -------------------------------
+async def query(db: AsyncSession, source: str, since: datetime, until: datetime, bucket: str = "hour",
+                group_by: tuple[str, ...] = (), user_id: int | None = None, label: str | None = None) -> list[dict]:
+    """Counts per bucket (and per user / label when grouped), oldest bucket first."""
+    columns = [StatRollup.bucket]
+    if "user" in group_by:
+        columns.append(StatRollup.user_id)
+    if "label" in group_by:
+        columns.append(StatRollup.label)
+    lower = hour_bucket(since)
+    if bucket == "day":
+        lower = lower.replace(hour=0)
+    stmt = (select(*columns, func.sum(StatRollup.count))
+            .where(StatRollup.source == source, StatRollup.bucket >= lower, StatRollup.bucket < until)
+            .group_by(*columns))
+    if user_id is not None:
+        stmt = stmt.where(StatRollup.user_id == user_id)
+    if label is not None:
+        stmt = stmt.where(StatRollup.label == label)
+
+    totals: Counter = Counter()
+    for row in await db.execute(stmt):
+        start = hour_bucket(row[0])
+        if bucket == "day":
+            start = start.replace(hour=0)
+        totals[(start, *row[1:-1])] += int(row[-1])
+
+    names = ["bucket"] + [c.key for c in columns[1:]]
+    return [dict(zip(names, key), count=n) for key, n in sorted(totals.items())]
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+def default_range(since: datetime | None, until: datetime | None, days: int = 7) -> tuple[datetime, datetime]:
+    """[since, until) in UTC; defaults to the last `days` days. Naive times are taken as UTC."""
+    until = _utc(until) if until else datetime.now(timezone.utc)
+    return _utc(since) if since else until - timedelta(days=days), until
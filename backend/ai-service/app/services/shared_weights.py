@@ -0,0 +1,117 @@
+# backend/ai-service/app/services/shared_weights.py
+"""
+Weights that several worker processes can share instead of each holding a copy.
+
+mmap: export_shared_weights.py writes each model's state_dict to
+SHARED_WEIGHTS_DIR/<name>.pt (plus <name>.json metadata). Loading it with
+torch.load(mmap=True) and load_state_dict(assign=True) makes the parameters
+views over the file mapping, so N workers reading the same file share one set
+of physical pages through the page cache.
+
+prefork: models are loaded in the gunicorn master, frozen, and the heap is
+moved out of the garbage collector's reach before forking, so the workers'
+copy-on-write pages stay shared.
+"""
+import contextlib
+import gc
+import itertools
+import json
+import os
+from typing import Callable
+
+import torch
+import torch.nn as nn
+
+from app.config import SHARED_WEIGHTS_DIR
+
+def weights_path(name: str, directory: str = SHARED_WEIGHTS_DIR) -> str:
+    return os.path.join(directory, f"{name}.pt")
+
+def meta_path(name: str, directory: str = SHARED_WEIGHTS_DIR) -> str:
+    return os.path.join(directory, f"{name}.json")
+
+def asset_dir(name: str, directory: str = SHARED_WEIGHTS_DIR) -> str:
+    """Directory for non-tensor assets (HF config, tokenizer) of a shared model."""
+    return os.path.join(directory, name)
+
+def freeze(module: nn.Module) -> nn.Module:
+    """Inference-only: eval mode and no autograd state on any parameter."""
+    module.eval()
+    for param in module.parameters():
+        param.requires_grad_(False)
+    return module
+
+def save_module(name: str, module: nn.Module, meta: dict, directory: str = SHARED_WEIGHTS_DIR) -> str:
+    """Write `module`'s weights in the zip format torch.load(mmap=True) can map."""
+    os.makedirs(directory, exist_ok=True)
+    path = weights_path(name, directory)
+    tmp = path + ".tmp"
+    torch.save({k: v.detach().contiguous() for k, v in module.state_dict().items()}, tmp)
+    os.replace(tmp, path)
+    with open(meta_path(name, directory), "w") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+def load_meta(name: str, directory: str = SHARED_WEIGHTS_DIR) -> dict:
+    try:
+        with open(meta_path(name, directory)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def has_module(name: str, directory: str = SHARED_WEIGHTS_DIR) -> bool:
+    return os.path.exists(weights_path(name, directory))
+
+@contextlib.contextmanager
+def empty_parameters():
+    """
+    Create every nn.Parameter registered inside the block on the meta device:
+    no memory and no random initialisation (like accelerate's
+    init_empty_weights). Buffers stay real; they are small and not every
+    buffer is in a state_dict.
+    """
+    register = nn.Module.register_parameter
+
+    def register_on_meta(module, name, param):
+        register(module, name, param)
+        if param is not None and not param.is_meta:
+            module._parameters[name] = nn.Parameter(param.to("meta"), requires_grad=param.requires_grad)
+
+    nn.Module.register_parameter = register_on_meta
+    try:
+        yield
+    finally:
+        nn.Module.register_parameter = register
+
+def load_module(name: str, build: Callable[[dict], nn.Module], directory: str = SHARED_WEIGHTS_DIR) -> nn.Module | None:
+    """
+    Build a module with `build(meta)` and point its parameters at the mapped
+    weight file. The module is built with empty (meta) parameters, so the
+    worker never allocates or initialises a private copy of the weights.
+    Returns None if no shared weights were exported for `name`.
+    """
+    path = weights_path(name, directory)
+    if not os.path.exists(path):
+        return None
+    state = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    with empty_parameters():
+        module = build(load_meta(name, directory))
+    module.load_state_dict(state, assign=True)
+    # assign=True replaces tied parameters one by one; re-tie them (HF models)
+    if hasattr(module, "tie_weights"):
+        module.tie_weights()
+    missing = [n for n, t in itertools.chain(module.named_parameters(), module.named_buffers()) if t.is_meta]
+    if missing:
+        raise RuntimeError(f"Shared weights for '{name}' do not cover {', '.join(missing[:5])}; re-run export_shared_weights.py")
+    print(f"✅ Mapped shared weights for '{name}' from '{path}'")
+    return freeze(module)
+
+def freeze_heap():
+    """
+    Call in the pre-fork master once everything is loaded. Objects alive now
+    move to a permanent generation the collector never scans, so collections
+    in the workers do not write to (and un-share) their pages.
+    """
+    gc.collect()
+    gc.freeze()
+    print(f"ℹ️ Froze {gc.get_freeze_count()} objects before fork")
@@ -0,0 +1,66 @@
+# backend/ai-service/app/services/startup.py
+import threading
+import time
+import traceback
+from typing import Callable
+
+from app.config import READY_MODELS
+from app.services.model_registry import registry
+
+class StartupReport:
+    """Timings for the import, DB and model-load phases of process startup."""
+
+    def __init__(self):
+        self.phases: dict[str, dict] = {}
+        self._threads: list[threading.Thread] = []
+
+    def record(self, name: str, elapsed_ms: float, state: str = "ready", error: str | None = None):
+        self.phases[name] = {"state": state, "elapsed_ms": elapsed_ms, "error": error}
+
+    def run_in_background(self, name: str, fn: Callable[[], None]) -> threading.Thread:
+        """Run one startup phase in a daemon thread and record how long it took."""
+        self.phases[name] = {"state": "running", "elapsed_ms": None, "error": None}
+
+        def _run():
+            started = time.perf_counter()
+            try:
+                fn()
+                self.record(name, (time.perf_counter() - started) * 1000.0)
+            except Exception as e:
+                traceback.print_exc()
+                self.record(name, (time.perf_counter() - started) * 1000.0, state="failed", error=str(e))
+
+        thread = threading.Thread(target=_run, name=f"startup-{name}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    def track(self, thread: threading.Thread):
+        self._threads.append(thread)
+
+    def wait(self, timeout: float | None = None):
+        """Block until every background phase has finished (blocking startup mode)."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def models(self) -> dict:
+        out = {}
+        for name in sorted(set(READY_MODELS) | set(registry.describe())):
+            load = registry.load_state(name) or {}
+            out[name] = {
+                "ready": registry.is_loaded(name),
+                "required": name in READY_MODELS,
+                "state": load.get("state", "ready" if registry.is_loaded(name) else "pending"),
+                "elapsed_ms": load.get("elapsed_ms"),
+                "error": load.get("error"),
+            }
+        return out
+
+    def is_ready(self) -> bool:
+        return all(registry.is_loaded(name) for name in READY_MODELS)
+
+    def as_dict(self) -> dict:
+        return {"ready": self.is_ready(), "phases": self.phases, "models": self.models()}
+
+# Process-wide report
+report = StartupReport()
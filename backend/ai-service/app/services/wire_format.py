@@ -0,0 +1,156 @@
+# backend/ai-service/app/services/wire_format.py
+"""
+Request/response encodings for numeric inference payloads.
+
+JSON stays the default. Two compact alternatives are accepted:
+
+  application/octet-stream  raw little-endian float32 values, row-major.
+                            Optional "X-Shape: N,D" (or "D") header; when it
+                            is missing the width comes from the model.
+  application/msgpack       {"input": [...]} / {"inputs": [[...]]} like JSON,
+                            or {"shape": [N, D], "data": <float32 LE bytes>}.
+
+Responses use the format named in the Accept header (JSON otherwise);
+binary responses carry their shape in X-Shape.
+"""
+import numpy as np
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+# Optional msgpack support
+try:
+    import msgpack
+    _MSGPACK_AVAILABLE = True
+except Exception:
+    msgpack = None
+    _MSGPACK_AVAILABLE = False
+
+OCTET_STREAM = "application/octet-stream"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+SHAPE_HEADER = "X-Shape"
+
+FLOAT32_LE = np.dtype("<f4")
+
+class WireFormatError(ValueError):
+    """Malformed binary/msgpack payload (routes answer 400)."""
+
+def _media_type(header: str | None) -> str:
+    return (header or "").split(";", 1)[0].strip().lower()
+
+def request_format(request: Request) -> str:
+    media = _media_type(request.headers.get("content-type"))
+    if media == OCTET_STREAM:
+        return "binary"
+    if media in MSGPACK_TYPES:
+        return "msgpack"
+    return "json"
+
+def response_format(request: Request) -> str:
+    accept = request.headers.get("accept") or ""
+    for part in accept.split(","):
+        media = _media_type(part)
+        if media == OCTET_STREAM:
+            return "binary"
+        if media in MSGPACK_TYPES:
+            return "msgpack"
+    return "json"
+
+def parse_shape(header: str | None) -> tuple[int, ...] | None:
+    if not header:
+        return None
+    try:
+        shape = tuple(int(p) for p in header.replace("x", ",").split(",") if p.strip())
+    except ValueError:
+        raise WireFormatError(f"Invalid {SHAPE_HEADER} header: {header!r}")
+    if not shape or any(d < 0 for d in shape):
+        raise WireFormatError(f"Invalid {SHAPE_HEADER} header: {header!r}")
+    return shape
+
+def _as_matrix(flat: np.ndarray, shape: tuple[int, ...] | None, width: int) -> np.ndarray:
+    """Reshape a flat float32 view to N x D without copying."""
+    if shape is None:
+        if width <= 0 or flat.size % width:
+            raise WireFormatError(f"Payload of {flat.size} floats is not a multiple of the input size {width}")
+        return flat.reshape(-1, width)
+    if int(np.prod(shape)) != flat.size:
+        raise WireFormatError(f"{SHAPE_HEADER} {shape} does not match payload of {flat.size} floats")
+    return flat.reshape(1, -1) if len(shape) == 1 else flat.reshape(shape[0], -1)
+
+def decode_binary(body: bytes, shape: tuple[int, ...] | None, width: int) -> np.ndarray:
+    if len(body) % FLOAT32_LE.itemsize:
+        raise WireFormatError(f"Body length {len(body)} is not a multiple of 4 bytes")
+    # Zero-copy: the array is a view over the request body
+    return _as_matrix(np.frombuffer(body, dtype=FLOAT32_LE), shape, width)
+
+def decode_msgpack(body: bytes, key: str, width: int) -> np.ndarray:
+    if not _MSGPACK_AVAILABLE:
+        raise WireFormatError("msgpack is not installed on this server")
+    try:
+        obj = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise WireFormatError(f"Invalid msgpack body: {e}")
+    if not isinstance(obj, dict):
+        raise WireFormatError("msgpack body must be a map")
+    if isinstance(obj.get("data"), (bytes, bytearray)):
+        shape = obj.get("shape")
+        if shape is not None and not (
+            isinstance(shape, list) and len(shape) in (1, 2)
+            and all(isinstance(d, int) and not isinstance(d, bool) and d >= 0 for d in shape)
+        ):
+            raise WireFormatError(f"'shape' must be a list of 1 or 2 non-negative integers, got {shape!r}")
+        return decode_binary(bytes(obj["data"]), tuple(shape) if shape else None, width)
+    if key not in obj:
+        raise WireFormatError(f"msgpack body is missing '{key}'")
+    try:
+        matrix = np.asarray(obj[key], dtype=np.float32)
+    except (TypeError, ValueError) as e:
+        raise WireFormatError(f"Invalid '{key}': {e}")
+    if matrix.ndim not in (1, 2):
+        raise WireFormatError(f"'{key}' must be a list or a list of lists of numbers")
+    return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+async def parse_json(request: Request, model: type[BaseModel]) -> BaseModel:
+    """Validate a JSON body against `model`, answering 422 like a normal body parameter."""
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+async def read_matrix(request: Request, key: str, width: int) -> np.ndarray:
+    """Decode a binary or msgpack body into an N x D float32 array."""
+    body = await request.body()
+    if request_format(request) == "binary":
+        return decode_binary(body, parse_shape(request.headers.get(SHAPE_HEADER)), width)
+    return decode_msgpack(body, key, width)
+
+def respond(request: Request, response: Response, key: str, values) -> Response | dict:
+    """
+    Encode `{key: values}` in the format the client asked for. Headers already
+    set on the injected `response` are carried over to binary responses.
+    """
+    fmt = response_format(request)
+    if fmt == "json" or (fmt == "msgpack" and not _MSGPACK_AVAILABLE):
+        return {key: values.tolist() if isinstance(values, np.ndarray) else values}
+
+    array = np.asarray(values, dtype=FLOAT32_LE)
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-type")}
+    headers[SHAPE_HEADER] = ",".join(str(d) for d in array.shape)
+    if fmt == "binary":
+        return Response(content=array.tobytes(), media_type=OCTET_STREAM, headers=headers)
+    content = msgpack.packb({key: array.tolist()}, use_bin_type=True)
+    return Response(content=content, media_type=MSGPACK, headers=headers)
+
+def openapi_body(model: type[BaseModel]) -> dict:
+    """openapi_extra describing the JSON schema plus the binary alternatives."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()},
+                OCTET_STREAM: {"schema": {"type": "string", "format": "binary"}},
+                MSGPACK: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    }
@@ -0,0 +1,74 @@
+# backend/ai-service/bench_numpy_backend.py
+"""
+Compare the NumPy fast path (app/services/numpy_backend.py) with torch for
+the small models we serve: per-call latency on one row (including input
+construction, as in the request path) and batched latency.
+
+Usage (from backend/ai-service):
+  python bench_numpy_backend.py --batch 1024 --rounds 2000
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import torch
+
+from app.services.model_loader import PasswordModel, LinearModel
+from app.services.numpy_backend import compile_numpy
+
+def _median_us(fn, rounds: int) -> float:
+    for _ in range(min(100, rounds)):
+        fn()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+def bench(name: str, model: torch.nn.Module, in_features: int, batch: int, rounds: int):
+    model.eval()
+    fast = compile_numpy(model)
+    row = [float(i) for i in range(in_features)]
+    matrix = np.random.default_rng(0).standard_normal((batch, in_features)).astype(np.float32)
+
+    def torch_single():
+        with torch.no_grad():
+            return model(torch.tensor([row], dtype=torch.float32))
+
+    def torch_batch():
+        with torch.no_grad():
+            return model(torch.from_numpy(matrix))
+
+    with torch.no_grad():
+        expected = model(torch.from_numpy(matrix)).numpy()
+    max_err = float(np.abs(fast(matrix) - expected).max())
+
+    results = {
+        "torch 1-row": _median_us(torch_single, rounds),
+        "numpy 1-row": _median_us(lambda: fast(np.asarray([row], dtype=np.float32)), rounds),
+        f"torch {batch}-row": _median_us(torch_batch, max(10, rounds // 10)),
+        f"numpy {batch}-row": _median_us(lambda: fast(matrix), max(10, rounds // 10)),
+    }
+
+    print(f"\n{name} (max abs diff vs torch: {max_err:.2e})")
+    for label, us in results.items():
+        print(f"  {label:<18}{us:>10.2f} µs")
+    print(f"  speedup 1-row     {results['torch 1-row'] / results['numpy 1-row']:>10.1f}x")
+    print(f"  speedup batched   {results[f'torch {batch}-row'] / results[f'numpy {batch}-row']:>10.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=1024)
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1, help="torch.set_num_threads for a fair single-core comparison")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+    bench("PasswordModel 4->8->3", PasswordModel(input_size=4), 4, args.batch, args.rounds)
+    bench("SimpleModel 3->1", LinearModel(input_size=3, output_size=1), 3, args.batch, args.rounds)
+
+if __name__ == "__main__":
+    main()
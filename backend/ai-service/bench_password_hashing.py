@@ -0,0 +1,99 @@
+# backend/ai-service/bench_password_hashing.py
+"""
+Login throughput vs. CPU cores for the argon2 hashing pool
+(app/services/password_hasher.py).
+
+For each worker count, runs `--concurrency-per-worker` concurrent logins
+(verify of a stored hash) for `--duration` seconds and reports logins/s,
+latency, scaling against one worker, and event-loop lag: the worst delay
+seen by a 10 ms ticker running alongside. That lag is what every other route
+would wait for. "threads" is the old behaviour (Starlette's threadpool) for
+comparison.
+
+Usage (from backend/ai-service):
+  python bench_password_hashing.py                          # threads, then 1, 2, 4, ... up to the core count
+  python bench_password_hashing.py --workers 1 2 4 8 --duration 10
+  ARGON2_MEMORY_COST=19456 ARGON2_PARALLELISM=1 python bench_password_hashing.py
+
+End-to-end numbers (HTTP, DB lookup) come from
+  PASSWORD_HASH_WORKERS=4 python benchmark.py --endpoint auth_login --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from app.services.password_hasher import PasswordHasher, make_context
+
+async def _ticker(stop: asyncio.Event, interval_s: float, lags: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval_s)
+        lags.append((time.perf_counter() - started - interval_s) * 1000.0)
+
+async def bench(hasher: PasswordHasher, stored: str, password: str, concurrency: int, duration_s: float) -> dict:
+    for _ in range(max(1, hasher.workers)):
+        await hasher.verify_and_update(password, stored)
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + duration_s
+
+    async def client():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            valid, _ = await hasher.verify_and_update(password, stored)
+            assert valid
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+    ticker = asyncio.create_task(_ticker(stop, 0.01, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    latencies.sort()
+    return {
+        "logins_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "loop_lag_ms": max(lags, default=0.0),
+    }
+
+async def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, *[n for n in (2, 4, 8, 16, 32) if n <= cores], cores})
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers, help="pool sizes to try")
+    parser.add_argument("--concurrency-per-worker", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per pool size")
+    parser.add_argument("--no-threads", action="store_true", help="skip the threadpool comparison")
+    args = parser.parse_args()
+
+    context = make_context()
+    password = "correct horse battery staple"
+    stored = context.hash(password)
+    print(f"argon2 {stored.split('$')[3]}, {cores} CPU cores")
+    print(f"{'workers':>8} {'clients':>8} {'logins/s':>10} {'scaling':>8} {'p50 ms':>8} {'p95 ms':>8} {'loop lag ms':>12}")
+
+    runs = ([] if args.no_threads else [0]) + args.workers
+    single = None
+    for workers in runs:
+        # workers=0: Starlette's threadpool, as before the hashing pool
+        concurrency = args.concurrency_per_worker * max(1, workers or cores)
+        hasher = PasswordHasher(workers=workers, max_concurrency=concurrency, queue_timeout_s=3600)
+        if workers:
+            await asyncio.to_thread(hasher.start)
+        try:
+            result = await bench(hasher, stored, password, concurrency, args.duration)
+        finally:
+            hasher.shutdown()
+        if workers == 1:
+            single = result["logins_s"]
+        scaling = f"{result['logins_s'] / single:.2f}x" if single and workers else "-"
+        print(f"{workers or 'threads':>8} {concurrency:>8} {result['logins_s']:>10.1f} {scaling:>8} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['loop_lag_ms']:>12.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
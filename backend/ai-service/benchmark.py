@@ -0,0 +1,381 @@
+# backend/ai-service/benchmark.py
+"""
+In-process load test of the API.
+
+The FastAPI app runs in this process behind httpx's ASGI transport, so no
+server, network or real model weights are involved. Stub models are
+registered before startup: an untrained LinearModel and PasswordModel, plus
+a zero-shot stand-in with a configurable per-batch delay. The database is a
+throwaway SQLite file unless --database-url points at a local Postgres.
+
+Each concurrency profile is run against each endpoint. For every pair the
+harness reports throughput, error counts and p50/p95/p99 latency, and can
+write the results as JSON. Comparing a run against a saved baseline flags
+throughput drops and latency increases beyond --tolerance.
+
+Usage (from backend/ai-service):
+  python benchmark.py                                   # smoke + steady, every endpoint
+  python benchmark.py --profile burst --endpoint password_check --endpoint phishing_check
+  python benchmark.py --concurrency 32 --duration 20    # one custom profile
+  python benchmark.py -o run.json --save-baseline bench_baseline.json
+  python benchmark.py -o run.json --baseline bench_baseline.json --fail-on-regression
+  python benchmark.py --database-url postgresql://postgres@localhost/bench
+
+Absolute numbers depend on the machine; compare runs from the same host.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = {
+    "smoke": {"concurrency": 1, "duration_s": 2.0},
+    "steady": {"concurrency": 8, "duration_s": 10.0},
+    "burst": {"concurrency": 64, "duration_s": 5.0},
+}
+DEFAULT_PROFILES = ["smoke", "steady"]
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "Bench-Password-123"
+
+PHISHING_TEXTS = [
+    "Your account has been suspended, verify your password at http://secure-login.example-bank.co/verify",
+    "Lunch at noon tomorrow? The usual place works for me.",
+    "Invoice #{n} attached, please review before Friday's meeting.",
+    "URGENT: confirm your payment details within 24 hours or lose access http://paypa1-billing.example/confirm",
+]
+
+# -------------------------------
+# Stub models
+# -------------------------------
+class StubZeroShot:
+    """Stands in for the HF zero-shot pipeline: fixed verdicts, `delay_ms` of work per batch."""
+
+    def __init__(self, labels: list[str], delay_ms: float):
+        self.labels = labels
+        self.delay_s = delay_ms / 1000.0
+
+    def __call__(self, texts, candidate_labels=None, batch_size=None):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        texts = [texts] if isinstance(texts, str) else texts
+        labels = candidate_labels or self.labels
+        out = []
+        for text in texts:
+            suspicious = "http" in text and ("verify" in text or "confirm" in text)
+            ordered = labels if suspicious else list(reversed(labels))
+            out.append({"sequence": text, "labels": ordered, "scores": [0.9, 0.1][:len(ordered)]})
+        return out
+
+def install_stub_models(phishing_delay_ms: float):
+    import torch
+    from app.config import PHISHING_LABELS
+    from app.services import model_loader
+    from app.services.model_registry import registry
+
+    torch.manual_seed(0)
+    registry.register("infer", model_loader.LinearModel(), version="stub", source="benchmark")
+    registry.register("password", model_loader.PasswordModel(), version="stub", source="benchmark")
+    registry.register("phishing", StubZeroShot(PHISHING_LABELS, phishing_delay_ms), version="stub",
+                      source="benchmark", warmup=None)
+
+# -------------------------------
+# Endpoints
+# -------------------------------
+class Context:
+    """State shared by the request builders (bench user, auth header, input sizes)."""
+
+    def __init__(self, rng: random.Random, bulk_rows: int):
+        self.rng = rng
+        self.bulk_rows = bulk_rows
+        self.user_id = None
+        self.auth = {"Authorization": "Bearer benchmark"}
+        self.infer_size = 3
+
+def _infer(ctx: Context, i: int) -> dict:
+    return {"method": "POST", "url": "/api/infer/", "headers": ctx.auth,
+            "json": {"input": [ctx.rng.uniform(-1, 1) for _ in range(ctx.infer_size)]}}
+
+def _password_check(ctx: Context, i: int) -> dict:
+    # Distinct passwords so the result cache does not answer every request
+    return {"method": "POST", "url": "/api/password/check",
+            "json": {"password": f"Pw{i}-{ctx.rng.randrange(10**9)}", "user_id": ctx.user_id}}
+
+def _phishing_check(ctx: Context, i: int) -> dict:
+    text = PHISHING_TEXTS[i % len(PHISHING_TEXTS)].replace("{n}", str(i)) + f" ref {ctx.rng.randrange(10**9)}"
+    return {"method": "POST", "url": "/api/phishing/check", "json": {"text": text, "user_id": ctx.user_id}}
+
+def _auth_login(ctx: Context, i: int) -> dict:
+    return {"method": "POST", "url": "/api/auth/login", "json": {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}}
+
+def _events_list(ctx: Context, i: int) -> dict:
+    return {"method": "GET", "url": "/api/events/", "params": {"limit": 50, "user_id": ctx.user_id}}
+
+def _events_bulk(ctx: Context, i: int) -> dict:
+    lines = (json.dumps({"user_id": ctx.user_id, "type": f"bench{j % 5}", "detail": f"request {i}"})
+             for j in range(ctx.bulk_rows))
+    return {"method": "POST", "url": "/api/events/bulk", "content": "\n".join(lines).encode(),
+            "headers": {"Content-Type": "application/x-ndjson"}}
+
+def _stats(ctx: Context, i: int) -> dict:
+    return {"method": "GET", "url": "/api/stats/",
+            "params": {"source": "events", "bucket": "hour", "group_by": "label"}}
+
+ENDPOINTS = {
+    "infer": _infer,
+    "password_check": _password_check,
+    "phishing_check": _phishing_check,
+    "auth_login": _auth_login,
+    "events_list": _events_list,
+    "events_bulk": _events_bulk,
+    "stats": _stats,
+}
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(q / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+async def run_load(client, build, ctx: Context, concurrency: int, duration_s: float, max_requests: int | None) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    counter = iter(range(10**12))
+    deadline = time.perf_counter() + duration_s
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            if max_requests is not None and i >= max_requests:
+                return
+            started = time.perf_counter()
+            try:
+                response = await client.request(**build(ctx, i))
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    errors = sum(n for status, n in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status": statuses,
+        "elapsed_s": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+    }
+
+@contextlib.contextmanager
+def quiet(enabled: bool):
+    """Silence the app's startup and warning prints (use --verbose to see them)."""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+async def wait_ready(client, timeout_s: float = 60.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        response = await client.get("/readyz")
+        if response.status_code == 200:
+            return
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f"App not ready after {timeout_s:.0f}s: {response.text}")
+
+async def prepare(client, ctx: Context):
+    """Create the bench user and some events so the read endpoints have data."""
+    await client.post("/api/auth/register", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    from app.db import AsyncSessionLocal
+    from app.services import db_service
+    async with AsyncSessionLocal() as db:
+        ctx.user_id = (await db_service.get_user_by_email(db, BENCH_EMAIL)).id
+    from app.services.model_registry import registry
+    ctx.infer_size = registry.get("infer").in_features or ctx.infer_size
+    await client.request(**_events_bulk(ctx, -1))
+
+async def run(args, profiles: dict[str, dict]) -> list[dict]:
+    import httpx
+    from app.main import app
+
+    install_stub_models(args.phishing_delay_ms)
+    ctx = Context(random.Random(args.seed), args.bulk_rows)
+    results = []
+    with quiet(not args.verbose):
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout) as client:
+                await wait_ready(client)
+                await prepare(client, ctx)
+                for profile_name, profile in profiles.items():
+                    for name in args.endpoints:
+                        build = ENDPOINTS[name]
+                        for i in range(args.warmup):
+                            await client.request(**build(ctx, -2 - i))
+                        stats = await run_load(client, build, ctx, profile["concurrency"], profile["duration_s"],
+                                               profile.get("max_requests"))
+                        results.append({"profile": profile_name, "endpoint": name, "concurrency": profile["concurrency"], **stats})
+                        log(f"  {profile_name:<8} {name:<16} {stats['rps']:>9,.1f} req/s  "
+                            f"p50 {stats['latency_ms']['p50']:>7.1f}  p95 {stats['latency_ms']['p95']:>7.1f}  "
+                            f"p99 {stats['latency_ms']['p99']:>7.1f} ms  errors {stats['errors']}")
+        finally:
+            await app.router.shutdown()
+    return results
+
+# -------------------------------
+# Reporting
+# -------------------------------
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def print_table(results: list[dict]):
+    print(f"\n{'profile':<8} {'endpoint':<16} {'conc':>5} {'reqs':>8} {'err':>5} {'req/s':>10} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        lat = r["latency_ms"]
+        print(f"{r['profile']:<8} {r['endpoint']:<16} {r['concurrency']:>5} {r['requests']:>8} {r['errors']:>5} "
+              f"{r['rps']:>10,.1f} {lat['p50']:>8.1f} {lat['p95']:>8.1f} {lat['p99']:>8.1f}")
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Print deltas against the baseline; returns one message per regression."""
+    base = {(r["profile"], r["endpoint"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nvs baseline ({baseline['meta'].get('commit') or 'unknown commit'}, tolerance {tolerance:.0%})")
+    print(f"{'profile':<8} {'endpoint':<16} {'req/s':>9} {'p95':>9} {'p99':>9}")
+    for r in results:
+        b = base.get((r["profile"], r["endpoint"]))
+        if b is None:
+            print(f"{r['profile']:<8} {r['endpoint']:<16} {'(new)':>9}")
+            continue
+        changes = {
+            "req/s": (r["rps"] - b["rps"]) / b["rps"] if b["rps"] else 0.0,
+            "p95": (r["latency_ms"]["p95"] - b["latency_ms"]["p95"]) / b["latency_ms"]["p95"] if b["latency_ms"]["p95"] else 0.0,
+            "p99": (r["latency_ms"]["p99"] - b["latency_ms"]["p99"]) / b["latency_ms"]["p99"] if b["latency_ms"]["p99"] else 0.0,
+        }
+        flags = []
+        if changes["req/s"] < -tolerance:
+            flags.append(f"throughput {changes['req/s']:+.0%}")
+        for key in ("p95", "p99"):
+            if changes[key] > tolerance:
+                flags.append(f"{key} {changes[key]:+.0%}")
+        if r["errors"] > b["errors"]:
+            flags.append(f"errors {b['errors']} -> {r['errors']}")
+        mark = "  ⚠️ " + ", ".join(flags) if flags else ""
+        print(f"{r['profile']:<8} {r['endpoint']:<16} {changes['req/s']:>+9.0%} {changes['p95']:>+9.0%} {changes['p99']:>+9.0%}{mark}")
+        regressions.extend(f"{r['profile']}/{r['endpoint']}: {flag}" for flag in flags)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", action="append", choices=list(PROFILES), help=f"default: {' '.join(DEFAULT_PROFILES)}")
+    parser.add_argument("--profiles-file", help='JSON {"name": {"concurrency": N, "duration_s": S, "max_requests": M}}')
+    parser.add_argument("--concurrency", type=int, help="run one custom profile with this many concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint for --concurrency")
+    parser.add_argument("--endpoint", action="append", choices=list(ENDPOINTS), help="default: all")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests before each run")
+    parser.add_argument("--bulk-rows", type=int, default=100, help="events per /api/events/bulk request")
+    parser.add_argument("--phishing-delay-ms", type=float, default=5.0, help="simulated zero-shot time per batch")
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="compare against a results JSON")
+    parser.add_argument("--save-baseline", help="also write the results here")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative change before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if anything is flagged")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's own log output")
+    args = parser.parse_args()
+    args.endpoints = list(dict.fromkeys(args.endpoint or ENDPOINTS))
+
+    if args.concurrency:
+        profiles = {"custom": {"concurrency": args.concurrency, "duration_s": args.duration}}
+    elif args.profiles_file:
+        with open(args.profiles_file) as f:
+            profiles = json.load(f)
+    else:
+        profiles = {name: PROFILES[name] for name in args.profile or DEFAULT_PROFILES}
+
+    # Read up front: --output may overwrite the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    # Must be set before app.config is imported
+    tmpdir = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        tmpdir = tempfile.TemporaryDirectory(prefix="safechain-bench-", ignore_cleanup_errors=True)
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    os.environ.setdefault("MODEL_SHARING", "none")
+    os.environ.setdefault("STARTUP_MODE", "background")
+
+    log(f"ℹ️ Benchmarking {', '.join(args.endpoints)} with profiles {', '.join(profiles)}")
+    try:
+        results = asyncio.run(run(args, profiles))
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    from app.db import engine
+    report = {
+        "meta": {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": engine.dialect.name,
+            "phishing_delay_ms": args.phishing_delay_ms,
+            "profiles": profiles,
+        },
+        "results": results,
+    }
+    print_table(results)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Wrote '{path}'")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} regression(s)")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
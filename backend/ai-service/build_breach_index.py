@@ -0,0 +1,120 @@
+# backend/ai-service/build_breach_index.py
+"""
+Build the memory-mapped breached-password index used by /api/password/check.
+
+Inputs are streamed, so lists with hundreds of millions of entries build in
+bounded memory: keys are first partitioned into 256 temporary bucket files
+by their top byte, then each bucket is sorted and de-duplicated in memory
+and appended to the index in order.
+
+Accepted input lines:
+  SHA1HEX            e.g. the "Pwned Passwords" dump ...
+  SHA1HEX:COUNT      ... with or without the count suffix
+  password           with --plaintext (hashed with SHA-1 here)
+
+Usage (from backend/ai-service):
+  python build_breach_index.py pwned-passwords-sha1.txt -o breach_index.bin
+  python build_breach_index.py --plaintext rockyou.txt common.txt
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.config import BREACH_INDEX_PATH
+from app.services.breach_index import password_key, sha1_hex_key, write_index, BreachIndex
+
+BUCKETS = 256
+FLUSH_EVERY = 1_000_000
+
+def _keys_from_file(path: str, plaintext: bool):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            if plaintext:
+                yield password_key(line)
+            else:
+                digest = line.split(":", 1)[0].strip()
+                if len(digest) >= 16:
+                    try:
+                        yield sha1_hex_key(digest)
+                    except ValueError:
+                        continue
+
+def _partition(inputs: list[str], plaintext: bool, workdir: str) -> int:
+    """Append every key to bucket file <top byte>.u64; returns keys read."""
+    files = [open(os.path.join(workdir, f"{b:02x}.u64"), "ab") for b in range(BUCKETS)]
+    pending = []
+    total = 0
+    started = time.perf_counter()
+
+    def flush():
+        if not pending:
+            return
+        keys = np.fromiter(pending, dtype="<u8", count=len(pending))
+        top = (keys >> np.uint64(56)).astype(np.int64)
+        order = np.argsort(top, kind="stable")
+        keys, top = keys[order], top[order]
+        bounds = np.searchsorted(top, np.arange(BUCKETS + 1))
+        for b in range(BUCKETS):
+            if bounds[b] != bounds[b + 1]:
+                files[b].write(keys[bounds[b]:bounds[b + 1]].tobytes())
+        pending.clear()
+
+    try:
+        for path in inputs:
+            for key in _keys_from_file(path, plaintext):
+                pending.append(key)
+                total += 1
+                if len(pending) >= FLUSH_EVERY:
+                    flush()
+                    elapsed = time.perf_counter() - started
+                    print(f"  read {total:,} keys ({total / elapsed:,.0f}/s)")
+        flush()
+    finally:
+        for f in files:
+            f.close()
+    return total
+
+def _sorted_buckets(workdir: str):
+    for b in range(BUCKETS):
+        path = os.path.join(workdir, f"{b:02x}.u64")
+        keys = np.fromfile(path, dtype="<u8")
+        os.remove(path)
+        yield keys
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="hash or password list files")
+    parser.add_argument("-o", "--output", default=BREACH_INDEX_PATH, help="index file to write")
+    parser.add_argument("--plaintext", action="store_true", help="inputs are plaintext passwords, one per line")
+    parser.add_argument("--tmpdir", default=None, help="directory for temporary bucket files")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as workdir:
+        print("ℹ️ Partitioning input keys...")
+        read = _partition(args.inputs, args.plaintext, workdir)
+
+        # Count unique keys first so the header can be written up front
+        print("ℹ️ Sorting buckets...")
+        count = 0
+        for b in range(BUCKETS):
+            path = os.path.join(workdir, f"{b:02x}.u64")
+            keys = np.unique(np.fromfile(path, dtype="<u8"))
+            keys.tofile(path)
+            count += keys.size
+
+        write_index(args.output, _sorted_buckets(workdir), count)
+
+    index = BreachIndex(args.output)
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"✅ Wrote '{args.output}': {index.count:,} unique hashes from {read:,} lines "
+          f"({size_mb:.1f} MiB) in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
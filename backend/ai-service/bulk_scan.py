@@ -0,0 +1,223 @@
+# backend/ai-service/bulk_scan.py
+"""
+Run the phishing or password checks over whole exported corpora.
+
+Records are streamed from mbox / JSONL / CSV files (see
+app/services/bulk_sources.py), scored in chunks on a worker pool, and written
+in input order as NDJSON. A checkpoint file records the byte offset of the
+last record written, so an interrupted scan continues with --resume.
+Throughput is printed every --report-every seconds.
+
+Passwords are never written to the output unless --include-input is given;
+each result carries the record's id (if any) and its input offset instead.
+Records that cannot be read (e.g. invalid JSON) are not scored; they get an
+{"source", "offset", "error"} line instead.
+
+Usage (from backend/ai-service):
+  python bulk_scan.py phishing export.mbox -o phishing.ndjson
+  python bulk_scan.py password dump.csv --field password -o strengths.ndjson --workers 4
+  python bulk_scan.py phishing export.mbox -o phishing.ndjson --resume
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from app.services import model_loader, breach_index
+from app.services.bulk_sources import read_records, detect_format
+from app.services.numpy_backend import compile_numpy
+from app.services.password_analysis import password_stats
+
+# Model used by the scoring functions; set once per worker process (or once
+# for the whole thread pool) by _init_worker
+_MODEL = None
+
+def _load_model(kind: str, source: str | None):
+    if kind == "phishing":
+        return model_loader.load_phishing_model(source or model_loader.PHISHING_MODEL_NAME)
+    model = model_loader.load_password_model(source or model_loader.MODEL_PATH)
+    return compile_numpy(model) or model
+
+def _init_worker(kind: str, source: str | None):
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = _load_model(kind, source)
+
+def _score_phishing(texts: list[str]) -> list[dict]:
+    if _MODEL is None:
+        # Same fallback the HTTP route uses when the model is unavailable
+        from app.services.phishing_service import heuristic_verdict
+        return [{"result": heuristic_verdict(t), "tier": "heuristic"} for t in texts]
+    return [{"result": r, "tier": "zero_shot"} for r in model_loader.check_phishing_batch(_MODEL, texts)]
+
+def _score_password(passwords: list[str]) -> list[dict]:
+    stats = [password_stats(pw) for pw in passwords]
+    strengths = model_loader.predict_password_strength_batch(_MODEL, stats)
+    out = []
+    for pw, strength in zip(passwords, strengths):
+        breached = breach_index.is_breached(pw)
+        out.append({"strength": "weak" if breached else strength, "breached": breached})
+    return out
+
+def score_chunk(kind: str, values: list[str]) -> list[dict]:
+    return _score_phishing(values) if kind == "phishing" else _score_password(values)
+
+# -------------------------------
+# Checkpoints
+# -------------------------------
+def load_checkpoint(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"inputs": {}}
+
+def save_checkpoint(path: str, checkpoint: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp, path)
+
+# -------------------------------
+# Scan
+# -------------------------------
+def _value(kind: str, record: dict, field: str | None) -> str:
+    key = field or ("text" if kind == "phishing" else "password")
+    value = record.get(key)
+    return "" if value is None else str(value)
+
+def _chunks(records, size: int):
+    chunk = []
+    for item in records:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class Progress:
+    def __init__(self, every_s: float):
+        self.every_s = every_s
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.last_count = 0
+        self.count = 0
+        self.errors = 0
+
+    def add(self, n: int, label: str, offset: int, size: int):
+        self.count += n
+        now = time.perf_counter()
+        if now - self.last >= self.every_s:
+            recent = (self.count - self.last_count) / (now - self.last)
+            overall = self.count / (now - self.started)
+            done = f"{offset / size:.1%}" if size else "-"
+            print(f"  {label}: {self.count:,} records, {recent:,.0f}/s now, {overall:,.0f}/s overall, {done} of file",
+                  file=sys.stderr)
+            self.last, self.last_count = now, self.count
+
+def scan_file(path: str, args, pool, out, checkpoint: dict, progress: Progress):
+    state = checkpoint["inputs"].setdefault(path, {"offset": 0, "records": 0, "done": False})
+    if state["done"]:
+        print(f"ℹ️ Skipping '{path}' (already scanned)", file=sys.stderr)
+        return
+    size = os.path.getsize(path)
+    fmt = args.format or detect_format(path)
+    if state["offset"]:
+        print(f"ℹ️ Resuming '{path}' at byte {state['offset']:,} ({state['records']:,} records done)", file=sys.stderr)
+
+    # Bounded in-flight window: results are written in input order and memory
+    # holds at most workers * 2 chunks
+    window: deque = deque()
+    max_in_flight = max(1, args.workers) * 2
+
+    def drain_one():
+        chunk, future = window.popleft()
+        results = iter(future.result() if future is not None else ())
+        for offset, record in chunk:
+            if "_error" in record:
+                # Unreadable input: report it rather than scoring an empty value
+                line = {"source": path, "offset": offset, "error": record["_error"]}
+                progress.errors += 1
+            else:
+                line = {"source": path, "offset": offset, "id": record.get("id"), **next(results)}
+                if args.include_input:
+                    line["input"] = _value(args.kind, record, args.field)
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+        out.flush()
+        checkpoint["output_bytes"] = out.tell()
+        state["offset"] = chunk[-1][0]
+        state["records"] += len(chunk)
+        save_checkpoint(args.checkpoint, checkpoint)
+        progress.add(len(chunk), os.path.basename(path), state["offset"], size)
+
+    records = read_records(path, fmt, state["offset"])
+    for chunk in _chunks(records, args.batch_size):
+        values = [_value(args.kind, record, args.field) for _, record in chunk if "_error" not in record]
+        window.append((chunk, pool.submit(score_chunk, args.kind, values) if values else None))
+        if len(window) >= max_in_flight:
+            drain_one()
+    while window:
+        drain_one()
+
+    state["done"] = True
+    save_checkpoint(args.checkpoint, checkpoint)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["phishing", "password"])
+    parser.add_argument("inputs", nargs="+", help="mbox, JSONL or CSV files")
+    parser.add_argument("-o", "--output", required=True, help="NDJSON results file")
+    parser.add_argument("--format", choices=["mbox", "jsonl", "csv"], help="input format (default: from extension)")
+    parser.add_argument("--field", help="record field to check (default: text / password)")
+    parser.add_argument("--model", help="phishing model name or password model path")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread",
+                        help="process pools load one model copy per worker")
+    parser.add_argument("--batch-size", type=int, default=64, help="records per model call")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint and append to the output")
+    parser.add_argument("--include-input", action="store_true", help="copy the checked text/password into each result")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between throughput lines")
+    args = parser.parse_args()
+    args.checkpoint = args.checkpoint or args.output + ".checkpoint.json"
+
+    if args.resume:
+        checkpoint = load_checkpoint(args.checkpoint)
+        # Drop results written after the last checkpoint; they are scanned again
+        if os.path.exists(args.output) and "output_bytes" in checkpoint:
+            with open(args.output, "r+b") as f:
+                f.truncate(checkpoint["output_bytes"])
+    else:
+        checkpoint = {"inputs": {}}
+        if os.path.exists(args.output):
+            parser.error(f"'{args.output}' exists; pass --resume to continue it or choose another output")
+    checkpoint["kind"] = args.kind
+
+    if args.pool == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.kind, args.model))
+    else:
+        _init_worker(args.kind, args.model)
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="bulk-scan")
+
+    progress = Progress(args.report_every)
+    try:
+        with pool, open(args.output, "a", encoding="utf-8") as out:
+            for path in args.inputs:
+                scan_file(path, args, pool, out, checkpoint, progress)
+    except KeyboardInterrupt:
+        print(f"\n⚠️ Interrupted; rerun with --resume to continue from '{args.checkpoint}'", file=sys.stderr)
+        sys.exit(130)
+
+    elapsed = time.perf_counter() - progress.started
+    print(f"✅ Scanned {progress.count:,} records in {elapsed:.1f}s "
+          f"({progress.count / elapsed if elapsed else 0:,.0f} records/s) -> '{args.output}'", file=sys.stderr)
+    if progress.errors:
+        print(f"⚠️ {progress.errors:,} records could not be read; see the \"error\" lines in '{args.output}'",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
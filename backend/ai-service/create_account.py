@@ -0,0 +1,65 @@
+# backend/ai-service/create_account.py
+"""
+Create (or reset the password of) an account from the command line.
+
+/api/auth/register refuses the addresses in ADMIN_EMAILS and
+COMPLIANCE_EMAILS, because it cannot verify that the caller owns them. An
+operator provisions those accounts here instead. The password is read from
+the terminal, or from stdin when it is not a terminal.
+
+Usage (from backend/ai-service):
+  python create_account.py admin@example.com
+  python create_account.py admin@example.com --reset      # new password for an existing account
+  echo "$PASSWORD" | python create_account.py compliance@example.com
+"""
+import argparse
+import getpass
+import sys
+
+from sqlalchemy import func, select
+
+from app import models
+from app.db import SessionLocal, engine, Base
+from app.services.auth_tokens import roles_for
+from app.services.password_hasher import make_context
+
+def read_password() -> str:
+    if not sys.stdin.isatty():
+        return sys.stdin.readline().rstrip("\n")
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Repeat password: "):
+        sys.exit("❌ Passwords do not match")
+    return password
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("email")
+    parser.add_argument("--reset", action="store_true", help="set a new password if the account exists")
+    args = parser.parse_args()
+
+    password = read_password()
+    if not password:
+        sys.exit("❌ Empty password")
+    hashed = make_context().hash(password)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        # Case-insensitive: roles are matched on the lowercased address
+        user = db.execute(select(models.User).where(func.lower(models.User.email) == args.email.lower())).scalars().first()
+        if user is not None and not args.reset:
+            sys.exit(f"❌ '{user.email}' already exists; pass --reset to set a new password")
+        created = user is None
+        if created:
+            user = models.User(email=args.email, hashed_password=hashed)
+            db.add(user)
+        else:
+            user.hashed_password = hashed
+        db.commit()
+    finally:
+        db.close()
+    roles = roles_for(args.email)
+    print(f"✅ {'Created' if created else 'Updated'} '{args.email}' (roles: {', '.join(roles) or 'none'})")
+
+if __name__ == "__main__":
+    main()
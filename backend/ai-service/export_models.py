@@ -0,0 +1,89 @@
+# backend/ai-service/export_models.py
+"""
+Export optimized CPU artifacts for the password model and the /api/infer model.
+
+For each source model this writes, next to it:
+  <name>.ts.pt       frozen + optimize_for_inference TorchScript (fp32)
+  <name>.int8.ts.pt  same, after dynamic int8 quantization of nn.Linear layers
+and prints an accuracy-vs-latency report against the eager fp32 model.
+The loaders in app/services/model_loader.py pick these up automatically.
+
+Usage (from backend/ai-service):
+  python export_models.py --password-model password_model.pt --infer-model model.pt
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+
+import torch
+
+from app.config import MODEL_PATH
+from app.services import model_loader
+from app.services.model_export import export_artifacts, compare_models
+
+def _sample_passwords(n: int) -> list[str]:
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*()-_"
+    rng = random.Random(0)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 32))) for _ in range(n)]
+
+def export_one(name: str, model, path: str, in_features: int, inputs: torch.Tensor, tolerance: float) -> dict:
+    written = export_artifacts(model, path, in_features)
+    candidates = {kind: torch.jit.load(p, map_location="cpu") for kind, p in written.items()}
+    report = compare_models(model, candidates, inputs, tolerance)
+
+    print(f"\n{name}: {path}")
+    print(f"  {'variant':<12}{'max_err':>12}{'agree':>8}{'1-row ms':>11}{'batch ms':>11}  ok")
+    for variant, row in report.items():
+        agree = row.get("argmax_agreement")
+        print(
+            f"  {variant:<12}{row['max_abs_error']:>12.2e}"
+            f"{(f'{agree:.3f}' if agree is not None else '-'):>8}"
+            f"{row['latency_ms_single']:>11.4f}{row['latency_ms_batch']:>11.4f}"
+            f"  {'✅' if row['within_tolerance'] else '❌'}"
+        )
+    return {"path": path, "artifacts": written, "report": report}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--password-model", default=model_loader.MODEL_PATH, help="password model file (state_dict or module)")
+    parser.add_argument("--infer-model", default=MODEL_PATH, help="/api/infer model file (SimpleModel state_dict)")
+    parser.add_argument("--samples", type=int, default=1024, help="rows used for the comparison")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="max abs error allowed vs eager fp32")
+    parser.add_argument("--report", default="export_report.json", help="where to write the JSON report")
+    args = parser.parse_args()
+
+    results = {}
+
+    # Password model: real feature vectors from random passwords
+    password_model = model_loader.PasswordModel(input_size=model_loader.MODEL_INPUT_SIZE)
+    obj = torch.load(args.password_model, map_location="cpu", weights_only=True) if os.path.exists(args.password_model) else None
+    if isinstance(obj, dict):
+        password_model.load_state_dict(obj)
+    else:
+        print(f"ℹ️ No password model at '{args.password_model}', exporting untrained PasswordModel")
+    inputs = torch.cat([model_loader.extract_password_features(p) for p in _sample_passwords(args.samples)])
+    results["password"] = export_one("password", password_model, args.password_model, model_loader.MODEL_INPUT_SIZE, inputs, args.tolerance)
+
+    # /api/infer model
+    if os.path.exists(args.infer_model):
+        state = torch.load(args.infer_model, map_location="cpu", weights_only=True)
+        out_features, in_features = state["linear.weight"].shape
+        infer_model = model_loader.LinearModel(input_size=in_features, output_size=out_features)
+        infer_model.load_state_dict(state)
+        inputs = torch.randn(args.samples, in_features, generator=torch.Generator().manual_seed(0))
+        results["infer"] = export_one("infer", infer_model, args.infer_model, in_features, inputs, args.tolerance)
+    else:
+        print(f"ℹ️ No inference model at '{args.infer_model}', skipping")
+
+    with open(args.report, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Report written to {args.report}")
+
+    failed = [n for n, r in results.items() for v in r["report"].values() if not v["within_tolerance"]]
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# backend/ai-service/export_shared_weights.py
+"""
+Export model weights for MODEL_SHARING=mmap.
+
+Writes SHARED_WEIGHTS_DIR/<name>.pt (state_dict in the zip format that
+torch.load(mmap=True) maps instead of reading) and <name>.json metadata for
+the password, /api/infer and phishing models. For the phishing model the HF
+config and tokenizer go to SHARED_WEIGHTS_DIR/phishing/.
+
+Usage (from backend/ai-service):
+  python export_shared_weights.py --password-model password_model.pt --infer-model model.pt
+  python export_shared_weights.py --phishing-model facebook/bart-large-mnli --skip-password --skip-infer
+"""
+import argparse
+
+import torch
+import torch.nn as nn
+
+from app.config import MODEL_PATH, SHARED_WEIGHTS_DIR
+from app.services import model_loader, shared_weights
+
+def _linear_meta(model: nn.Module) -> dict:
+    layers = [m for m in model.modules() if isinstance(m, nn.Linear)]
+    meta = {"class": type(model).__name__, "in_features": layers[0].in_features, "out_features": layers[-1].out_features}
+    if len(layers) > 1:
+        meta["hidden_size"] = layers[0].out_features
+    return meta
+
+def export_module(name: str, model, directory: str):
+    if not isinstance(model, nn.Module) or isinstance(model, torch.jit.ScriptModule):
+        print(f"⚠️ Skipping '{name}': need an eager nn.Module, got {type(model).__name__}")
+        return
+    path = shared_weights.save_module(name, model, _linear_meta(model), directory)
+    print(f"✅ Wrote '{path}'")
+
+def export_phishing(model_name: str, directory: str):
+    pipe = model_loader.load_phishing_model(model_name)
+    if pipe is None:
+        print("⚠️ Skipping 'phishing': model could not be loaded")
+        return
+    assets = shared_weights.asset_dir("phishing", directory)
+    pipe.model.config.save_pretrained(assets)
+    pipe.tokenizer.save_pretrained(assets)
+    path = shared_weights.save_module("phishing", pipe.model, {"class": type(pipe.model).__name__, "source": model_name}, directory)
+    print(f"✅ Wrote '{path}' and config/tokenizer to '{assets}'")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--password-model", default=model_loader.MODEL_PATH)
+    parser.add_argument("--infer-model", default=MODEL_PATH)
+    parser.add_argument("--phishing-model", default=model_loader.PHISHING_MODEL_NAME)
+    parser.add_argument("--output-dir", default=SHARED_WEIGHTS_DIR)
+    parser.add_argument("--skip-password", action="store_true")
+    parser.add_argument("--skip-infer", action="store_true")
+    parser.add_argument("--skip-phishing", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_password:
+        export_module("password", model_loader.load_password_model(args.password_model), args.output_dir)
+    if not args.skip_infer:
+        model = model_loader.load_infer_model(args.infer_model)
+        if model is not None:
+            export_module("infer", model, args.output_dir)
+    if not args.skip_phishing:
+        export_phishing(args.phishing_model, args.output_dir)
+
+if __name__ == "__main__":
+    main()
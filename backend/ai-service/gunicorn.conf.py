@@ -0,0 +1,25 @@
+# backend/ai-service/gunicorn.conf.py
+"""
+Pre-fork serving: the master imports the app and loads every model once, then
+forks the uvicorn workers, which share the model weights copy-on-write.
+
+Usage (from backend/ai-service):
+  MODEL_SHARING=prefork gunicorn -c gunicorn.conf.py app.main:app
+"""
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5005")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Import the app in the master so the workers inherit it
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+
+def on_starting(server):
+    from app.config import MODEL_PATH, MODEL_SHARING
+    if MODEL_SHARING != "prefork":
+        server.log.info("MODEL_SHARING=%s: workers load their own models", MODEL_SHARING)
+        return
+    from app.services import model_loader, shared_weights
+    model_loader.load_all_blocking(MODEL_PATH)
+    shared_weights.freeze_heap()
@@ -0,0 +1,170 @@
+# backend/ai-service/measure_worker_memory.py
+"""
+Report RSS and PSS for a server process and all of its workers (Linux).
+
+RSS counts every page a process maps, so shared weights are counted once per
+worker. PSS divides each shared page between the processes mapping it, so
+the PSS total is the real footprint. When sharing works, the PSS total stays
+close to one model copy even as workers are added.
+
+Usage (from backend/ai-service):
+  # measure a running server by its master pid
+  python measure_worker_memory.py --pid 12345 --save before.json
+
+  # launch, wait for /readyz, measure, stop
+  MODEL_SHARING=none python measure_worker_memory.py --label none --save before.json \\
+      --launch "uvicorn app.main:app --workers 4 --port 5005"
+  MODEL_SHARING=prefork python measure_worker_memory.py --label prefork --save after.json \\
+      --launch "gunicorn -c gunicorn.conf.py app.main:app"
+
+  # compare two saved runs
+  python measure_worker_memory.py --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import shlex
+import signal
+import subprocess
+import time
+import urllib.request
+
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap")
+
+def read_memory(pid: int) -> dict[str, int]:
+    """Memory counters in KiB from smaps_rollup (or summed smaps on older kernels)."""
+    totals = dict.fromkeys(FIELDS, 0)
+    path = f"/proc/{pid}/smaps_rollup"
+    if not os.path.exists(path):
+        path = f"/proc/{pid}/smaps"
+    with open(path) as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in totals:
+                totals[key] += int(rest.split()[0])
+    return totals
+
+def children(pid: int) -> list[int]:
+    found = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                found.extend(int(c) for c in f.read().split())
+    except FileNotFoundError:
+        pass
+    return found
+
+def process_tree(pid: int) -> list[int]:
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children(current))
+    return tree
+
+def cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except FileNotFoundError:
+        return ""
+
+def measure(pid: int, label: str) -> dict:
+    processes = []
+    for p in process_tree(pid):
+        try:
+            processes.append({"pid": p, "role": "master" if p == pid else "worker", "cmd": cmdline(p)[:80], **read_memory(p)})
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+    workers = [p for p in processes if p["role"] == "worker"]
+    return {
+        "label": label,
+        "at": time.time(),
+        "processes": processes,
+        "total_rss_kib": sum(p["Rss"] for p in processes),
+        "total_pss_kib": sum(p["Pss"] for p in processes),
+        "workers": len(workers),
+        "avg_worker_rss_kib": sum(p["Rss"] for p in workers) / len(workers) if workers else 0,
+        "avg_worker_pss_kib": sum(p["Pss"] for p in workers) / len(workers) if workers else 0,
+    }
+
+def _mib(kib: float) -> str:
+    return f"{kib / 1024:,.1f}"
+
+def print_report(result: dict):
+    print(f"\n{result['label']}")
+    print(f"  {'pid':>8}  {'role':<7}{'RSS MiB':>10}{'PSS MiB':>10}{'shared':>10}{'private':>10}")
+    for p in result["processes"]:
+        shared = p["Shared_Clean"] + p["Shared_Dirty"]
+        private = p["Private_Clean"] + p["Private_Dirty"]
+        print(f"  {p['pid']:>8}  {p['role']:<7}{_mib(p['Rss']):>10}{_mib(p['Pss']):>10}{_mib(shared):>10}{_mib(private):>10}")
+    print(f"  total RSS {_mib(result['total_rss_kib'])} MiB, total PSS {_mib(result['total_pss_kib'])} MiB, "
+          f"{result['workers']} worker(s), avg worker PSS {_mib(result['avg_worker_pss_kib'])} MiB")
+
+def compare(before: dict, after: dict):
+    print(f"\n{'':<22}{before['label']:>14}{after['label']:>14}{'change':>10}")
+    for key, name in (("total_rss_kib", "total RSS MiB"), ("total_pss_kib", "total PSS MiB"),
+                      ("avg_worker_rss_kib", "avg worker RSS MiB"), ("avg_worker_pss_kib", "avg worker PSS MiB")):
+        b, a = before[key], after[key]
+        change = f"{(a - b) / b:+.0%}" if b else "n/a"
+        print(f"  {name:<20}{_mib(b):>14}{_mib(a):>14}{change:>10}")
+
+def wait_ready(url: str, timeout_s: float):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return
+        except Exception:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{url} did not report ready within {timeout_s:.0f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--pid", type=int, help="master (or single) server process id")
+    target.add_argument("--launch", help="server command to start, measure and stop")
+    target.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two saved results")
+    parser.add_argument("--label", default=os.environ.get("MODEL_SHARING", "run"))
+    parser.add_argument("--save", help="write the result as JSON")
+    parser.add_argument("--ready-url", default="http://127.0.0.1:5005/readyz")
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds to wait after ready before measuring")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        print_report(before)
+        print_report(after)
+        compare(before, after)
+        return
+
+    server = None
+    pid = args.pid
+    if args.launch:
+        server = subprocess.Popen(shlex.split(args.launch), start_new_session=True)
+        pid = server.pid
+        print(f"ℹ️ Started '{args.launch}' (pid {pid}), waiting for {args.ready_url}...")
+    try:
+        if server is not None:
+            wait_ready(args.ready_url, args.ready_timeout)
+            time.sleep(args.settle)
+        result = measure(pid, args.label)
+    finally:
+        if server is not None:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait(timeout=30)
+
+    print_report(result)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"✅ Saved '{args.save}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# backend/ai-service/partition_maintenance.py
+"""
+Run event-table partition maintenance once: create upcoming partitions and
+compact + drop (or archive) expired ones. The service does this on its own
+every EVENT_PARTITION_MAINTENANCE_S seconds; this script is for cron jobs,
+one-off retention changes and checking what a setting would do.
+
+Usage (from backend/ai-service):
+  python partition_maintenance.py
+  python partition_maintenance.py --retention-days 180 --mode archive
+  python partition_maintenance.py --today 2025-01-01   # act as if it were that day
+"""
+import argparse
+import json
+from datetime import date
+
+from app import models  # noqa: F401  (registers the tables)
+from app.db import engine, Base
+from app.services.partitions import run_maintenance, RETENTION_MODES
+from app.config import (
+    EVENT_PARTITION_INTERVAL, EVENT_PARTITION_PREMAKE, EVENT_RETENTION_DAYS, EVENT_RETENTION_MODE,
+)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", choices=["month", "day"], default=EVENT_PARTITION_INTERVAL)
+    parser.add_argument("--premake", type=int, default=EVENT_PARTITION_PREMAKE)
+    parser.add_argument("--retention-days", type=int, default=EVENT_RETENTION_DAYS, help="0 keeps everything")
+    parser.add_argument("--mode", choices=RETENTION_MODES, default=EVENT_RETENTION_MODE)
+    parser.add_argument("--today", type=date.fromisoformat, help="reference day (default: today, UTC)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    report = run_maintenance(engine, today=args.today, interval=args.interval, premake=args.premake,
+                             retention_days=args.retention_days, mode=args.mode)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
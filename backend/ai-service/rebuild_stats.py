@@ -0,0 +1,84 @@
+# backend/ai-service/rebuild_stats.py
+"""
+Recount stat_rollups from the raw event tables.
+
+The write path keeps the rollups current. Run this once after upgrading, so
+rows written before rollups existed are counted too, or after editing event
+tables by hand. Partitions already dropped by retention are restored from
+their event_summaries rows; those counts land in the first hour of their day.
+
+Each source is rebuilt in one transaction. On Postgres, stat_rollups is
+locked in EXCLUSIVE mode for the duration. Concurrent writers wait rather
+than being counted twice or lost.
+
+Usage (from backend/ai-service):
+  python rebuild_stats.py                     # every source
+  python rebuild_stats.py password_events     # one source
+"""
+import argparse
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select, text
+
+from app import models
+from app.db import SessionLocal, engine, Base
+from app.services import rollups
+
+_TABLES = {
+    "events": models.Event,
+    "password_events": models.PasswordEvent,
+    "phishing_attempts": models.PhishingAttempt,
+    "audit_logs": models.AuditLog,
+}
+
+def rebuild(source: str) -> int:
+    model = _TABLES[source]
+    label = getattr(model, rollups.LABEL_COLUMNS[source])
+    user = getattr(model, "user_id", None)
+    columns = [model.created_at, label] + ([user] if user is not None else [])
+    db = SessionLocal()
+    try:
+        if db.bind.dialect.name == "postgresql":
+            db.execute(text("LOCK TABLE stat_rollups IN EXCLUSIVE MODE"))
+        counts: Counter = Counter()
+        # Streamed so memory holds the rollup keys, not the rows
+        for row in db.execute(select(*columns).execution_options(yield_per=10000)):
+            created_at, value = row[0], row[1]
+            user_id = row[2] if user is not None else 0
+            counts[(source, rollups.hour_bucket(created_at), user_id or 0, value or "")] += 1
+        summaries = select(models.EventSummary.day, models.EventSummary.user_id,
+                           models.EventSummary.label, models.EventSummary.count).where(models.EventSummary.source == source)
+        for day, user_id, value, n in db.execute(summaries):
+            bucket = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+            counts[(source, bucket, user_id or 0, value or "")] += n
+
+        db.execute(delete(models.StatRollup).where(models.StatRollup.source == source))
+        keys = sorted(counts)
+        for i in range(0, len(keys), 1000):
+            db.execute(rollups.upsert_counts(db.bind.dialect.name, Counter({k: counts[k] for k in keys[i:i + 1000]})))
+        db.commit()
+        return len(counts)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", help=f"any of {', '.join(_TABLES)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.sources) - set(_TABLES)
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(sorted(unknown))}")
+
+    Base.metadata.create_all(bind=engine)
+    for source in args.sources or _TABLES:
+        started = time.perf_counter()
+        n = rebuild(source)
+        print(f"✅ Rebuilt {n:,} rollup rows for '{source}' in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# backend/ai-service/tests/conftest.py
+import os
+import sys
+
+# Run from anywhere: make the service's `app` package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
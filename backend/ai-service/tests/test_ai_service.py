@@ -0,0 +1,26 @@
+# backend/ai-service/tests/test_ai_service.py
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from app.services.ai_service import to_matrix
+
+def test_to_matrix_returns_contiguous_float32():
+    matrix = to_matrix([[1, 2, 3], [4, 5, 6]], 3)
+    assert matrix.dtype == np.float32 and matrix.shape == (2, 3)
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert to_matrix([], 3).shape == (0, 3)
+
+@pytest.mark.parametrize("rows, message", [
+    ([[1.0, 2.0, 3.0], [1.0, 2.0]], "Rows have different lengths: row 1 has 2 values, expected 3"),
+    ([[1.0, 2.0], [1.0, 2.0, 3.0]], "Rows have different lengths: row 0 has 2 values, expected 3"),
+    ([[1.0, 2.0, 3.0], 4.0], "Rows have different lengths: row 1 has 1 values, expected 3"),
+    ([[1.0, 2.0], [1.0, 2.0]], "Wrong input size: given 2, expected 3"),
+    ([1.0, 2.0, 3.0], "Expected a 2-D matrix, got 1 dimension(s)"),
+    ([["a", "b", "c"]], "Rows must contain only numbers"),
+])
+def test_to_matrix_errors(rows, message):
+    with pytest.raises(ValueError) as e:
+        to_matrix(rows, 3)
+    assert str(e.value) == message
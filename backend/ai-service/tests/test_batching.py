@@ -0,0 +1,165 @@
+# backend/ai-service/tests/test_batching.py
+import asyncio
+
+import pytest
+
+from app.services.batching import MicroBatcher
+from app.services.overload import Overloaded
+
+class _Forward:
+    """Doubles each row's first value; records the rows of every call."""
+
+    def __init__(self):
+        self.calls: list[list] = []
+
+    def __call__(self, rows):
+        self.calls.append(list(rows))
+        return [row[0] * 2 for row in rows]
+
+async def _inline(fn, rows):
+    return fn(rows)
+
+def _gated_runner(gate: asyncio.Event, started: asyncio.Event):
+    """Runner that holds each forward until `gate` is set."""
+
+    async def run(fn, rows):
+        started.set()
+        await gate.wait()
+        return fn(rows)
+
+    return run
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def test_concurrent_submits_share_one_forward():
+    async def main():
+        forward = _Forward()
+        batcher = MicroBatcher(forward, max_batch_size=64, max_wait_ms=20, runner=_inline)
+        results = await asyncio.gather(*(batcher.submit([float(i), 0.0]) for i in range(10)))
+        await batcher.stop()
+        return forward, results, batcher.snapshot()
+
+    forward, results, snapshot = asyncio.run(main())
+    assert results == [float(i) * 2 for i in range(10)]
+    assert [len(c) for c in forward.calls] == [10]
+    assert snapshot["batches"] == 1 and snapshot["requests"] == 10
+
+def test_default_runner_uses_the_executor():
+    async def main():
+        batcher = MicroBatcher(_Forward(), max_wait_ms=5)
+        result = await batcher.submit([1.5])
+        await batcher.stop()
+        return result
+
+    assert asyncio.run(main()) == 3.0
+
+def test_max_batch_size_splits_batches():
+    async def main():
+        forward = _Forward()
+        batcher = MicroBatcher(forward, max_batch_size=3, max_wait_ms=20, runner=_inline)
+        await asyncio.gather(*(batcher.submit([float(i)]) for i in range(7)))
+        await batcher.stop()
+        return forward
+
+    assert [len(c) for c in asyncio.run(main()).calls] == [3, 3, 1]
+
+def test_max_wait_ms_bounds_how_long_a_batch_waits():
+    async def submit_apart(max_wait_ms: float) -> list[int]:
+        forward = _Forward()
+        batcher = MicroBatcher(forward, max_batch_size=64, max_wait_ms=max_wait_ms, runner=_inline)
+        first = asyncio.ensure_future(batcher.submit([1.0]))
+        await asyncio.sleep(0.05)
+        await asyncio.gather(first, batcher.submit([2.0]))
+        await batcher.stop()
+        return [len(c) for c in forward.calls]
+
+    # A late row joins a batch still within its wait window...
+    assert asyncio.run(submit_apart(500)) == [2]
+    # ...but not one whose window has closed
+    assert asyncio.run(submit_apart(1)) == [1, 1]
+
+def test_rows_with_different_group_keys_are_never_stacked():
+    async def main():
+        forward = _Forward()
+        batcher = MicroBatcher(forward, max_wait_ms=20, runner=_inline)
+        results = await asyncio.gather(batcher.submit([1.0]), batcher.submit([2.0, 0.0]), batcher.submit([3.0]))
+        await batcher.stop()
+        return forward, results
+
+    forward, results = asyncio.run(main())
+    assert results == [2.0, 4.0, 6.0]
+    assert sorted(sorted(len(r) for r in c) for c in forward.calls) == [[1, 1], [2]]
+
+def test_full_queue_raises_overloaded():
+    async def main():
+        gate, started = asyncio.Event(), asyncio.Event()
+        batcher = MicroBatcher(_Forward(), max_batch_size=1, max_wait_ms=0, max_queue=2,
+                               runner=_gated_runner(gate, started))
+        # The first row is in flight; the next two fill the queue
+        pending = [asyncio.ensure_future(batcher.submit([0.0]))]
+        await started.wait()
+        pending += [asyncio.ensure_future(batcher.submit([float(i)])) for i in (1, 2)]
+        await _settle()
+        assert batcher.queue_depth() == 2
+        with pytest.raises(Overloaded):
+            await batcher.submit([9.0])
+        gate.set()
+        results = await asyncio.gather(*pending)
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(main())
+    assert results == [0.0, 2.0, 4.0]
+
+def test_stop_fails_in_flight_and_queued_rows():
+    async def main():
+        gate, started = asyncio.Event(), asyncio.Event()
+        batcher = MicroBatcher(_Forward(), max_batch_size=1, max_wait_ms=0, runner=_gated_runner(gate, started))
+        pending = [asyncio.ensure_future(batcher.submit([float(i)])) for i in range(3)]
+        await started.wait()
+        await _settle()
+        await batcher.stop()
+        return await asyncio.gather(*pending, return_exceptions=True)
+
+    results = asyncio.run(asyncio.wait_for(main(), 5))
+    assert len(results) == 3
+    assert all(isinstance(r, Overloaded) for r in results)
+
+def test_worker_crash_fails_every_pending_row_and_restarts():
+    class Boom(Exception):
+        pass
+
+    def group_key(row):
+        # Outside the per-group error handling: kills the worker
+        if row[0] < 0:
+            raise Boom("bad row")
+        return len(row)
+
+    async def main():
+        batcher = MicroBatcher(_Forward(), max_wait_ms=20, runner=_inline, group_key=group_key)
+        crashed = await asyncio.gather(batcher.submit([1.0]), batcher.submit([-1.0]), return_exceptions=True)
+        # The next submit starts a new worker on the same queue
+        after = await asyncio.wait_for(batcher.submit([4.0]), 5)
+        await batcher.stop()
+        return crashed, after
+
+    crashed, after = asyncio.run(asyncio.wait_for(main(), 5))
+    assert all(isinstance(r, Boom) for r in crashed)
+    assert after == 8.0
+
+def test_result_count_mismatch_fails_the_group():
+    async def main():
+        batcher = MicroBatcher(lambda rows: [0.0], max_wait_ms=20, runner=_inline)
+        results = await asyncio.gather(batcher.submit([1.0]), batcher.submit([2.0]), return_exceptions=True)
+        # The batcher keeps serving after a failed group
+        batcher.forward = _Forward()
+        after = await batcher.submit([3.0])
+        await batcher.stop()
+        return results, after, batcher.snapshot()
+
+    results, after, snapshot = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) and "2 rows" in str(r) for r in results)
+    assert after == 6.0
+    assert snapshot["errors"] == 2
@@ -0,0 +1,182 @@
+# backend/ai-service/tests/test_bulk_ingest.py
+import asyncio
+import json
+from datetime import timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+from app.schemas.event import EventBulkItem
+from app.services import bulk_ingest
+
+KNOWN_USERS = {1, 2}
+
+class FakeSession:
+    """The slice of AsyncSession that ingest() uses: commit, rollback and savepoints."""
+
+    def __init__(self):
+        self.pending: list[dict] = []
+        self.committed: list[dict] = []
+        self.commits = 0
+
+    async def commit(self):
+        self.committed += self.pending
+        self.pending = []
+        self.commits += 1
+
+    async def rollback(self):
+        self.pending = []
+
+    def begin_nested(self):
+        return _Savepoint(self)
+
+class _Savepoint:
+    def __init__(self, db: FakeSession):
+        self.db = db
+
+    async def __aenter__(self):
+        self.mark = len(self.db.pending)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            del self.db.pending[self.mark:]
+        return False
+
+async def fake_insert(db: FakeSession, rows: list[dict]):
+    """Multi-row INSERT that fails as a whole if any row has detail == 'reject'."""
+    if any(row["detail"] == "reject" for row in rows):
+        raise IntegrityError("INSERT INTO events ...", {}, Exception("check constraint violated"))
+    db.pending += rows
+
+@pytest.fixture(autouse=True)
+def known_users(monkeypatch):
+    async def existing_user_ids(db, ids):
+        return set(ids) & KNOWN_USERS
+    monkeypatch.setattr(bulk_ingest.db_service, "existing_user_ids", existing_user_ids)
+
+def _client(db: FakeSession, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/bulk")
+    async def bulk(request: Request):
+        result = await bulk_ingest.ingest(db, request, EventBulkItem, fake_insert, check_users=True, **options)
+        return bulk_ingest.respond(result)
+
+    return TestClient(app)
+
+def _event(i: int, **fields) -> dict:
+    return {"user_id": 1, "type": "login", "detail": f"e{i}", **fields}
+
+def _ndjson(lines) -> bytes:
+    return b"".join((line if isinstance(line, bytes) else json.dumps(line).encode()) + b"\n" for line in lines)
+
+# -------------------------------
+# Body formats
+# -------------------------------
+def test_json_array_and_ndjson_insert_the_same_rows():
+    records = [_event(i) for i in range(5)]
+    for body in (json.dumps(records).encode(), b"  \n" + _ndjson(records)):
+        db = FakeSession()
+        response = _client(db, chunk_size=2).post("/bulk", content=body)
+        assert response.status_code == 200
+        assert response.json() == {"received": 5, "inserted": 5, "failed": 0, "truncated": False, "errors": []}
+        assert [row["detail"] for row in db.committed] == [f"e{i}" for i in range(5)]
+        # One commit per chunk of 2
+        assert db.commits == 3
+
+def test_ndjson_streamed_in_pieces_splits_lines_across_chunks():
+    body = _ndjson(_event(i) for i in range(4))
+    pieces = [body[i:i + 7] for i in range(0, len(body), 7)]
+    db = FakeSession()
+    response = _client(db).post("/bulk", content=iter(pieces))
+    assert response.json()["inserted"] == 4
+    assert [row["detail"] for row in db.committed] == ["e0", "e1", "e2", "e3"]
+
+def test_ndjson_last_line_without_newline():
+    body = _ndjson([_event(0)]) + json.dumps(_event(1)).encode()
+    db = FakeSession()
+    assert _client(db).post("/bulk", content=body).json()["inserted"] == 2
+
+def test_invalid_json_array_is_a_400_and_empty_array_is_fine():
+    response = _client(FakeSession()).post("/bulk", content=b'[{"user_id": 1,')
+    assert response.status_code == 400
+    response = _client(FakeSession()).post("/bulk", content=b'[]')
+    assert response.json()["received"] == 0
+
+def test_created_at_defaults_to_now_and_naive_is_utc():
+    db = FakeSession()
+    _client(db).post("/bulk", json=[_event(0), _event(1, created_at="2024-05-01T12:00:00")])
+    first, second = db.committed
+    assert first["created_at"].tzinfo is not None
+    assert second["created_at"].tzinfo == timezone.utc
+    assert second["created_at"].hour == 12
+
+# -------------------------------
+# Per-row errors
+# -------------------------------
+def test_bad_rows_are_reported_by_index_and_the_rest_inserted():
+    lines = [_event(0), b"{not json", _event(2, user_id=99), {"user_id": "x", "type": "login"}, _event(4), [1, 2]]
+    db = FakeSession()
+    result = _client(db, chunk_size=2).post("/bulk", content=_ndjson(lines)).json()
+    assert (result["received"], result["inserted"], result["failed"]) == (6, 2, 4)
+    errors = {e["index"]: e["error"] for e in result["errors"]}
+    assert sorted(errors) == [1, 2, 3, 5]
+    assert errors[1].startswith("invalid JSON")
+    assert errors[2] == "user_id: unknown user 99"
+    assert errors[3].startswith("user_id:")
+    assert [row["detail"] for row in db.committed] == ["e0", "e4"]
+
+def test_constraint_violation_retries_the_chunk_row_by_row():
+    records = [_event(0), _event(1, detail="reject"), _event(2), _event(3)]
+    db = FakeSession()
+    result = _client(db, chunk_size=3).post("/bulk", json=records).json()
+    assert (result["inserted"], result["failed"]) == (3, 1)
+    assert result["errors"][0]["index"] == 1
+    assert "rejected by database" in result["errors"][0]["error"]
+    # The good rows of the failed chunk were kept, not the whole chunk dropped
+    assert [row["detail"] for row in db.committed] == ["e0", "e2", "e3"]
+
+def test_error_list_is_capped_but_failures_are_counted():
+    records = [_event(i, user_id=99) for i in range(10)]
+    result = _client(FakeSession(), max_errors=3).post("/bulk", json=records).json()
+    assert result["failed"] == 10
+    assert len(result["errors"]) == 3
+
+# -------------------------------
+# Limits
+# -------------------------------
+def test_max_rows_truncates_with_413_and_keeps_written_rows():
+    db = FakeSession()
+    response = _client(db, chunk_size=2, max_rows=3).post("/bulk", content=_ndjson(_event(i) for i in range(5)))
+    assert response.status_code == 413
+    assert response.json()["truncated"] is True
+    assert response.json()["inserted"] == 3
+    assert len(db.committed) == 3
+
+def _request(body: bytes, pieces: int = 4, headers: dict | None = None) -> Request:
+    size = max(1, len(body) // pieces)
+    chunks = [body[i:i + size] for i in range(0, len(body), size)] + [b""]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "POST", "headers": raw}, receive)
+
+async def _collect(request: Request, max_bytes: int) -> list:
+    return [item async for item in bulk_ingest.read_records(request, max_bytes=max_bytes)]
+
+def test_body_over_max_bytes_stops_reading():
+    body = _ndjson(_event(i) for i in range(20))
+    with pytest.raises(bulk_ingest._TooLarge):
+        asyncio.run(_collect(_request(body), max_bytes=len(body) // 2))
+    assert len(asyncio.run(_collect(_request(body), max_bytes=len(body)))) == 20
+
+def test_declared_content_length_over_max_bytes_is_a_413():
+    body = _ndjson([_event(0)])
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(_collect(_request(body, headers={"Content-Length": str(len(body))}), max_bytes=len(body) - 1))
+    assert e.value.status_code == 413
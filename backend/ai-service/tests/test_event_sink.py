@@ -0,0 +1,57 @@
+# backend/ai-service/tests/test_event_sink.py
+import threading
+import time
+
+from app.services.event_sink import EventSink, PASSWORD
+
+class _Recorder:
+    """Injected write(): records each batch and signals the test."""
+
+    def __init__(self):
+        self.batches = []
+        self.flushed = threading.Event()
+
+    def __call__(self, rows):
+        self.batches.append(rows)
+        self.flushed.set()
+
+def _wait_for(event: threading.Event, timeout: float) -> float:
+    started = time.monotonic()
+    assert event.wait(timeout), "no flush"
+    event.clear()
+    return time.monotonic() - started
+
+def test_records_below_batch_size_flush_on_the_timer():
+    write = _Recorder()
+    sink = EventSink(write=write, batch_size=500, flush_ms=100, enabled=True)
+    try:
+        sink.submit(PASSWORD, {"user_id": 1, "password_strength": "weak"})
+        _wait_for(write.flushed, 2.0)
+        # The flusher is now idle on an empty queue; the next record must
+        # still go out within flush_ms, not wait for a full batch or stop()
+        sink.submit(PASSWORD, {"user_id": 1, "password_strength": "strong"})
+        assert _wait_for(write.flushed, 2.0) < 0.5
+        assert [len(b) for b in write.batches] == [1, 1]
+        assert sink.snapshot()["pending"] == 0
+        assert sink.written == 2
+    finally:
+        sink.stop()
+
+def test_full_batch_flushes_without_waiting():
+    write = _Recorder()
+    sink = EventSink(write=write, batch_size=3, flush_ms=60_000, enabled=True)
+    try:
+        for _ in range(3):
+            sink.submit(PASSWORD, {"user_id": 1, "password_strength": "weak"})
+        _wait_for(write.flushed, 2.0)
+        assert [len(b) for b in write.batches] == [3]
+    finally:
+        sink.stop()
+
+def test_stop_flushes_pending_records():
+    write = _Recorder()
+    sink = EventSink(write=write, batch_size=500, flush_ms=60_000, enabled=True)
+    sink.submit(PASSWORD, {"user_id": 1, "password_strength": "weak"})
+    sink.stop()
+    assert sum(len(b) for b in write.batches) == 1
+    assert sink.snapshot()["pending"] == 0
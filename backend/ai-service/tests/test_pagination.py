@@ -0,0 +1,128 @@
+# backend/ai-service/tests/test_pagination.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, text
+
+from app import models
+from app.db import get_async_db
+from app.routes import events
+from app.services.pagination import encode_cursor, decode_cursor
+
+# -------------------------------
+# Cursors
+# -------------------------------
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 5, 17, 12, 30, 45, 123456, tzinfo=timezone.utc),
+    datetime(2024, 5, 17, 12, 30, 45, tzinfo=timezone(timedelta(hours=2))),
+    datetime(2024, 5, 17, 12, 30, 45),
+])
+def test_cursor_round_trips(created_at):
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "e30",                                  # {}
+    encode_cursor(datetime(2024, 1, 1), 1)[:-3],
+    "WyJub3QgYSBkYXRlIiwxXQ",               # ["not a date",1]
+    "WyIyMDI0LTAxLTAxIl0",                  # ["2024-01-01"]
+    "WyIyMDI0LTAxLTAxIiwiYSJd",             # ["2024-01-01","a"]
+])
+def test_garbage_cursor_is_a_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+# -------------------------------
+# Walking pages through GET /api/events/
+# -------------------------------
+BASE = datetime(2024, 5, 1, 12, 0, 0)
+
+@pytest.fixture
+def db(tmp_path):
+    """SQLite file with users + events, served to the route through aiosqlite."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    path = tmp_path / "events.db"
+    engine = create_engine(f"sqlite:///{path}")
+    # The unpartitioned layout: models.Event may carry the (id, created_at)
+    # primary key of a partitioned Postgres table, which SQLite cannot autoincrement
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+            "type VARCHAR NOT NULL, detail VARCHAR, created_at DATETIME)"))
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def get_db():
+        async with sessions() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(events.router, prefix="/api/events")
+    app.dependency_overrides[get_async_db] = get_db
+    with TestClient(app) as client:
+        yield engine, client
+    engine.dispose()
+
+def _add(engine, rows: list[tuple[int, str, datetime]]):
+    with engine.begin() as conn:
+        conn.execute(insert(models.Event), [{"user_id": u, "type": t, "created_at": at} for u, t, at in rows])
+
+def _walk(client, limit: int, on_page=None, **filters) -> list[int]:
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **filters, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/events/", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids += [item["id"] for item in page["items"]]
+        pages += 1
+        if on_page is not None:
+            on_page(pages)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+def test_walk_with_filters_and_inserts_mid_walk(db):
+    engine, client = db
+    # Ties on created_at (three rows per minute) are ordered by id
+    _add(engine, [(1 + i % 2, "login" if i % 3 else "logout", BASE + timedelta(minutes=i // 3)) for i in range(40)])
+    with engine.connect() as conn:
+        expected = [r.id for r in conn.execute(
+            models.Event.__table__.select()
+            .where(models.Event.user_id == 1, models.Event.type == "login")
+            .order_by(models.Event.created_at.desc(), models.Event.id.desc()))]
+    assert len(expected) > 8
+
+    def insert_newer(page: int):
+        # New events arrive while the client pages: newer than any cursor, so
+        # they must not appear later in this walk or shift its pages
+        _add(engine, [(1, "login", BASE + timedelta(days=1, minutes=page))] * 2)
+
+    ids = _walk(client, 3, on_page=insert_newer, user_id=1, type="login")
+    assert ids == expected
+    assert len(ids) == len(set(ids))
+
+def test_walk_with_time_window(db):
+    engine, client = db
+    _add(engine, [(1, "login", BASE + timedelta(minutes=i)) for i in range(10)])
+    ids = _walk(client, 4, since=(BASE + timedelta(minutes=2)).isoformat(), until=(BASE + timedelta(minutes=7)).isoformat())
+    # since inclusive, until exclusive: minutes 6..2, newest first
+    assert ids == [7, 6, 5, 4, 3]
+
+def test_last_page_has_no_cursor(db):
+    engine, client = db
+    _add(engine, [(1, "login", BASE + timedelta(minutes=i)) for i in range(4)])
+    page = client.get("/api/events/", params={"limit": 4}).json()
+    assert len(page["items"]) == 4 and page["next_cursor"] is None
+
+def test_garbage_cursor_is_a_400(db):
+    _, client = db
+    response = client.get("/api/events/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid cursor")
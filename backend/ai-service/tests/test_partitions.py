@@ -0,0 +1,180 @@
+# backend/ai-service/tests/test_partitions.py
+import os
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.services import partitions
+from app.services.partitions import (
+    period_start, next_period, partition_name, parse_partition, expired, retention_cutoff,
+)
+
+# -------------------------------
+# Periods and names
+# -------------------------------
+@pytest.mark.parametrize("interval, day, start, end", [
+    ("month", date(2024, 5, 17), date(2024, 5, 1), date(2024, 6, 1)),
+    ("month", date(2024, 12, 31), date(2024, 12, 1), date(2025, 1, 1)),
+    ("day", date(2024, 2, 28), date(2024, 2, 28), date(2024, 2, 29)),
+    ("day", date(2024, 12, 31), date(2024, 12, 31), date(2025, 1, 1)),
+])
+def test_periods(interval, day, start, end):
+    assert period_start(day, interval) == start
+    assert next_period(start, interval) == end
+
+@pytest.mark.parametrize("interval", ["month", "day"])
+def test_partition_name_round_trips(interval):
+    start = period_start(date(2024, 5, 17), interval)
+    name = partition_name("events", start, interval)
+    assert name == ("events_p202405" if interval == "month" else "events_p20240517")
+    assert parse_partition("events", name) == (start, next_period(start, interval))
+
+@pytest.mark.parametrize("name", [
+    "events_default",
+    "events_p2024",           # neither a month nor a day
+    "events_p202413",         # no such month
+    "events_p20240230",       # no such day
+    "events_pabcdef",
+    "password_events_p202405",  # another table's partition
+])
+def test_parse_partition_ignores_foreign_names(name):
+    assert parse_partition("events", name) is None
+
+def test_expired():
+    names = ["events_p202402", "events_p202403", "events_p202404", "events_p202405", "events_default", "other"]
+    # Cutoff 2024-04-17: March ends on 2024-04-01 and goes, April still holds kept days
+    assert expired(names, "events", date(2024, 5, 17), 30) == ["events_p202402", "events_p202403"]
+    assert expired(names, "events", date(2024, 5, 17), 0) == []
+    assert retention_cutoff(date(2024, 5, 17), 30) == date(2024, 4, 17)
+    assert retention_cutoff(date(2024, 5, 17), 0) is None
+
+def test_expired_day_partitions_end_exactly_on_cutoff():
+    names = ["events_p20240416", "events_p20240417"]
+    assert expired(names, "events", date(2024, 5, 17), 30) == ["events_p20240416"]
+
+# -------------------------------
+# Postgres (set TEST_DATABASE_URL to run)
+# -------------------------------
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+@pytest.fixture
+def pg():
+    """An engine whose search_path is a throwaway schema holding the event tables."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from sqlalchemy import text
+    schema = f"test_partitions_{uuid.uuid4().hex[:8]}"
+    admin = sqlalchemy.create_engine(TEST_DATABASE_URL)
+    try:
+        with admin.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    except sqlalchemy.exc.OperationalError as e:
+        admin.dispose()
+        pytest.skip(f"Postgres unavailable: {e}")
+    engine = sqlalchemy.create_engine(TEST_DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE events (id serial, user_id integer, type varchar NOT NULL, detail varchar, "
+            "created_at timestamptz NOT NULL, PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"))
+        conn.execute(text(
+            "CREATE TABLE event_summaries (id serial PRIMARY KEY, source varchar NOT NULL, day date NOT NULL, "
+            "user_id integer, label varchar, count integer NOT NULL, compacted_at timestamptz DEFAULT now())"))
+    try:
+        yield engine, schema
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}_archive" CASCADE'))
+        admin.dispose()
+
+def _insert(engine, *days: date):
+    from sqlalchemy import text
+    with engine.begin() as conn:
+        for day in days:
+            conn.execute(text("INSERT INTO events (user_id, type, created_at) VALUES (1, 'login', :at)"),
+                         {"at": datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)})
+
+def _count(engine, table: str) -> int:
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+def _maintain(engine, today: date, **kwargs) -> dict:
+    options = dict(interval="month", premake=0, retention_days=0, mode="drop")
+    options.update(kwargs)
+    return partitions.run_maintenance(engine, today=today, **options)
+
+def test_ensure_partitions_moves_rows_out_of_default(pg):
+    engine, _ = pg
+    report = _maintain(engine, date(2024, 4, 10))
+    assert report["tables"]["events"]["created"] == ["events_default", "events_p202404"]
+    # Maintenance was down over the month change: May rows land in the default partition
+    _insert(engine, date(2024, 5, 2), date(2024, 5, 3), date(2024, 6, 20))
+    assert _count(engine, "events_default") == 3
+
+    report = _maintain(engine, date(2024, 5, 4))
+    info = report["tables"]["events"]
+    assert info["created"] == ["events_p202405"]
+    assert info["moved_from_default"] == 2
+    assert _count(engine, "events_p202405") == 2
+    assert _count(engine, "events_default") == 1
+    assert _count(engine, "events") == 3
+
+def test_retention_compacts_then_drops(pg):
+    engine, _ = pg
+    _maintain(engine, date(2024, 3, 10))
+    _insert(engine, date(2024, 3, 5), date(2024, 3, 5), date(2024, 3, 6))
+    # Backfilled history before any partition, and a kept row after the cutoff
+    _insert(engine, date(2023, 12, 24), date(2024, 4, 20))
+
+    report = _maintain(engine, date(2024, 5, 17), retention_days=30)
+    retired = {r["partition"]: r for r in report["tables"]["events"]["retired"]}
+    assert set(retired) == {"events_p202403", "events_default"}
+    assert retired["events_p202403"]["summary_rows"] == 2
+    assert retired["events_default"] == {"partition": "events_default", "rows": 1, "summary_rows": 1}
+
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        summaries = conn.execute(text("SELECT day, count FROM event_summaries ORDER BY day")).all()
+        remaining = conn.execute(text("SELECT created_at::date FROM events")).scalars().all()
+    assert [(r.day, r.count) for r in summaries] == [
+        (date(2023, 12, 24), 1), (date(2024, 3, 5), 2), (date(2024, 3, 6), 1)]
+    assert remaining == [date(2024, 4, 20)]
+    with engine.connect() as conn:
+        assert "events_p202403" not in partitions.list_partitions(conn, "events")
+
+def test_retention_archive_mode(pg):
+    engine, schema = pg
+    _maintain(engine, date(2024, 3, 10))
+    _insert(engine, date(2024, 3, 5), date(2023, 12, 24))
+
+    archive = f"{schema}_archive"
+    report = _maintain(engine, date(2024, 5, 17), retention_days=30, mode="archive", archive_schema=archive)
+    assert {r["partition"] for r in report["tables"]["events"]["retired"]} == {"events_p202403", "events_default"}
+    assert _count(engine, f'"{archive}".events_p202403') == 1
+    assert _count(engine, f'"{archive}".events_default') == 1
+    assert _count(engine, "events") == 0
+
+def test_failing_table_does_not_stop_the_others(pg):
+    engine, _ = pg
+    from sqlalchemy import text
+    with engine.begin() as conn:
+        # No password_strength column: compacting this table fails
+        conn.execute(text(
+            "CREATE TABLE password_events (id serial, user_id integer, created_at timestamptz NOT NULL, "
+            "PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"))
+    _maintain(engine, date(2024, 3, 10))
+    _insert(engine, date(2024, 3, 5))
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO password_events (user_id, created_at) VALUES (1, '2024-03-05 12:00+00')"))
+
+    report = _maintain(engine, date(2024, 5, 17), retention_days=30)
+    assert "error" in report["tables"]["password_events"]
+    assert [r["partition"] for r in report["tables"]["events"]["retired"]] == ["events_p202403"]
+    # The failed table was rolled back to its savepoint: nothing created or dropped
+    with engine.connect() as conn:
+        assert "password_events_p202405" not in partitions.list_partitions(conn, "password_events")
+    assert _count(engine, "password_events_p202403") == 1
@@ -0,0 +1,28 @@
+# backend/ai-service/tests/test_phishing_prefilter.py
+import pytest
+
+from app.services.phishing_prefilter import url_hosts
+
+@pytest.mark.parametrize("text, hosts", [
+    ("see https://evil.com/x", ["evil.com"]),
+    ("https://login@evil.com/x", ["evil.com"]),
+    ("https://user:pw@Evil.COM:8443/login?next=/", ["evil.com"]),
+    ("http://evil.com./reset", ["evil.com"]),
+    ("www.evil.com.", ["www.evil.com"]),
+    ("go to www.evil.com:80, now", ["www.evil.com"]),
+    ("https://good.com@evil.com", ["evil.com"]),
+    ("https://evil.com\\@good.com", ["evil.com"]),
+    ("http://[::1]:8080/", ["::1"]),
+    ("two links http://a.com and https://b.org/p", ["a.com", "b.org"]),
+    ("no links here, mail me@example.com", []),
+])
+def test_url_hosts(text, hosts):
+    assert url_hosts(text) == hosts
+
+def test_userinfo_does_not_hide_blocklisted_domain():
+    from app.services.domain_reputation import BLOCK, DomainTrie
+
+    trie = DomainTrie()
+    trie.add("evil.com", BLOCK)
+    for text in ("https://login@evil.com/x", "https://login@www.evil.com:8443/x", "http://a:b@evil.com./"):
+        assert [trie.lookup(host) for host in url_hosts(text)] == [(BLOCK, "evil.com")]
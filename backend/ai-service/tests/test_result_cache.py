@@ -0,0 +1,142 @@
+# backend/ai-service/tests/test_result_cache.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# result_cache subscribes to the model registry, which needs torch
+pytest.importorskip("torch")
+
+from app.services import result_cache as result_cache_module
+from app.services.result_cache import ResultCache, input_key, is_bypass, _approx_size
+
+def _cache(entries: int, **kwargs) -> ResultCache:
+    """A cache whose budget fits exactly `entries` of the values used below."""
+    return ResultCache(max_bytes=entries * _approx_size(input_key([0.0], "m:v1"), [1.0]), **kwargs)
+
+def test_lru_eviction_keeps_the_byte_budget():
+    cache = _cache(3, ttl_s=60, enabled=True)
+    keys = [input_key([float(i)], "m:v1") for i in range(4)]
+    for key in keys[:3]:
+        cache.put(key, [1.0])
+    # Touch the oldest entry: the least recently used is now keys[1]
+    assert cache.get(keys[0]) == [1.0]
+    cache.put(keys[3], [1.0])
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(k) == [1.0] for k in (keys[0], keys[2], keys[3]))
+    assert cache.evictions == 1
+    assert cache.bytes <= cache.max_bytes
+
+def test_values_larger_than_the_budget_are_not_stored():
+    cache = _cache(1, ttl_s=60, enabled=True)
+    cache.put("m:v1|big", [1.0] * 1000)
+    assert cache.get("m:v1|big") is None
+    assert cache.bytes == 0
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = _cache(3, ttl_s=30, enabled=True)
+    cache.put("m:v1|a", [1.0])
+    now[0] += 29
+    assert cache.get("m:v1|a") == [1.0]
+    now[0] += 2
+    assert cache.get("m:v1|a") is None
+    assert cache.expirations == 1
+    assert cache.bytes == 0
+
+def test_disabled_cache_stores_nothing():
+    cache = _cache(3, ttl_s=60, enabled=False)
+    cache.put("m:v1|a", [1.0])
+    assert cache.get("m:v1|a") is None
+    assert ResultCache(max_bytes=0, enabled=True).enabled is False
+
+def test_invalidate_prefix_only_drops_that_model():
+    cache = _cache(4, ttl_s=60, enabled=True)
+    cache.put(input_key([1.0], "phishing:v1"), [1.0])
+    cache.put(input_key([1.0], "phishing:v2"), [1.0])
+    other = input_key([1.0], "password:v1")
+    cache.put(other, [1.0])
+    cache.invalidate_prefix("phishing:")
+    assert list(cache._data) == [other]
+    assert cache.bytes == _approx_size(other, [1.0])
+
+def test_registry_swap_invalidates_the_shared_cache():
+    import torch
+    from app.services.model_registry import registry
+
+    cache = result_cache_module.result_cache
+    if not cache.enabled:
+        pytest.skip("result cache disabled by configuration")
+    swapped, kept = input_key([1.0], "cache-test:v1"), input_key([1.0], "cache-test-other:v1")
+    cache.put(swapped, [1.0])
+    cache.put(kept, [1.0])
+    try:
+        registry.register("cache-test", torch.nn.Linear(2, 1), warmup=None)
+        assert cache.get(swapped) is None
+        assert cache.get(kept) == [1.0]
+    finally:
+        cache.invalidate_prefix("cache-test")
+
+@pytest.mark.parametrize("value, expected", [
+    (None, False), ("", False), ("0", False), ("false", False), (" No ", False),
+    ("1", True), ("true", True), ("yes", True), ("anything", True),
+])
+def test_is_bypass(value, expected):
+    assert is_bypass(value) is expected
+
+def test_input_key_depends_on_version_and_float32_value():
+    assert input_key([1.0, 2.0], "m:v1") == input_key((1.0, 2.0), "m:v1")
+    assert input_key([1.0, 2.0], "m:v1") != input_key([1.0, 2.0], "m:v2")
+    assert input_key([1.0, 2.0], "m:v1") != input_key([2.0, 1.0], "m:v1")
+
+# -------------------------------
+# run_inference_cached and the X-Cache header
+# -------------------------------
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Active model 'model:v1' (2 inputs) whose batched forward is counted."""
+    from app.services import ai_service
+
+    calls = []
+
+    async def run_inference_batched(row):
+        calls.append(list(row))
+        return [sum(row)], "model:v1"
+
+    monkeypatch.setattr(ai_service, "get_active", lambda: SimpleNamespace(tag="model:v1", in_features=2))
+    monkeypatch.setattr(ai_service, "run_inference_batched", run_inference_batched)
+    monkeypatch.setattr(ai_service, "result_cache", _cache(8, ttl_s=60, enabled=True))
+    return calls
+
+def test_run_inference_cached_statuses(fake_model):
+    from app.services import ai_service
+
+    async def main():
+        return [await ai_service.run_inference_cached([1.0, 2.0]),
+                await ai_service.run_inference_cached([1.0, 2.0]),
+                await ai_service.run_inference_cached([1.0, 2.0], bypass=True)]
+
+    miss, hit, bypass = asyncio.run(main())
+    assert miss == ([3.0], "model:v1", "MISS")
+    assert hit == ([3.0], "model:v1", "HIT")
+    assert bypass == ([3.0], "model:v1", "BYPASS")
+    # The hit never reached the model
+    assert len(fake_model) == 2
+
+def test_infer_route_reports_cache_status(fake_model):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routes import infer
+    from app.services.result_cache import CACHE_STATUS_HEADER, CACHE_BYPASS_HEADER
+
+    app = FastAPI()
+    app.include_router(infer.router, prefix="/api/infer")
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer test"}
+    body = {"input": [1.0, 2.0]}
+    statuses = [client.post("/api/infer/", json=body, headers=headers).headers[CACHE_STATUS_HEADER] for _ in range(2)]
+    bypass = client.post("/api/infer/", json=body, headers={**headers, CACHE_BYPASS_HEADER: "1"})
+    assert statuses == ["MISS", "HIT"]
+    assert bypass.headers[CACHE_STATUS_HEADER] == "BYPASS"
+    assert bypass.json()["prediction"] == [3.0]
@@ -0,0 +1,113 @@
+# backend/ai-service/train_phishing_prefilter.py
+"""
+Train the hashed lexical/URL prefilter used as the first phishing tier.
+
+Input files hold labelled texts, either CSV with "text" and "label" columns
+or JSONL with {"text": ..., "label": ...}. Labels "phishing", "suspicious",
+"spam", "1" and "true" count as phishing; anything else as legitimate.
+
+The model is a plain logistic regression over hashed features, trained with
+SGD. After training, a held-out split is scored against the configured
+thresholds to show how many texts the prefilter would answer on its own and
+how accurate those answers are.
+
+Usage (from backend/ai-service):
+  python train_phishing_prefilter.py labelled.csv more.jsonl -o phishing_prefilter.npz
+"""
+import argparse
+import csv
+import json
+import math
+import random
+import time
+
+import numpy as np
+
+from app.config import (
+    PHISHING_PREFILTER_PATH, PHISHING_PREFILTER_BITS,
+    PHISHING_PREFILTER_SAFE_BELOW, PHISHING_PREFILTER_SUSPICIOUS_ABOVE,
+)
+from app.services.phishing_prefilter import Prefilter, hashed_features, save_prefilter
+
+POSITIVE_LABELS = {"phishing", "suspicious", "spam", "1", "true"}
+
+def _examples(path: str):
+    with open(path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row.get("text") or "", str(row.get("label", "")).strip().lower() in POSITIVE_LABELS
+        else:
+            for row in csv.DictReader(f):
+                yield row.get("text") or "", str(row.get("label", "")).strip().lower() in POSITIVE_LABELS
+
+def _sigmoid(z: float) -> float:
+    return 1.0 / (1.0 + math.exp(-max(-60.0, min(60.0, z))))
+
+def train(examples, bits: int, epochs: int, lr: float, l2: float, seed: int) -> tuple[np.ndarray, float]:
+    weights = np.zeros(1 << bits, dtype=np.float32)
+    bias = 0.0
+    order = list(range(len(examples)))
+    rng = random.Random(seed)
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        loss = 0.0
+        for i in order:
+            idx, y = examples[i]
+            p = _sigmoid(bias + float(weights[idx].sum()))
+            loss -= math.log(max(p if y else 1.0 - p, 1e-12))
+            grad = p - y
+            # np.add.at applies repeated indices once per repeat, like the scorer
+            np.add.at(weights, idx, -lr * grad)
+            if l2:
+                weights[idx] *= (1.0 - lr * l2)
+            bias -= lr * grad
+        print(f"  epoch {epoch + 1}/{epochs}: mean log loss {loss / max(1, len(order)):.4f}")
+    return weights, bias
+
+def evaluate(prefilter: Prefilter, examples: list[tuple[str, bool]], safe_below: float, suspicious_above: float):
+    decided = correct = 0
+    for text, y in examples:
+        score = prefilter.score(text)
+        if score <= safe_below or score >= suspicious_above:
+            decided += 1
+            correct += (score >= suspicious_above) == y
+    total = len(examples)
+    print(f"ℹ️ Held-out: {total} texts, prefilter decides {decided} ({decided / total:.1%}), "
+          f"accuracy on decided {correct / decided if decided else 0.0:.2%}, escalated {total - decided}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="labelled CSV or JSONL files")
+    parser.add_argument("-o", "--output", default=PHISHING_PREFILTER_PATH, help="weights file to write")
+    parser.add_argument("--bits", type=int, default=PHISHING_PREFILTER_BITS, help="hash space is 2**bits")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--lr", type=float, default=0.1)
+    parser.add_argument("--l2", type=float, default=1e-6)
+    parser.add_argument("--holdout", type=float, default=0.1, help="fraction kept out for evaluation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--version", default=None, help="version string reported in X-Model-Version")
+    args = parser.parse_args()
+
+    raw = [ex for path in args.inputs for ex in _examples(path)]
+    if not raw:
+        parser.error("no labelled examples found")
+    random.Random(args.seed).shuffle(raw)
+    cut = int(len(raw) * (1.0 - args.holdout))
+    train_raw, held_out = raw[:cut], raw[cut:]
+    print(f"ℹ️ {len(train_raw)} training / {len(held_out)} held-out texts, "
+          f"{sum(y for _, y in raw)} labelled phishing")
+
+    started = time.perf_counter()
+    examples = [(hashed_features(text, args.bits), float(y)) for text, y in train_raw]
+    weights, bias = train(examples, args.bits, args.epochs, args.lr, args.l2, args.seed)
+    version = args.version or time.strftime("%Y%m%d%H%M%S")
+    save_prefilter(args.output, weights, bias, version)
+    print(f"✅ Wrote '{args.output}' (prefilter:{version}) in {time.perf_counter() - started:.1f}s")
+
+    if held_out:
+        evaluate(Prefilter(weights, bias, version), held_out, PHISHING_PREFILTER_SAFE_BELOW, PHISHING_PREFILTER_SUSPICIOUS_ABOVE)
+
+if __name__ == "__main__":
+    main()